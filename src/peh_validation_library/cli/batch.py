@@ -0,0 +1,256 @@
+from __future__ import annotations
+
+import argparse
+from collections.abc import Iterable, Mapping, Sequence
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import copy
+import glob
+import json
+import logging
+import multiprocessing
+import os
+from pathlib import Path
+import sys
+import traceback
+
+import polars as pl
+
+from peh_validation_library.config.config_reader import ConfigReader
+from peh_validation_library.core.utils.enums import ErrorLevel
+from peh_validation_library.dataframe.df_reader import (
+    file_readers,
+    read_dataframe_file,
+)
+from peh_validation_library.error_report.error_collector import (
+    ScopedErrorCollector,
+)
+from peh_validation_library.error_report.error_schemas import (
+    ExceptionSchema,
+)
+from peh_validation_library.error_report.failure_cases import (
+    get_failure_cases,
+)
+from peh_validation_library.error_report.report_sink import (
+    DEFAULT_FLUSH_SIZE,
+    get_report_sink,
+)
+from peh_validation_library.validator.validator import Validator
+
+logger = logging.getLogger(__name__)
+
+EXIT_OK = 0
+EXIT_CRITICAL = 1
+
+# Report format inferred from the output suffix, JSONL otherwise.
+output_formats = {
+    '.parquet': 'parquet',
+    '.arrow': 'ipc',
+    '.ipc': 'ipc',
+    '.feather': 'ipc',
+}
+
+# Per process state: the config is parsed and its check expressions
+# compiled once by each worker, then reused for every file it validates.
+_worker_state = {}
+
+
+def expand_inputs(inputs: Iterable[str]) -> list[Path]:
+    paths = []
+    for item in inputs:
+        path = Path(item)
+        if path.is_dir():
+            paths.extend(
+                sorted(
+                    p
+                    for p in path.iterdir()
+                    if p.suffix.lower() in file_readers
+                )
+            )
+        elif glob.has_magic(item):
+            paths.extend(
+                Path(p)
+                for p in sorted(glob.glob(item, recursive=True))
+                if Path(p).is_file()
+            )
+        else:
+            paths.append(path)
+    return list(dict.fromkeys(paths))
+
+
+def init_worker(config: Mapping, log_level: int = logging.WARNING) -> None:
+    logging.basicConfig(level=log_level)
+    df_schema = ConfigReader(copy.deepcopy(config)).get_df_schema()
+    _worker_state['df_schema'] = df_schema
+    _worker_state['columns'] = df_schema.get_columns()
+
+
+def get_exception_frame(
+    err: Exception, path: Path, context: str
+) -> pl.DataFrame:
+    return get_failure_cases([
+        ExceptionSchema(
+            error_type=type(err).__name__,
+            error_message=str(err),
+            error_level='critical',
+            error_traceback=traceback.format_exc(),
+            error_context=context,
+            error_source=__name__,
+        )
+    ]).with_columns(source=pl.lit(str(path)))
+
+
+def validate_file(path: Path) -> pl.DataFrame:
+    df_schema = _worker_state['df_schema']
+    try:
+        dataframe = read_dataframe_file(path, columns=_worker_state['columns'])
+    except RuntimeError as err:
+        logger.error(f'Error reading {path}: {err}')
+        return get_exception_frame(err, path, 'validate_file')
+
+    errors = Validator(
+        dataframe=dataframe,
+        config=df_schema,
+        error_collector=ScopedErrorCollector(),
+    ).validate()
+
+    return get_failure_cases(errors).with_columns(source=pl.lit(str(path)))
+
+
+def has_critical_errors(failure_cases: pl.DataFrame) -> bool:
+    return (
+        failure_cases.get_column('error_level') == ErrorLevel.CRITICAL.value
+    ).any()
+
+
+def run_batch(  # noqa: PLR0913
+    config: Mapping,
+    paths: Sequence[Path],
+    *,
+    output: Path | None = None,
+    output_format: str = 'jsonl',
+    max_workers: int | None = None,
+    flush_size: int = DEFAULT_FLUSH_SIZE,
+) -> int:
+    exit_code = EXIT_OK
+    with (
+        get_report_sink(output, output_format, flush_size) as sink,
+        ProcessPoolExecutor(
+            max_workers=max_workers,
+            # Forking after polars started its thread pool deadlocks.
+            mp_context=multiprocessing.get_context('spawn'),
+            initializer=init_worker,
+            initargs=(config, logging.getLogger().level),
+        ) as executor,
+    ):
+        futures = {
+            executor.submit(validate_file, path): path for path in paths
+        }
+        for future in as_completed(futures):
+            path = futures[future]
+            try:
+                failure_cases = future.result()
+            except Exception as err:
+                logger.error(f'Error validating {path}: {err}')
+                failure_cases = get_exception_frame(err, path, 'run_batch')
+
+            logger.info(f'{path}: {failure_cases.height} failure(s)')
+            if has_critical_errors(failure_cases):
+                exit_code = EXIT_CRITICAL
+            sink.write(failure_cases)
+
+    return exit_code
+
+
+def get_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog='peh-validate',
+        description='Validate data files against a PEH template config.',
+    )
+    parser.add_argument(
+        'config', type=Path, help='Path to the JSON config file.'
+    )
+    parser.add_argument(
+        'inputs',
+        nargs='+',
+        help='Data files, directories or glob patterns to validate.',
+    )
+    parser.add_argument(
+        '-o',
+        '--output',
+        type=Path,
+        default=None,
+        help='Error report path. JSONL is written to stdout when omitted.',
+    )
+    parser.add_argument(
+        '-f',
+        '--format',
+        choices=('jsonl', 'parquet', 'ipc'),
+        default=None,
+        help='Error report format, inferred from the output suffix.',
+    )
+    parser.add_argument(
+        '--flush-size',
+        type=int,
+        default=DEFAULT_FLUSH_SIZE,
+        help='Failure cases buffered before they are written to the report.',
+    )
+    parser.add_argument(
+        '-w',
+        '--workers',
+        type=int,
+        default=os.cpu_count() or 1,
+        help='Maximum number of files validated in parallel.',
+    )
+    parser.add_argument(
+        '--log-level',
+        default='WARNING',
+        choices=('DEBUG', 'INFO', 'WARNING', 'ERROR', 'CRITICAL'),
+    )
+    return parser
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    parser = get_parser()
+    args = parser.parse_args(argv)
+    log_level = getattr(logging, args.log_level)
+    logging.basicConfig(level=log_level)
+
+    output_format = args.format
+    if output_format is None:
+        output_format = (
+            output_formats.get(args.output.suffix.lower(), 'jsonl')
+            if args.output
+            else 'jsonl'
+        )
+    if output_format != 'jsonl' and args.output is None:
+        parser.error(f'--output is required for the {output_format} format')
+    if args.workers < 1:
+        parser.error('--workers must be at least 1')
+    if args.flush_size < 1:
+        parser.error('--flush-size must be at least 1')
+
+    try:
+        config = json.loads(args.config.read_text())
+        # Fail fast on a broken config before spawning workers.
+        ConfigReader(copy.deepcopy(config)).get_df_schema()
+    except (OSError, json.JSONDecodeError, RuntimeError) as err:
+        logger.critical(f'Error reading config {args.config}: {err}')
+        return EXIT_CRITICAL
+
+    paths = expand_inputs(args.inputs)
+    if not paths:
+        logger.warning('No input files found')
+        return EXIT_OK
+
+    return run_batch(
+        config=config,
+        paths=paths,
+        output=args.output,
+        output_format=output_format,
+        max_workers=min(args.workers, len(paths)),
+        flush_size=args.flush_size,
+    )
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,171 @@
+from __future__ import annotations
+
+from collections.abc import Collection
+from datetime import date
+
+from peh_validation_library.core.check.reference_sets import (
+    get_reference_path,
+)
+from peh_validation_library.core.check.schemas import (
+    CaseCheckExpression,
+    SimpleCheckExpression,
+)
+from peh_validation_library.core.models.schemas import CheckSchema, DFSchema
+from peh_validation_library.core.utils.enums import ValidationType
+from peh_validation_library.core.utils.mappers import (
+    aggregate_expression_mapper,
+)
+
+# Data types that compare with each other; columns of different families
+# cannot be compared.
+type_families = {
+    ValidationType.INT: 'numeric',
+    ValidationType.FLOAT: 'numeric',
+    ValidationType.DATE: 'temporal',
+    ValidationType.DATETIME: 'temporal',
+    ValidationType.STR: 'text',
+    ValidationType.CAT: 'text',
+    ValidationType.BOOL: 'boolean',
+}
+# Python types of the argument values each family accepts in an order
+# comparison. Temporal columns also take ISO formatted strings.
+family_value_types = {
+    'numeric': (int, float),
+    'temporal': (date, str),
+    'text': (str,),
+    'boolean': (bool,),
+}
+
+# Mapped commands that only make sense on ordered or numeric columns.
+ORDER_COMMANDS = {
+    'ge',
+    'gt',
+    'le',
+    'lt',
+    'is_increasing_in_group',
+    'is_non_decreasing_in_group',
+}
+NUMERIC_COMMANDS = {'has_mean_between', 'has_quantile_between'}
+ORDERED_FAMILIES = {'numeric', 'temporal'}
+
+
+def get_value_problem(value, family: str) -> str | None:
+    # bool is an int subclass, but never a numeric argument.
+    if value is None:
+        return None
+    if isinstance(value, bool) != (family == 'boolean') or not isinstance(
+        value, family_value_types[family]
+    ):
+        return f'argument {value!r} does not compare with {family} values'
+    return None
+
+
+def analyze_simple_expression(
+    expression: SimpleCheckExpression,
+    key: str | None,
+    types: dict[str, ValidationType],
+    columns: Collection[str] | None,
+) -> list[str]:
+    problems = []
+    command = expression.command
+    referenced = [
+        *(expression.subject or []),
+        *(expression.arg_columns or []),
+        *(expression.group_by or []),
+        *(expression.order_by or []),
+    ]
+    if columns is not None:
+        problems.extend(
+            f'unknown column {column!r}'
+            for column in referenced
+            if column not in types and column not in columns
+        )
+    if expression.arg_reference:
+        try:
+            get_reference_path(expression.arg_reference)
+        except KeyError as err:
+            problems.append(err.args[0])
+    # Custom callables receive the frame and are not type checked.
+    if not isinstance(command, str):
+        return problems
+
+    subjects = expression.subject or ([key] if key else [])
+    if not subjects and command not in aggregate_expression_mapper:
+        problems.append(f'{command} on a dataframe needs a subject')
+    families = {
+        type_families[types[subject]]
+        for subject in subjects
+        if subject in types
+    }
+    for family in families:
+        if command in ORDER_COMMANDS and family not in ORDERED_FAMILIES:
+            problems.append(f'{command} cannot order {family} columns')
+        if command in NUMERIC_COMMANDS and family != 'numeric':
+            problems.append(f'{command} needs numeric columns, not {family}')
+        if command in ORDER_COMMANDS:
+            problems.extend(
+                problem
+                for value in expression.arg_values or []
+                if (problem := get_value_problem(value, family))
+            )
+        problems.extend(
+            f'cannot compare {family} column with {column!r}'
+            for column in expression.arg_columns or []
+            if column in types and type_families[types[column]] != family
+        )
+    return problems
+
+
+def analyze_expression(
+    expression: SimpleCheckExpression | CaseCheckExpression,
+    key: str | None,
+    types: dict[str, ValidationType],
+    columns: Collection[str] | None,
+) -> list[str]:
+    if hasattr(expression, 'check_case'):
+        return [
+            problem
+            for sub_expression in expression.expressions
+            for problem in analyze_expression(
+                sub_expression, key, types, columns
+            )
+        ]
+    return analyze_simple_expression(expression, key, types, columns)
+
+
+def analyze_checks(
+    checks: list[CheckSchema] | None,
+    key: str | None,
+    types: dict[str, ValidationType],
+    columns: Collection[str] | None,
+) -> list[str]:
+    context = f'Column {key!r}' if key else 'Dataframe'
+    return [
+        f'{context} check {number} ({check.name}): {problem}'
+        for number, check in enumerate(checks or [])
+        if check.check_command is not None
+        for problem in analyze_expression(
+            check.check_command, key, types, columns
+        )
+    ]
+
+
+def analyze_config(
+    config: DFSchema, columns: Collection[str] | None = None
+) -> list[str]:
+    # Every problem the config would hit at validation time, found without
+    # reading any rows: checks the column types cannot satisfy and, given
+    # the column names of the frame, columns neither the config nor the
+    # frame has. Undeclared columns are only type checked by the frame.
+    types = {col.id: col.data_type for col in config.columns}
+    problems = []
+    if columns is not None:
+        problems.extend(
+            f'Unknown id column {column!r}'
+            for column in config.ids or []
+            if column not in types and column not in columns
+        )
+    for col in config.columns:
+        problems.extend(analyze_checks(col.checks, col.id, types, columns))
+    problems.extend(analyze_checks(config.checks, None, types, columns))
+    return problems
@@ -1,7 +1,13 @@
-from collections.abc import Mapping, Sequence
+from collections.abc import Callable, Mapping, Sequence
+import copy
+import json
 
 from pydantic import ValidationError
 
+from peh_validation_library.config.config_analysis import analyze_config
+from peh_validation_library.core.check.reference_sets import (
+    register_reference_sets,
+)
 from peh_validation_library.core.check.schemas import (
     CaseCheckExpression,
     SimpleCheckExpression,
@@ -9,9 +15,13 @@ from peh_validation_library.core.check.schemas import (
 from peh_validation_library.core.models.schemas import (
     CheckSchema,
     ColSchema,
+    ColumnSelector,
+    DatasetSchema,
     DFSchema,
+    ForeignKeySchema,
 )
 from peh_validation_library.core.utils.enums import ErrorLevel
+from peh_validation_library.core.utils.mappers import group_expression_mapper
 
 
 class ConfigReader:
@@ -20,32 +30,151 @@ class ConfigReader:
     ) -> None:
         self.config_input = config_input
 
-    def get_df_schema(self) -> DFSchema:
+    def get_df_schema(
+        self, previous: tuple[Mapping, DFSchema] | None = None
+    ) -> DFSchema:
+        # `previous` is the input and schema of an earlier compile of the
+        # same template; the columns and checks whose input did not change
+        # are reused instead of compiled again.
         try:
-            return DFSchema(
+            register_reference_sets(self.config_input.get('references', {}))
+            ids = (
+                list(self.config_input['ids'])
+                if 'ids' in self.config_input
+                else None
+            )
+            columns, checks = self.parse_parts(ids, previous)
+            df_schema = DFSchema(
                 name=self.config_input['name'],
-                columns=parse_columns(self.config_input['columns']),
-                ids=(
-                    list(self.config_input['ids'])
-                    if 'ids' in self.config_input
-                    else None
-                ),
+                columns=columns,
+                ids=ids,
                 metadata=self.config_input.get('metadata', None),
-                checks=(
-                    parse_checks(self.config_input['checks'])
-                    if 'checks' in self.config_input
-                    else None
+                checks=checks,
+            )
+        except (KeyError, TypeError, ValueError, IndexError) as err:
+            raise RuntimeError(f'Error reading configuration: {err}') from err
+
+        # Every problem at once, before any data is read or cast.
+        if problems := analyze_config(df_schema):
+            raise RuntimeError(
+                'Error reading configuration: ' + '; '.join(problems)
+            )
+        return df_schema
+
+    def parse_parts(
+        self,
+        ids: list[str] | None,
+        previous: tuple[Mapping, DFSchema] | None,
+    ) -> tuple[list[ColSchema], list[CheckSchema] | None]:
+        config_input = self.config_input
+        # Selectors and ids reach into every column, so a change to either
+        # compiles the whole template.
+        if (
+            previous is None
+            or any(
+                config_input.get(key) != previous[0].get(key)
+                for key in ('ids', 'selectors')
+            )
+            or config_input.get('selectors')
+        ):
+            columns = parse_columns(config_input['columns'], ids)
+            apply_selectors(config_input.get('selectors', []), columns, ids)
+            return columns, (
+                parse_checks(config_input['checks'], ids)
+                if 'checks' in config_input
+                else None
+            )
+
+        previous_input, previous_schema = previous
+        columns = reuse_parsed(
+            config_input['columns'],
+            previous_input['columns'],
+            previous_schema.columns,
+            lambda column: parse_columns([column], ids)[0],
+        )
+        if 'checks' not in config_input:
+            return columns, None
+        return columns, reuse_parsed(
+            config_input['checks'],
+            previous_input.get('checks', []),
+            previous_schema.checks or [],
+            lambda check: parse_checks([check], ids)[0],
+        )
+
+    def get_dataset_schema(self) -> DatasetSchema:
+        try:
+            tables = [
+                ConfigReader(table).get_df_schema()
+                for table in self.config_input['tables']
+            ]
+            return DatasetSchema(
+                name=self.config_input['name'],
+                tables=tables,
+                foreign_keys=parse_foreign_keys(
+                    self.config_input.get('foreign_keys', []),
+                    {table.name: table for table in tables},
                 ),
             )
-        except (KeyError, TypeError, ValidationError, IndexError) as err:
+        except (KeyError, TypeError, ValidationError, ValueError) as err:
             raise RuntimeError(f'Error reading configuration: {err}') from err
 
 
+def reuse_parsed(
+    inputs: Sequence[Mapping],
+    previous_inputs: Sequence[Mapping],
+    previous_parsed: Sequence[ColSchema | CheckSchema],
+    parse: Callable[[Mapping], ColSchema | CheckSchema],
+) -> list[ColSchema | CheckSchema]:
+    # Parsing consumes its input, so only copies are parsed and the
+    # previous inputs stay comparable.
+    parsed = {
+        get_input_key(previous_input): item
+        for previous_input, item in zip(previous_inputs, previous_parsed)
+    }
+    return [
+        parsed.get(get_input_key(item)) or parse(copy.deepcopy(item))
+        for item in inputs
+    ]
+
+
+def get_input_key(item: Mapping) -> str:
+    return json.dumps(item, sort_keys=True, default=repr)
+
+
+def parse_foreign_keys(
+    foreign_keys: Sequence[Mapping[str, str | Sequence]],
+    tables: Mapping[str, DFSchema],
+) -> list[ForeignKeySchema]:
+    parsed_foreign_keys = []
+    for foreign_key in foreign_keys:
+        parsed = ForeignKeySchema.model_validate(foreign_key)
+        if parsed.table not in tables or parsed.ref_table not in tables:
+            raise ValueError(
+                f'Unknown table in foreign key {parsed.table} -> '
+                f'{parsed.ref_table}'
+            )
+        if parsed.ref_columns is None:
+            parsed.ref_columns = tables[parsed.ref_table].ids
+        if not parsed.ref_columns or len(parsed.ref_columns) != len(
+            parsed.columns
+        ):
+            raise ValueError(
+                f'Foreign key {parsed.get_name()} needs as many referenced '
+                'columns as columns'
+            )
+        parsed_foreign_keys.append(parsed)
+    return parsed_foreign_keys
+
+
 def parse_checks(
     checks: Sequence[Mapping[str, str | Sequence]],
+    group_by: list[str] | None = None,
 ) -> list[CheckSchema]:
+    # `group_by` is the default group of the group commands, the config ids.
     parsed_checks = []
     for check in checks:
+        if group_by and check.get('command') in group_expression_mapper:
+            check.setdefault('group_by', group_by)
         name = check.pop('name', None)
         error_level = check.pop('error_level', ErrorLevel.ERROR)
         error_message = check.pop('error_msg', None)
@@ -67,6 +196,7 @@ def parse_checks(
 
 def parse_columns(
     columns: Sequence[Mapping[str, str | Sequence]],
+    group_by: list[str] | None = None,
 ) -> list[ColSchema]:
     parsed_columns = []
     for column in columns:
@@ -78,10 +208,26 @@ def parse_columns(
                 unique=column['unique'],
                 required=column['required'],
                 checks=(
-                    parse_checks(column['checks'])
+                    parse_checks(column['checks'], group_by)
                     if 'checks' in column
                     else None
                 ),
             )
         )
     return parsed_columns
+
+
+def apply_selectors(
+    selectors: Sequence[Mapping[str, str | Sequence]],
+    columns: list[ColSchema],
+    group_by: list[str] | None = None,
+) -> None:
+    # Each selector check is parsed once and shared by every selected
+    # column, so it is compiled once and can be evaluated in one pass.
+    for selector in selectors:
+        parsed = ColumnSelector.model_validate({
+            **selector,
+            'checks': parse_checks(selector['checks'], group_by),
+        })
+        for col in parsed.select(columns):
+            col.checks = [*(col.checks or []), *parsed.checks]
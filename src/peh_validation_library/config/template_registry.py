@@ -0,0 +1,189 @@
+from __future__ import annotations
+
+import copy
+import json
+import logging
+from pathlib import Path
+import threading
+from typing import Any
+
+from pydantic import BaseModel, ConfigDict
+
+from peh_validation_library.config.config_reader import ConfigReader
+from peh_validation_library.core.models.schemas import DFSchema
+
+logger = logging.getLogger(__name__)
+
+
+class CompiledTemplate(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
+    name: str
+    path: Path
+    version: int
+    modified: int
+    config_input: dict[str, Any]
+    config: DFSchema
+    # Columns and dataframe checks compiled for this version, the rest are
+    # shared with the previous version.
+    recompiled: int
+
+
+def read_template(path: Path) -> dict[str, Any]:
+    with path.open(encoding='utf-8') as file:
+        return json.load(file)
+
+
+def count_recompiled(config: DFSchema, previous: DFSchema | None) -> int:
+    parts = [*config.columns, *(config.checks or [])]
+    if previous is None:
+        return len(parts)
+    previous_ids = {
+        id(part) for part in [*previous.columns, *(previous.checks or [])]
+    }
+    return sum(id(part) not in previous_ids for part in parts)
+
+
+def compile_template(
+    name: str,
+    path: Path,
+    config_input: dict[str, Any],
+    modified: int,
+    previous: CompiledTemplate | None,
+) -> CompiledTemplate:
+    # The reader consumes its input, the registry keeps the original
+    # to diff the next version against.
+    config = ConfigReader(copy.deepcopy(config_input)).get_df_schema(
+        (previous.config_input, previous.config) if previous else None
+    )
+    return CompiledTemplate(
+        name=name,
+        path=path,
+        version=previous.version + 1 if previous else 1,
+        modified=modified,
+        config_input=config_input,
+        config=config,
+        recompiled=count_recompiled(
+            config, previous.config if previous else None
+        ),
+    )
+
+
+class TemplateRegistry:
+    # Compiled templates by name, reloaded from their files when these
+    # change. A reload compiles only the changed columns and checks, then
+    # swaps the template in one assignment: validations that already got
+    # the previous config keep it, later calls to get see the new one.
+    def __init__(self, logger: logging.Logger = logger) -> None:
+        self._templates: dict[str, CompiledTemplate] = {}
+        self._lock = threading.Lock()
+        self._reload_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._watcher: threading.Thread | None = None
+        self.__logger = logger
+
+    def __contains__(self, name: str) -> bool:
+        with self._lock:
+            return name in self._templates
+
+    def register(
+        self, path: str | Path, name: str | None = None
+    ) -> CompiledTemplate:
+        path = Path(path)
+        name = name or path.stem
+        with self._reload_lock:
+            modified = path.stat().st_mtime_ns
+            config_input = read_template(path)
+            template = compile_template(
+                name, path, config_input, modified, None
+            )
+            with self._lock:
+                self._templates[name] = template
+        return template
+
+    def unregister(self, name: str) -> None:
+        with self._lock:
+            del self._templates[name]
+
+    def get_template(self, name: str) -> CompiledTemplate:
+        with self._lock:
+            if name not in self._templates:
+                raise KeyError(f'Unknown template {name!r}')
+            return self._templates[name]
+
+    def get(self, name: str) -> DFSchema:
+        return self.get_template(name).config
+
+    def get_versions(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                name: template.version
+                for name, template in self._templates.items()
+            }
+
+    @staticmethod
+    def _reload(previous: CompiledTemplate) -> CompiledTemplate:
+        modified = previous.path.stat().st_mtime_ns
+        if modified == previous.modified:
+            return previous
+        config_input = read_template(previous.path)
+        if config_input == previous.config_input:
+            return previous.model_copy(update={'modified': modified})
+        return compile_template(
+            previous.name, previous.path, config_input, modified, previous
+        )
+
+    def reload(self, name: str) -> bool:
+        # True when a new version was swapped in. A template that no longer
+        # reads or compiles keeps serving its last good version.
+        with self._reload_lock:
+            previous = self.get_template(name)
+            try:
+                template = self._reload(previous)
+            except (OSError, ValueError, RuntimeError) as err:
+                self.__logger.error(f'Could not reload template {name}: {err}')
+                return False
+            if template is previous:
+                return False
+            with self._lock:
+                self._templates[name] = template
+
+        if template.version == previous.version:
+            return False
+        self.__logger.info(
+            f'Template {name} version {template.version}: recompiled '
+            f'{template.recompiled} column(s) and check(s)'
+        )
+        return True
+
+    def refresh(self) -> list[str]:
+        # Names of the templates that got a new version.
+        with self._lock:
+            names = list(self._templates)
+        return [name for name in names if name in self and self.reload(name)]
+
+    def watch(self, interval: float = 1.0) -> None:
+        # Polls the template files from a daemon thread until stop.
+        if self._watcher is not None and self._watcher.is_alive():
+            return
+        self._stop.clear()
+
+        def poll() -> None:
+            # Any error is logged and the next poll tries again; an
+            # uncaught one would end the thread silently.
+            while not self._stop.wait(interval):
+                try:
+                    self.refresh()
+                except Exception:
+                    self.__logger.exception('Could not refresh templates')
+
+        self._watcher = threading.Thread(
+            target=poll, name='template-watcher', daemon=True
+        )
+        self._watcher.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._watcher is not None:
+            self._watcher.join()
+            self._watcher = None
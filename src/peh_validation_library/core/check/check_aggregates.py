@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+from collections.abc import Collection
+from functools import partial
+
+import pandera.polars as pa
+import polars as pl
+
+from peh_validation_library.core.models.schemas import CheckSchema, DFSchema
+from peh_validation_library.core.utils.mappers import (
+    aggregate_expression_mapper,
+)
+
+# Column the check belongs to, None for dataframe checks, and the check.
+AggregateCheck = tuple[str | None, CheckSchema]
+
+
+def aggregate_result_fn(data, passed: bool, **kwargs) -> bool:
+    return passed
+
+
+def is_aggregate_check(check: CheckSchema) -> bool:
+    command = check.check_command
+    return (
+        check.get_expression() is not None
+        and not hasattr(command, 'check_case')
+        and command.command in aggregate_expression_mapper
+    )
+
+
+def get_aggregate_checks(
+    config: DFSchema, columns: Collection[str]
+) -> list[AggregateCheck]:
+    checks = [
+        (col.id, check)
+        for col in config.columns
+        if col.id in columns
+        for check in col.checks or []
+    ]
+    checks.extend((None, check) for check in config.checks or [])
+    return [(key, check) for key, check in checks if is_aggregate_check(check)]
+
+
+def get_aggregate_frame(
+    lazyframe: pl.LazyFrame, checks: list[AggregateCheck]
+) -> pl.LazyFrame:
+    # One row telling whether each check passed, numbered in `checks`
+    # order, from a single aggregation over the frame. A null aggregate,
+    # such as the mean of an all null column, passes.
+    return lazyframe.select(
+        pl
+        .all_horizontal(check.get_expression()(pa.PolarsData(lazyframe, key)))
+        .fill_null(True)
+        .alias(str(number))
+        for number, (key, check) in enumerate(checks)
+    )
+
+
+def settle_checks(
+    checks: list[CheckSchema] | None,
+    key: str | None,
+    results: dict[tuple[int, str | None], bool],
+) -> list[CheckSchema] | None:
+    if not checks:
+        return checks
+    return [
+        check.model_copy(
+            update={
+                'fn': partial(
+                    aggregate_result_fn, passed=results[id(check), key]
+                )
+            }
+        )
+        if (id(check), key) in results
+        else check
+        for check in checks
+    ]
+
+
+def settle_aggregate_checks(
+    lazyframe: pl.LazyFrame, config: DFSchema
+) -> DFSchema:
+    # Copy of the config where every aggregate check returns its result
+    # from one aggregation pass instead of scanning the frame itself.
+    checks = get_aggregate_checks(
+        config, set(lazyframe.collect_schema().names())
+    )
+    if not checks:
+        return config
+
+    row = get_aggregate_frame(lazyframe, checks).collect().row(0)
+    results = {
+        (id(check), key): passed for (key, check), passed in zip(checks, row)
+    }
+    return config.model_copy(
+        update={
+            'columns': [
+                col.model_copy(
+                    update={
+                        'checks': settle_checks(col.checks, col.id, results)
+                    }
+                )
+                for col in config.columns
+            ],
+            'checks': settle_checks(config.checks, None, results),
+        }
+    )
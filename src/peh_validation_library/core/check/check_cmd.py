@@ -1,17 +1,42 @@
 from collections.abc import Callable
+from functools import partial
 from typing import Any
 
 import pandera.polars as pa
 import polars as pl
 
+from peh_validation_library.core.check.custom_checks import (
+    create_custom_expression,
+    custom_expression_mapper,
+    frame_wise_custom_checks,
+)
+from peh_validation_library.core.check.reference_sets import (
+    load_reference_set,
+)
 from peh_validation_library.core.check.schemas import (
     CaseCheckExpression,
     SimpleCheckExpression,
 )
 from peh_validation_library.core.utils.enums import CheckCases
+from peh_validation_library.core.utils.mappers import (
+    aggregate_expression_mapper,
+    group_expression_mapper,
+)
 
 CheckFn = Callable[[pa.PolarsData, Any], pl.Expr]
 
+ROW_INDEX_KEY = '__row_index__'
+CONDITION_OUTPUT_KEY = 'condition_output'
+
+# Commands whose result for a row depends on the other rows of the column.
+# They cannot be evaluated on a subset of the rows.
+FRAME_WISE_COMMANDS = {
+    'is_unique',
+    'is_duplicated',
+    *group_expression_mapper,
+    *aggregate_expression_mapper,
+}
+
 
 def get_column_subject_expression(
     data: pa.PolarsData, simple_check_expr: SimpleCheckExpression
@@ -26,11 +51,53 @@ def get_column_subject_expression(
     return pl_col
 
 
+def create_group_expression(
+    data, simple_check_expr: SimpleCheckExpression, presorted: bool = False
+) -> pl.Expr:
+    # With `presorted` the rows are already sorted by the group and order
+    # columns, so the window needs no sort of its own.
+    pl_col = get_column_subject_expression(data, simple_check_expr)
+    exp = group_expression_mapper[simple_check_expr.command](
+        pl_col, simple_check_expr.arg_values
+    )
+    return exp.over(
+        simple_check_expr.group_by,
+        order_by=None if presorted else simple_check_expr.order_by,
+    )
+
+
+def create_aggregate_expression(
+    data, simple_check_expr: SimpleCheckExpression
+) -> pl.Expr:
+    # A dataframe check without subject aggregates every column.
+    pl_col = (
+        get_column_subject_expression(data, simple_check_expr)
+        if data.key or simple_check_expr.subject
+        else pl.all()
+    )
+    return aggregate_expression_mapper[simple_check_expr.command](
+        pl_col, simple_check_expr.arg_values
+    )
+
+
 def create_single_expression(
     data, simple_check_expr: SimpleCheckExpression
 ) -> pl.Expr:
+    if simple_check_expr.command in group_expression_mapper:
+        return create_group_expression(data, simple_check_expr)
+    if simple_check_expr.command in aggregate_expression_mapper:
+        return create_aggregate_expression(data, simple_check_expr)
+
     pl_col = get_column_subject_expression(data, simple_check_expr)
 
+    if simple_check_expr.command in custom_expression_mapper:
+        return create_custom_expression(
+            simple_check_expr.command,
+            pl_col,
+            simple_check_expr.arg_values,
+            simple_check_expr.arg_columns,
+        )
+
     if arg_values := simple_check_expr.arg_values:
         if len(arg_values) == 1:
             exp_arg = arg_values[0]
@@ -40,24 +107,23 @@ def create_single_expression(
     if arg_column := simple_check_expr.arg_columns:
         exp_arg = pl.col(arg_column[0])
 
+    # Loaded once per process and shared, not rebuilt from a list.
+    if arg_reference := simple_check_expr.arg_reference:
+        exp_arg = load_reference_set(*simple_check_expr.get_reference())
+
     exp = getattr(pl_col, simple_check_expr.command)
 
-    if (not arg_values) and (not arg_column):
+    if not (arg_values or arg_column or arg_reference):
         return exp()
 
     return exp(exp_arg)
 
 
 def get_single_expression(simple_check_expr: SimpleCheckExpression) -> CheckFn:
-    def single_expression(
-        data,
-        arg_values=None,
-        arg_columns=None,
-        subject=None,
-    ):
-        return create_single_expression(data, simple_check_expr)
-
-    return single_expression
+    # A partial of a module level function, so compiled checks pickle.
+    return partial(
+        create_single_expression, simple_check_expr=simple_check_expr
+    )
 
 
 def create_complex_expression(
@@ -86,15 +152,68 @@ def create_complex_expression(
             )
 
 
-def get_complex_expression(case_check_expr: CaseCheckExpression) -> CheckFn:
-    def complex_expression(
-        data,
-        *params,
-        **kwargs,
-    ) -> CheckFn:
-        return create_complex_expression(data, case_check_expr)
+def create_expression(
+    data, check_expr: SimpleCheckExpression | CaseCheckExpression
+) -> pl.Expr:
+    if hasattr(check_expr, 'check_case'):
+        return create_complex_expression(data, check_expr)
+    return create_single_expression(data, check_expr)
 
-    return complex_expression
+
+def is_row_wise(
+    check_expr: SimpleCheckExpression | CaseCheckExpression,
+) -> bool:
+    if hasattr(check_expr, 'check_case'):
+        return all(is_row_wise(exp) for exp in check_expr.expressions)
+    # Custom callables may look at any row, so they are never row wise.
+    return (
+        isinstance(check_expr.command, str)
+        and check_expr.command not in FRAME_WISE_COMMANDS
+        and check_expr.command not in frame_wise_custom_checks
+    )
+
+
+def create_condition_output(
+    data, case_check_expr: CaseCheckExpression
+) -> pl.LazyFrame:
+    # Three valued output: null where the condition is not met, otherwise
+    # whether the consequent holds. Row wise consequents are only evaluated
+    # on the rows meeting the condition and joined back in row order.
+    condition, consequent = case_check_expr.expressions
+    condition_exp = pl.all_horizontal(create_expression(data, condition))
+    # A null consequent on a row meeting the condition passes, as pandera
+    # ignores nulls; null is reserved for "condition not met".
+    consequent_exp = (
+        pl
+        .all_horizontal(create_expression(data, consequent))
+        .fill_null(True)
+        .alias(CONDITION_OUTPUT_KEY)
+    )
+
+    if not is_row_wise(consequent):
+        return data.lazyframe.select(
+            pl.when(condition_exp).then(consequent_exp)
+        )
+
+    lazyframe = data.lazyframe.with_row_index(ROW_INDEX_KEY)
+    condition_met = lazyframe.filter(condition_exp).select(
+        ROW_INDEX_KEY, consequent_exp
+    )
+    return (
+        lazyframe
+        .select(ROW_INDEX_KEY)
+        .join(
+            condition_met,
+            on=ROW_INDEX_KEY,
+            how='left',
+            maintain_order='left',
+        )
+        .select(CONDITION_OUTPUT_KEY)
+    )
+
+
+def get_complex_expression(case_check_expr: CaseCheckExpression) -> CheckFn:
+    return partial(create_complex_expression, case_check_expr=case_check_expr)
 
 
 def get_expression(
@@ -108,3 +227,9 @@ def get_expression(
 
 def get_check_fn(data: pa.PolarsData, exp: pl.Expr, **kwargs) -> pl.LazyFrame:
     return data.lazyframe.select(exp(data))
+
+
+def get_condition_check_fn(
+    data: pa.PolarsData, case_check_expr: CaseCheckExpression, **kwargs
+) -> pl.LazyFrame:
+    return create_condition_output(data, case_check_expr)
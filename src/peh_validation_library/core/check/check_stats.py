@@ -0,0 +1,368 @@
+from __future__ import annotations
+
+from collections.abc import Collection, Mapping
+import logging
+from pathlib import Path
+from typing import Any
+
+import polars as pl
+
+from peh_validation_library.core.check.schemas import SimpleCheckExpression
+from peh_validation_library.core.models.schemas import CheckSchema, DFSchema
+from peh_validation_library.core.utils.mappers import validation_type_mapper
+
+try:
+    import pyarrow.parquet as pq
+except ImportError:  # pragma: no cover - pyarrow is optional
+    pq = None
+
+logger = logging.getLogger(__name__)
+
+ColumnStatistics = dict[str, Any]
+
+# Commands settled by the column min and max when they take one constant.
+BOUND_PROOFS = {
+    'ge': lambda value, minimum, maximum: minimum >= value,
+    'gt': lambda value, minimum, maximum: minimum > value,
+    'le': lambda value, minimum, maximum: maximum <= value,
+    'lt': lambda value, minimum, maximum: maximum < value,
+    'eq': lambda value, minimum, maximum: minimum == maximum == value,
+    'ne': lambda value, minimum, maximum: value < minimum or value > maximum,
+}
+# Largest integer range expanded to prove an is_in check from min and max.
+MAX_RANGE_SIZE = 10_000
+
+
+def passed_check_fn(data, **kwargs) -> bool:
+    return True
+
+
+def get_statistics_columns(config: DFSchema) -> dict[str, bool]:
+    # Column id -> whether n_unique is needed, for every column with a check
+    # or constraint the statistics may settle.
+    columns = {}
+    for col in config.columns:
+        for check in col.checks or []:
+            if (subject := get_check_subject(check, col.id)) is not None:
+                columns[subject] = columns.get(subject, False) or (
+                    check.check_command.command == 'is_unique'
+                )
+        if col.unique:
+            columns[col.id] = True
+        elif not col.nullable:
+            columns.setdefault(col.id, False)
+    for check in config.checks or []:
+        if (subject := get_check_subject(check, None)) is not None:
+            columns[subject] = columns.get(subject, False) or (
+                check.check_command.command == 'is_unique'
+            )
+    return columns
+
+
+def get_check_subject(check: CheckSchema, key: str | None) -> str | None:
+    command = check.check_command
+    if (
+        command is None
+        or hasattr(command, 'check_case')
+        or not isinstance(command.command, str)
+        or command.arg_columns
+    ):
+        return None
+    if command.subject:
+        return command.subject[0] if len(command.subject) == 1 else None
+    return key
+
+
+def get_column_statistics(
+    lazyframe: pl.LazyFrame, columns: Mapping[str, bool]
+) -> dict[str, ColumnStatistics]:
+    schema = lazyframe.collect_schema()
+    columns = {
+        col: n_unique for col, n_unique in columns.items() if col in schema
+    }
+    if not columns:
+        return {}
+
+    aggregations = [pl.len().alias('len')]
+    for col, n_unique in columns.items():
+        aggregations.extend([
+            pl.col(col).min().alias(f'{col}:min'),
+            pl.col(col).max().alias(f'{col}:max'),
+            pl.col(col).null_count().alias(f'{col}:null_count'),
+        ])
+        if n_unique:
+            aggregations.append(
+                pl.col(col).n_unique().alias(f'{col}:n_unique')
+            )
+        # Min and max skip NaN, so float columns also count them.
+        if schema[col].is_float():
+            aggregations.append(
+                pl.col(col).is_nan().sum().alias(f'{col}:nan_count')
+            )
+
+    # A single aggregation pass answers every column.
+    row = lazyframe.select(aggregations).collect().row(0, named=True)
+    statistics = {}
+    for col in columns:
+        statistics[col] = {
+            key.split(':', 1)[1]: value
+            for key, value in row.items()
+            if key.startswith(f'{col}:')
+        }
+        statistics[col]['len'] = row['len']
+    return statistics
+
+
+def get_constraint_statistics(
+    lazyframe: pl.LazyFrame, config: DFSchema
+) -> dict[str, ColumnStatistics]:
+    # Null counts of the non nullable columns and distinct counts of the
+    # unique columns, for every column of a wide frame in one select.
+    present = set(lazyframe.collect_schema().names())
+    aggregations = []
+    for col in config.columns:
+        if col.id not in present:
+            continue
+        if not col.nullable:
+            aggregations.append(
+                pl.col(col.id).null_count().alias(f'{col.id}:null_count')
+            )
+        if col.unique:
+            aggregations.append(
+                pl.col(col.id).n_unique().alias(f'{col.id}:n_unique')
+            )
+    if not aggregations:
+        return {}
+
+    row = (
+        lazyframe
+        .select(pl.len().alias('len'), *aggregations)
+        .collect()
+        .row(0, named=True)
+    )
+    statistics = {}
+    for key, value in row.items():
+        if key != 'len':
+            col, name = key.rsplit(':', 1)
+            statistics.setdefault(col, {'len': row['len']})[name] = value
+    return statistics
+
+
+def get_verified_dtypes(
+    schema: Mapping[str, pl.DataType], config: DFSchema
+) -> set[str]:
+    # Columns whose dtype already matches the config, from one comparison
+    # of the frame schema instead of a pandera check per column.
+    return {
+        col.id
+        for col in config.columns
+        if col.id in schema
+        and schema[col.id] == validation_type_mapper[col.data_type]
+    }
+
+
+def get_row_group_statistics(
+    path: str | Path, columns: Collection[str], config: DFSchema
+) -> list[tuple[int, dict[str, ColumnStatistics]]]:
+    # Row count and footer statistics of every row group, only for columns
+    # stored with the dtype they are validated as, so the cast cannot change
+    # min and max.
+    if pq is None:
+        return []
+
+    target_types = {
+        col.id: validation_type_mapper[col.data_type] for col in config.columns
+    }
+    file_schema = pl.read_parquet_schema(path)
+    metadata = pq.ParquetFile(path).metadata
+    names = [
+        metadata.schema.column(i).name for i in range(metadata.num_columns)
+    ]
+    indices = {
+        col: names.index(col)
+        for col in columns
+        if col in names and file_schema.get(col) == target_types.get(col)
+    }
+
+    row_groups = []
+    for group in range(metadata.num_row_groups):
+        row_group = metadata.row_group(group)
+        statistics = {}
+        for col, index in indices.items():
+            stats = row_group.column(index).statistics
+            if stats is None or not stats.has_null_count:
+                continue
+            if stats.has_min_max:
+                minimum, maximum = stats.min, stats.max
+            elif stats.null_count == row_group.num_rows:
+                minimum = maximum = None
+            else:
+                continue
+            statistics[col] = {
+                'len': row_group.num_rows,
+                'null_count': stats.null_count,
+                'min': minimum,
+                'max': maximum,
+            }
+        row_groups.append((row_group.num_rows, statistics))
+    return row_groups
+
+
+def merge_statistics(
+    row_groups: list[tuple[int, dict[str, ColumnStatistics]]],
+) -> dict[str, ColumnStatistics]:
+    # Statistics of the whole file, for the columns every row group has.
+    if not row_groups:
+        return {}
+    columns = set.intersection(*(set(stats) for _, stats in row_groups))
+    statistics = {}
+    for col in columns:
+        groups = [stats[col] for _, stats in row_groups]
+        minima = [group['min'] for group in groups if group['min'] is not None]
+        maxima = [group['max'] for group in groups if group['max'] is not None]
+        statistics[col] = {
+            'len': sum(group['len'] for group in groups),
+            'null_count': sum(group['null_count'] for group in groups),
+            'min': min(minima) if minima else None,
+            'max': max(maxima) if maxima else None,
+        }
+        if all('nan_count' in group for group in groups):
+            statistics[col]['nan_count'] = sum(
+                group['nan_count'] for group in groups
+            )
+    return statistics
+
+
+def get_parquet_statistics(
+    path: str | Path, columns: Collection[str], config: DFSchema
+) -> dict[str, ColumnStatistics]:
+    return merge_statistics(get_row_group_statistics(path, columns, config))
+
+
+def is_check_proven(check: CheckSchema, statistics: ColumnStatistics) -> bool:
+    try:
+        return prove_check(check.check_command, statistics)
+    except TypeError:
+        # Constants that do not compare with the column values.
+        return False
+
+
+def may_have_nan(statistics: ColumnStatistics) -> bool:
+    # Min and max skip NaN, which fails every bound. Float statistics
+    # without a NaN count, such as parquet footers, prove nothing.
+    if 'nan_count' in statistics:
+        return statistics['nan_count'] != 0
+    return isinstance(statistics.get('min'), float) or isinstance(
+        statistics.get('max'), float
+    )
+
+
+def prove_check(  # noqa: PLR0911
+    command: SimpleCheckExpression, statistics: ColumnStatistics
+) -> bool:
+    values = command.arg_values or []
+    minimum, maximum = statistics.get('min'), statistics.get('max')
+    null_count, length = statistics.get('null_count'), statistics.get('len')
+    if null_count is None or length is None:
+        return False
+    # Nulls pass every check, so an all-null column passes them all except
+    # is_not_null.
+    all_null = null_count == length
+
+    match command.command:
+        case 'is_not_null':
+            return null_count == 0
+        case 'is_null':
+            return all_null
+        case 'is_unique':
+            return statistics.get('n_unique') == length
+        case command_name if command_name in BOUND_PROOFS:
+            if len(values) != 1:
+                return False
+            if all_null:
+                return True
+            if minimum is None or maximum is None or may_have_nan(statistics):
+                return False
+            return BOUND_PROOFS[command_name](values[0], minimum, maximum)
+        case 'is_in':
+            return all_null or (
+                not may_have_nan(statistics)
+                and is_range_proven(values, minimum, maximum)
+            )
+    return False
+
+
+def is_range_proven(values: list, minimum: Any, maximum: Any) -> bool:
+    if minimum == maximum:
+        return minimum in values
+    if (
+        not isinstance(minimum, int)
+        or not isinstance(maximum, int)
+        or isinstance(minimum, bool)
+        or maximum - minimum >= MAX_RANGE_SIZE
+    ):
+        return False
+    return set(range(minimum, maximum + 1)) <= set(values)
+
+
+def prune_checks(
+    checks: list[CheckSchema] | None,
+    key: str | None,
+    statistics: Mapping[str, ColumnStatistics],
+) -> tuple[list[CheckSchema] | None, int]:
+    if not checks:
+        return checks, 0
+    pruned, skipped = [], 0
+    for check in checks:
+        subject = get_check_subject(check, key)
+        if subject in statistics and is_check_proven(
+            check, statistics[subject]
+        ):
+            pruned.append(check.model_copy(update={'fn': passed_check_fn}))
+            skipped += 1
+        else:
+            pruned.append(check)
+    return pruned, skipped
+
+
+def prune_config(
+    config: DFSchema, statistics: Mapping[str, ColumnStatistics]
+) -> tuple[DFSchema, int]:
+    # Copy of the config where checks proven by the statistics pass without
+    # a row level evaluation.
+    columns, skipped = [], 0
+    for col in config.columns:
+        checks, col_skipped = prune_checks(col.checks, col.id, statistics)
+        update: dict[str, Any] = {'checks': checks}
+        col_stats = statistics.get(col.id, {})
+        if not col.nullable and col_stats.get('null_count') == 0:
+            update['nullable'] = True
+            col_skipped += 1
+        if col.unique and col_stats.get('n_unique') == col_stats.get('len'):
+            update['unique'] = False
+            col_skipped += 1
+        columns.append(col.model_copy(update=update))
+        skipped += col_skipped
+
+    checks, df_skipped = prune_checks(config.checks, None, statistics)
+    return (
+        config.model_copy(update={'columns': columns, 'checks': checks}),
+        skipped + df_skipped,
+    )
+
+
+def get_pruned_config(
+    lazyframe: pl.LazyFrame,
+    config: DFSchema,
+    statistics: Mapping[str, ColumnStatistics] | None = None,
+) -> tuple[DFSchema, int]:
+    statistics = dict(statistics or {})
+    columns = get_statistics_columns(config)
+    missing = {
+        col: n_unique
+        for col, n_unique in columns.items()
+        if col not in statistics
+        or (n_unique and 'n_unique' not in statistics[col])
+    }
+    statistics.update(get_column_statistics(lazyframe, missing))
+    return prune_config(config, statistics)
@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+from collections.abc import Callable
+from functools import cache
+from importlib.metadata import entry_points
+import logging
+from typing import Any
+
+import polars as pl
+
+from peh_validation_library.core.utils.mappers import expression_mapper
+
+# fn(subject=..., arg_values=..., arg_columns=...) -> boolean expression.
+# The subject is the checked column and the argument columns are column
+# expressions, so the check compiles like the built-in commands.
+ExpressionCheck = Callable[..., pl.Expr]
+
+logger = logging.getLogger(__name__)
+
+# Entry point group of the check plugins of installed packages.
+PLUGIN_GROUP = 'peh_validation_library.checks'
+
+# Custom checks registered by name, referenced by that name in configs.
+custom_expression_mapper: dict[str, ExpressionCheck] = {}
+# Registered checks whose result for a row depends on the other rows.
+frame_wise_custom_checks: set[str] = set()
+
+
+def register_check(
+    name: str | None = None, *, row_wise: bool = True, replace: bool = False
+) -> Callable[[ExpressionCheck], ExpressionCheck]:
+    # Decorator; the name defaults to the function name. A registered
+    # custom check is only overridden with `replace`.
+    def register(fn: ExpressionCheck) -> ExpressionCheck:
+        command = name or fn.__name__
+        if command in custom_expression_mapper:
+            if not replace:
+                raise ValueError(
+                    f'Custom check {command!r} is already registered'
+                )
+        elif command in expression_mapper:
+            raise ValueError(f'Cannot override built-in check {command!r}')
+        custom_expression_mapper[command] = fn
+        expression_mapper[command] = command
+        if row_wise:
+            frame_wise_custom_checks.discard(command)
+        else:
+            frame_wise_custom_checks.add(command)
+        return fn
+
+    return register
+
+
+def unregister_check(name: str) -> None:
+    if name not in custom_expression_mapper:
+        raise KeyError(f'Unknown custom check {name!r}')
+    del custom_expression_mapper[name]
+    del expression_mapper[name]
+    frame_wise_custom_checks.discard(name)
+
+
+@cache
+def load_check_plugins() -> tuple[str, ...]:
+    # Imports every plugin once per process, spawned workers included. A
+    # plugin either registers its checks when imported or is itself an
+    # expression check, registered under the entry point name. A plugin that
+    # fails to load is logged and left out, the others still load.
+    loaded = []
+    for entry_point in entry_points(group=PLUGIN_GROUP):
+        try:
+            plugin = entry_point.load()
+            if callable(plugin) and entry_point.name not in expression_mapper:
+                register_check(entry_point.name)(plugin)
+        except Exception as err:
+            logger.error(
+                f'Could not load check plugin {entry_point.name}: {err}'
+            )
+            continue
+        loaded.append(entry_point.name)
+    return tuple(loaded)
+
+
+def get_check_names() -> list[str]:
+    # Every command a config can reference by name: built-in, registered
+    # and plugin checks.
+    load_check_plugins()
+    return sorted(expression_mapper)
+
+
+def create_custom_expression(
+    name: str,
+    subject: pl.Expr,
+    arg_values: list[Any] | None,
+    arg_columns: list[str] | None,
+) -> pl.Expr:
+    return custom_expression_mapper[name](
+        subject=subject,
+        arg_values=arg_values,
+        arg_columns=(
+            [pl.col(column) for column in arg_columns] if arg_columns else None
+        ),
+    )
@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+from collections.abc import Mapping
+from functools import lru_cache
+from pathlib import Path
+import threading
+
+import polars as pl
+
+# Named reference sets of the process: name -> (path, column). The values
+# are loaded on first use and shared by every check and validator. Checks
+# bind the path of their set when they are parsed, and a name cannot be
+# registered again with another file.
+_reference_sets: dict[str, tuple[Path, str | None]] = {}
+_lock = threading.Lock()
+
+
+def register_reference_set(
+    name: str, path: str | Path, column: str | None = None
+) -> None:
+    path = Path(path).resolve()
+    if path.suffix.lower() not in reference_readers:
+        raise RuntimeError(
+            f'Error reading reference set {name!r}: unsupported file type '
+            f'{path.suffix!r}'
+        )
+    with _lock:
+        registered = _reference_sets.setdefault(name, (path, column))
+    if registered != (path, column):
+        raise ValueError(
+            f'Reference set {name!r} is already registered with '
+            f'{registered[0]} column {registered[1]!r}'
+        )
+
+
+def register_reference_sets(references: Mapping[str, Mapping]) -> None:
+    # Config form: {name: {'path': ..., 'column': ...}}.
+    for name, reference in references.items():
+        register_reference_set(
+            name, reference['path'], reference.get('column')
+        )
+
+
+def clear_reference_sets() -> None:
+    with _lock:
+        _reference_sets.clear()
+    load_reference_values.cache_clear()
+
+
+def read_ipc_column(path: Path, column: str | None) -> pl.DataFrame:
+    # Memory mapped: uncompressed files are paged in from the OS cache and
+    # shared by every process reading the same file.
+    return pl.read_ipc(
+        path, columns=[column] if column else None, memory_map=True
+    )
+
+
+def read_parquet_column(path: Path, column: str | None) -> pl.DataFrame:
+    return pl.read_parquet(path, columns=[column] if column else None)
+
+
+reference_readers = {
+    '.arrow': read_ipc_column,
+    '.ipc': read_ipc_column,
+    '.feather': read_ipc_column,
+    '.parquet': read_parquet_column,
+}
+
+
+@lru_cache(maxsize=32)
+def load_reference_values(
+    path: Path, column: str | None, modified: int
+) -> pl.Series:
+    # `modified` is part of the cache key so a rewritten file is reloaded.
+    try:
+        frame = reference_readers[path.suffix.lower()](path, column)
+    except (OSError, pl.exceptions.PolarsError) as err:
+        raise RuntimeError(
+            f'Error reading reference set {path}: {err}'
+        ) from err
+    return frame.to_series(0)
+
+
+def get_reference_path(name: str) -> tuple[Path, str | None]:
+    with _lock:
+        try:
+            return _reference_sets[name]
+        except KeyError as err:
+            raise KeyError(f'Unknown reference set {name!r}') from err
+
+
+def load_reference_set(path: Path, column: str | None) -> pl.Series:
+    return load_reference_values(path, column, path.stat().st_mtime_ns)
+
+
+def get_reference_set(name: str) -> pl.Series:
+    return load_reference_set(*get_reference_path(name))
+
+
+def get_path_fingerprint(path: Path, column: str | None) -> str:
+    # Changes whenever the file behind the set is rewritten.
+    stat = path.stat()
+    return f'{path.resolve()}:{column}:{stat.st_mtime_ns}:{stat.st_size}'
+
+
+def get_reference_fingerprint(name: str) -> str:
+    return get_path_fingerprint(*get_reference_path(name))
@@ -1,14 +1,20 @@
 from __future__ import annotations
 
+from pathlib import Path
 from typing import Any, Callable
 
 import pandera.polars as pa
 import polars as pl
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, model_validator
 
+from peh_validation_library.core.check.reference_sets import (
+    get_reference_path,
+)
 from peh_validation_library.core.utils.enums import CheckCases
 from peh_validation_library.core.utils.mappers import (
+    aggregate_expression_mapper,
     expression_mapper,
+    group_expression_mapper,
 )
 
 
@@ -17,6 +23,36 @@ class SimpleCheckExpression(BaseModel):
     subject: list[str] | None = None
     arg_values: list[Any] | None = None
     arg_columns: list[str] | None = None
+    # Name of a registered reference set used as the argument values.
+    arg_reference: str | None = None
+    # File and column of the reference set, bound when the expression is
+    # parsed so the compiled check keeps reading the set of its own config.
+    reference: tuple[Path, str | None] | None = None
+    # Group and order columns of the group commands; group_by defaults to
+    # the config ids.
+    group_by: list[str] | None = None
+    order_by: list[str] | None = None
+
+    @model_validator(mode='after')
+    def check_command_args(self) -> SimpleCheckExpression:
+        if self.command in group_expression_mapper and not self.group_by:
+            raise ValueError(
+                f'{self.command} needs group_by columns or config ids'
+            )
+        if self.command in aggregate_expression_mapper and not self.arg_values:
+            raise ValueError(f'{self.command} needs arg_values')
+        if self.arg_reference and self.reference is None:
+            try:
+                self.reference = get_reference_path(self.arg_reference)
+            except KeyError:
+                # Reported with the other problems by the config analysis.
+                pass
+        return self
+
+    def get_reference(self) -> tuple[Path, str | None]:
+        if self.reference is not None:
+            return self.reference
+        return get_reference_path(self.arg_reference)
 
     def get_check_name(self) -> str:
         try:
@@ -33,11 +69,20 @@ class SimpleCheckExpression(BaseModel):
             msg += f' {self.arg_values}'
         elif self.arg_columns:
             msg += f' {self.arg_columns}'
+        elif self.arg_reference:
+            msg += f' reference set {self.arg_reference!r}'
+        if self.group_by:
+            msg += f' per {self.group_by}'
+        if self.order_by:
+            msg += f' ordered by {self.order_by}'
         return msg
 
     def map_command(self) -> str:
         self.command = expression_mapper[self.command]
 
+    def get_references(self) -> set[tuple[Path, str | None]]:
+        return {self.get_reference()} if self.arg_reference else set()
+
     def get_args(self) -> dict[str, Any]:
         args = {}
         if self.subject:
@@ -46,6 +91,12 @@ class SimpleCheckExpression(BaseModel):
             args['arg_values'] = self.arg_values
         if self.arg_columns:
             args['arg_columns'] = self.arg_columns
+        if self.arg_reference:
+            args['arg_reference'] = self.arg_reference
+        if self.group_by:
+            args['group_by'] = self.group_by
+        if self.order_by:
+            args['order_by'] = self.order_by
         return args
 
 
@@ -64,6 +115,13 @@ class CaseCheckExpression(BaseModel):
     def get_message(self) -> str:
         return f'{", ".join([e.get_message() for e in self.expressions])}'
 
+    def map_command(self) -> None:
+        for expression in self.expressions:
+            expression.map_command()
+
+    def get_references(self) -> set[tuple[Path, str | None]]:
+        return set().union(*(e.get_references() for e in self.expressions))
+
     def get_args(self) -> dict[str, Any]:
         args = []
         for exp in self.expressions:
@@ -1,6 +1,13 @@
 from __future__ import annotations
 
+from collections.abc import Collection
 from functools import partial
+import hashlib
+import json
+import marshal
+from pathlib import Path
+import re
+from types import CellType, FunctionType
 from typing import Any, Callable
 
 import pandera.polars as pa
@@ -8,14 +15,23 @@ import polars as pl
 from pydantic import BaseModel, ConfigDict
 
 from peh_validation_library.core.check.check_cmd import (
+    CheckFn,
     get_check_fn,
+    get_condition_check_fn,
     get_expression,
 )
+from peh_validation_library.core.check.custom_checks import (
+    load_check_plugins,
+)
+from peh_validation_library.core.check.reference_sets import (
+    get_path_fingerprint,
+)
 from peh_validation_library.core.check.schemas import (
     CaseCheckExpression,
     SimpleCheckExpression,
 )
 from peh_validation_library.core.utils.enums import (
+    CheckCases,
     ErrorLevel,
     ValidationType,
 )
@@ -25,12 +41,65 @@ from peh_validation_library.core.utils.mappers import (
 )
 
 
+def get_args_columns(args_: Any) -> set[str]:
+    # Case checks keep one args mapping per (possibly nested) expression.
+    if isinstance(args_, list):
+        return set().union(*(get_args_columns(arg) for arg in args_))
+    if not isinstance(args_, dict):
+        return set()
+    return set().union(
+        *(
+            args_.get(key) or []
+            for key in ('subject', 'arg_columns', 'group_by', 'order_by')
+        )
+    )
+
+
+def get_cell_contents(cell: CellType) -> Any:
+    try:
+        return cell.cell_contents
+    except ValueError:
+        return None
+
+
+def get_callable_fingerprint(value: Callable) -> str:
+    # Functions are identified by their qualified name, code, defaults and
+    # captured values, so closures over different constants differ. Other
+    # callables, and functions capturing values without a stable repr, are
+    # identified by the object, for this process only.
+    if isinstance(value, partial):
+        parts = [value.func, value.args, value.keywords]
+    elif isinstance(value, FunctionType):
+        parts = [
+            f'{value.__module__}.{value.__qualname__}',
+            hashlib.sha256(marshal.dumps(value.__code__)).hexdigest(),
+            value.__defaults__,
+            value.__kwdefaults__,
+            [get_cell_contents(cell) for cell in value.__closure__ or ()],
+        ]
+    else:
+        return f'id:{id(value)}'
+    fingerprint = json.dumps(
+        parts, sort_keys=True, default=fingerprint_default
+    )
+    if ' at 0x' in fingerprint:
+        return f'id:{id(value)}'
+    return fingerprint
+
+
+def fingerprint_default(value: Any) -> str:
+    if callable(value):
+        return get_callable_fingerprint(value)
+    return repr(value)
+
+
 class CheckSchema(BaseModel):
     name: str
     fn: Callable[[pa.PolarsData, Any], pl.LazyFrame]
     args_: Any | None
     error_level: ErrorLevel
     error_msg: str
+    check_command: SimpleCheckExpression | CaseCheckExpression | None = None
 
     model_config = ConfigDict(arbitrary_types_allowed=True)
 
@@ -42,6 +111,9 @@ class CheckSchema(BaseModel):
         error_level: ErrorLevel = ErrorLevel.ERROR,
         error_msg: str | None = None,
     ) -> CheckSchema:
+        # Commands are resolved by name against the built-in, registered and
+        # plugin checks.
+        load_check_plugins()
         if not name:
             name = check_command.get_check_name()
         if not error_msg:
@@ -49,15 +121,20 @@ class CheckSchema(BaseModel):
         args_ = check_command.get_args()
 
         if hasattr(check_command, 'check_case'):
-            for expression in check_command.expressions:
-                expression.map_command()
-            exp = get_expression(check_command)
+            check_command.map_command()
+            if check_command.check_case == CheckCases.CONDITION:
+                fn = partial(
+                    get_condition_check_fn, case_check_expr=check_command
+                )
+            else:
+                fn = partial(get_check_fn, exp=get_expression(check_command))
             return cls(
                 name=name,
-                fn=partial(get_check_fn, exp=exp),
+                fn=fn,
                 args_=args_,
                 error_level=error_level,
                 error_msg=error_msg,
+                check_command=check_command,
             )
 
         if check_command.command in expression_mapper:
@@ -69,9 +146,12 @@ class CheckSchema(BaseModel):
                 args_=args_,
                 error_level=error_level,
                 error_msg=error_msg,
+                check_command=check_command,
             )
 
         fn = check_command.command
+        if isinstance(fn, str):
+            raise ValueError(f'Unknown check command {fn!r}')
         partial_fn = partial(
             fn,
             arg_values=check_command.arg_values,
@@ -85,8 +165,24 @@ class CheckSchema(BaseModel):
             args_=args_,
             error_level=error_level,
             error_msg=error_msg,
+            check_command=check_command,
         )
 
+    def get_columns(self) -> set[str]:
+        return get_args_columns(self.args_)
+
+    def get_expression(self) -> CheckFn | None:
+        # Expression of a check whose function is a plain select of it; None
+        # for custom callables, condition checks and pruned checks.
+        if isinstance(self.fn, partial) and self.fn.func is get_check_fn:
+            return self.fn.keywords['exp']
+        return None
+
+    def get_references(self) -> set[tuple[Path, str | None]]:
+        if self.check_command is None:
+            return set()
+        return self.check_command.get_references()
+
     def build(self):
         return pa.Check(
             self.fn,
@@ -106,9 +202,15 @@ class ColSchema(BaseModel):
     required: bool
     checks: list[CheckSchema] | None
 
-    def build(self):
+    def get_columns(self) -> set[str]:
+        columns = {self.id}
+        for check in self.checks or []:
+            columns |= check.get_columns()
+        return columns
+
+    def build(self, check_dtype: bool = True):
         return pa.Column(
-            validation_type_mapper[self.data_type],
+            validation_type_mapper[self.data_type] if check_dtype else None,
             nullable=self.nullable,
             unique=self.unique,
             coerce=False,
@@ -122,6 +224,34 @@ class ColSchema(BaseModel):
         )
 
 
+class ColumnSelector(BaseModel):
+    # Attaches one list of checks to many columns. Every given criterion
+    # must match; the selected columns share the same check objects.
+    columns: list[str] | None = None
+    regex: str | None = None
+    data_type: ValidationType | None = None
+    checks: list[CheckSchema]
+
+    def select(self, columns: list[ColSchema]) -> list[ColSchema]:
+        if not (self.columns or self.regex or self.data_type):
+            raise ValueError(
+                'Column selector needs columns, regex or data_type'
+            )
+        unknown = set(self.columns or []) - {col.id for col in columns}
+        if unknown:
+            raise ValueError(
+                f'Unknown columns in selector: {", ".join(sorted(unknown))}'
+            )
+        pattern = re.compile(self.regex) if self.regex else None
+        return [
+            col
+            for col in columns
+            if (self.columns is None or col.id in self.columns)
+            and (pattern is None or pattern.search(col.id))
+            and (self.data_type is None or col.data_type == self.data_type)
+        ]
+
+
 class DFSchema(BaseModel):
     name: str
     columns: list[ColSchema]
@@ -129,9 +259,51 @@ class DFSchema(BaseModel):
     metadata: dict[str, Any] | None
     checks: list[CheckSchema] | None
 
-    def build(self):
+    def get_fingerprint(self) -> str:
+        # Custom check callables are identified by their code and captured
+        # values, see get_callable_fingerprint.
+        payload = self.model_dump(
+            exclude={
+                'columns': {'__all__': {'checks': {'__all__': {'fn'}}}},
+                'checks': {'__all__': {'fn'}},
+            }
+        )
+        # Reference sets are identified by the file behind them.
+        payload['references'] = sorted(
+            get_path_fingerprint(path, column)
+            for path, column in self.get_references()
+        )
+        return hashlib.sha256(
+            json.dumps(
+                payload, sort_keys=True, default=fingerprint_default
+            ).encode()
+        ).hexdigest()
+
+    def get_references(self) -> set[tuple[Path, str | None]]:
+        references = set()
+        for col in self.columns:
+            for check in col.checks or []:
+                references |= check.get_references()
+        for check in self.checks or []:
+            references |= check.get_references()
+        return references
+
+    def get_columns(self) -> set[str]:
+        columns = set(self.ids or [])
+        for col in self.columns:
+            columns |= col.get_columns()
+        for check in self.checks or []:
+            columns |= check.get_columns()
+        return columns
+
+    def build(self, verified_dtypes: Collection[str] = ()):
+        # Columns in `verified_dtypes` are known to have their dtype and
+        # skip the pandera dtype check.
         return pa.DataFrameSchema(
-            columns={col.id: col.build() for col in self.columns},
+            columns={
+                col.id: col.build(col.id not in verified_dtypes)
+                for col in self.columns
+            },
             unique=self.ids,
             name=self.name,
             unique_column_names=True,
@@ -142,3 +314,30 @@ class DFSchema(BaseModel):
                 else None
             ),
         )
+
+
+class ForeignKeySchema(BaseModel):
+    table: str
+    columns: list[str]
+    ref_table: str
+    # Defaults to the ids of the referenced table.
+    ref_columns: list[str] | None = None
+    error_level: ErrorLevel = ErrorLevel.ERROR
+
+    def get_name(self) -> str:
+        return (
+            f'{self.table}({", ".join(self.columns)}) references '
+            f'{self.ref_table}({", ".join(self.ref_columns or [])})'
+        )
+
+
+class DatasetSchema(BaseModel):
+    name: str
+    tables: list[DFSchema]
+    foreign_keys: list[ForeignKeySchema] | None
+
+    def get_table(self, name: str) -> DFSchema:
+        for table in self.tables:
+            if table.name == name:
+                return table
+        raise KeyError(name)
@@ -22,6 +22,32 @@ check_cases_mapper = {
     CheckCases.DISJUNCTION: 'or_',
 }
 
+# Commands evaluated within the groups of a check's `group_by` columns, in
+# the order of its `order_by` columns. Each builds the expression to window
+# over the groups from the subject column and the argument values.
+group_expression_mapper = {
+    'is_unique_in_group': lambda col, values: col.is_unique(),
+    'is_increasing_in_group': lambda col, values: col > col.shift(1),
+    'is_non_decreasing_in_group': lambda col, values: col >= col.shift(1),
+    'has_one_per_group': lambda col, values: col.is_in(values).sum() == 1,
+}
+
+# Commands checking one aggregate of the column, such as its null fraction
+# or mean, against the argument values. Each builds a scalar expression.
+aggregate_expression_mapper = {
+    'has_null_fraction_at_most': lambda col, values: (
+        col.null_count() / pl.len() <= values[0]
+    ),
+    'has_distinct_ratio_at_least': lambda col, values: (
+        col.n_unique() / pl.len() >= values[0]
+    ),
+    'has_mean_between': lambda col, values: col.mean().is_between(*values),
+    'has_quantile_between': lambda col, values: col.quantile(
+        values[0]
+    ).is_between(values[1], values[2]),
+    'has_min_rows': lambda col, values: pl.len() >= values[0],
+}
+
 expression_mapper = {
     'is_equal_to': 'eq',
     'is_equal_to_or_both_missing': 'eq_missing',
@@ -36,4 +62,13 @@ expression_mapper = {
     'is_in': 'is_in',
     'is_null': 'is_null',
     'is_not_null': 'is_not_null',
+    'is_unique_in_group': 'is_unique_in_group',
+    'is_increasing_in_group': 'is_increasing_in_group',
+    'is_non_decreasing_in_group': 'is_non_decreasing_in_group',
+    'has_one_per_group': 'has_one_per_group',
+    'has_null_fraction_at_most': 'has_null_fraction_at_most',
+    'has_distinct_ratio_at_least': 'has_distinct_ratio_at_least',
+    'has_mean_between': 'has_mean_between',
+    'has_quantile_between': 'has_quantile_between',
+    'has_min_rows': 'has_min_rows',
 }
@@ -1,7 +1,20 @@
-from collections.abc import Sequence
+from collections.abc import Collection, Sequence
+from pathlib import Path
 
 import polars as pl
 
+file_readers = {
+    '.csv': pl.scan_csv,
+    '.parquet': pl.scan_parquet,
+    # JSON documents cannot be scanned lazily.
+    '.json': lambda path: pl.read_json(path).lazy(),
+    '.jsonl': pl.scan_ndjson,
+    '.ndjson': pl.scan_ndjson,
+    '.arrow': pl.scan_ipc,
+    '.ipc': pl.scan_ipc,
+    '.feather': pl.scan_ipc,
+}
+
 
 def read_dataframe(
     data: dict[str, Sequence], schema: dict[str, str] | None = None
@@ -10,3 +23,29 @@ def read_dataframe(
         return pl.from_dict(data, schema=schema)
     except (pl.exceptions.ShapeError, TypeError, AttributeError) as err:
         raise RuntimeError(f'Error reading dataframe: {err}') from err
+
+
+def read_dataframe_file(
+    path: str | Path, columns: Collection[str] | None = None
+) -> pl.DataFrame:
+    path = Path(path)
+    try:
+        reader = file_readers[path.suffix.lower()]
+    except KeyError as err:
+        raise RuntimeError(
+            f'Error reading dataframe: unsupported file type {path.suffix!r}'
+        ) from err
+
+    try:
+        lazyframe = reader(path)
+        if columns is not None:
+            # Only project columns present in the file, missing ones are
+            # reported by the schema validation.
+            lazyframe = lazyframe.select(
+                col
+                for col in lazyframe.collect_schema().names()
+                if col in columns
+            )
+        return lazyframe.collect()
+    except (pl.exceptions.PolarsError, OSError) as err:
+        raise RuntimeError(f'Error reading dataframe: {err}') from err
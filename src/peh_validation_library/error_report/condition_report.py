@@ -0,0 +1,69 @@
+import pandera.polars as pa
+import polars as pl
+
+from peh_validation_library.core.check.check_cmd import (
+    CONDITION_OUTPUT_KEY,
+    create_condition_output,
+)
+from peh_validation_library.core.models.schemas import CheckSchema, DFSchema
+from peh_validation_library.core.utils.enums import CheckCases
+
+CONDITION_REPORT_SCHEMA = {
+    'check': pl.Utf8,
+    'column': pl.Utf8,
+    'error_level': pl.Utf8,
+    'condition_not_met': pl.Int64,
+    'passed': pl.Int64,
+    'failed': pl.Int64,
+}
+
+
+def is_condition_check(check: CheckSchema) -> bool:
+    return (
+        getattr(check.check_command, 'check_case', None)
+        == CheckCases.CONDITION
+    )
+
+
+def get_condition_summary(
+    lazyframe: pl.LazyFrame,
+    check: CheckSchema,
+    key: str | None,
+    column: str,
+) -> pl.LazyFrame:
+    output = pl.col(CONDITION_OUTPUT_KEY)
+    return (
+        create_condition_output(
+            pa.PolarsData(lazyframe, key), check.check_command
+        )
+        .select(
+            check=pl.lit(check.name),
+            column=pl.lit(column),
+            error_level=pl.lit(check.error_level.value),
+            condition_not_met=output.is_null().sum(),
+            passed=output.sum(),
+            failed=output.not_().sum(),
+        )
+        .cast(CONDITION_REPORT_SCHEMA)
+    )
+
+
+def get_condition_report(
+    dataframe: pl.DataFrame, config: DFSchema
+) -> pl.DataFrame:
+    lazyframe = dataframe.lazy()
+    summaries = [
+        get_condition_summary(lazyframe, check, col.id, col.id)
+        for col in config.columns
+        for check in col.checks or []
+        if is_condition_check(check)
+    ]
+    summaries.extend(
+        get_condition_summary(lazyframe, check, None, config.name)
+        for check in config.checks or []
+        if is_condition_check(check)
+    )
+    return pl.concat([
+        pl.DataFrame(schema=CONDITION_REPORT_SCHEMA),
+        *pl.collect_all(summaries),
+    ])
@@ -1,8 +1,7 @@
 from functools import cache
 
 
-@cache
-class ErrorCollector:
+class ScopedErrorCollector:
     def __init__(self):
         self._errors = []
 
@@ -14,3 +13,9 @@ class ErrorCollector:
 
     def clear_errors(self):
         self._errors.clear()
+
+
+# Process wide collector shared by every validator that does not get its own.
+@cache
+class ErrorCollector(ScopedErrorCollector):
+    pass
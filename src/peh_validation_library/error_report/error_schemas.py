@@ -1,3 +1,5 @@
+import traceback
+
 from pydantic import BaseModel
 
 from peh_validation_library.core.utils.enums import ErrorLevel
@@ -10,3 +12,17 @@ class ExceptionSchema(BaseModel):
     error_traceback: str
     error_context: str | None = None
     error_source: str | None = None
+
+
+def get_critical_error(
+    err: Exception, error_context: str, error_source: str
+) -> ExceptionSchema:
+    # An exception that stopped a validation; call it while handling err.
+    return ExceptionSchema(
+        error_type=type(err).__name__,
+        error_message=str(err),
+        error_level=ErrorLevel.CRITICAL,
+        error_traceback=traceback.format_exc(),
+        error_context=error_context,
+        error_source=error_source,
+    )
@@ -0,0 +1,136 @@
+from collections.abc import Iterator, Sequence
+
+from pandera.constants import CHECK_OUTPUT_KEY
+import pandera.polars as pa
+import polars as pl
+
+from peh_validation_library.core.utils.enums import ErrorLevel
+from peh_validation_library.error_report.error_schemas import ExceptionSchema
+
+FAILURE_CASES_SCHEMA = {
+    'failure_case': pl.Utf8,
+    'schema_context': pl.Utf8,
+    'column': pl.Utf8,
+    'check': pl.Utf8,
+    'check_number': pl.Int32,
+    'index': pl.Int32,
+    'error_level': pl.Utf8,
+}
+
+
+def get_error_level(schema_error: pa.errors.SchemaError) -> str:
+    check = schema_error.check
+    if check is None or isinstance(check, str) or not check.description:
+        return ErrorLevel.ERROR.value
+    return check.description
+
+
+def get_check_identifier(schema_error: pa.errors.SchemaError) -> str | None:
+    check = schema_error.check
+    if check is None or isinstance(check, str):
+        return check
+    return check.error or check.name or str(check)
+
+
+def iter_schema_error_frames(
+    schema_error: pa.errors.SchemaError, slice_size: int | None = None
+) -> Iterator[pl.DataFrame]:
+    # Failure cases of one error, converted `slice_size` rows at a time.
+    failure_cases = schema_error.failure_cases
+    if isinstance(failure_cases, pl.LazyFrame):
+        failure_cases = failure_cases.collect()
+    metadata = {
+        'schema_context': schema_error.schema.__class__.__name__,
+        'column': schema_error.schema.name,
+        'check': get_check_identifier(schema_error),
+        'check_number': schema_error.check_index,
+        'error_level': get_error_level(schema_error),
+    }
+
+    if not isinstance(failure_cases, pl.DataFrame):
+        yield pl.DataFrame(
+            [{'failure_case': str(failure_cases), 'index': None, **metadata}],
+            schema=FAILURE_CASES_SCHEMA,
+        )
+        return
+
+    index = None
+    check_output = schema_error.check_output
+    if isinstance(check_output, pl.DataFrame):
+        index = (
+            check_output
+            .with_row_index('index')
+            .filter(pl.col(CHECK_OUTPUT_KEY).not_())
+            .get_column('index')
+        )
+        if len(index) != len(failure_cases):
+            index = None
+
+    slice_size = slice_size or max(failure_cases.height, 1)
+    for offset in range(0, failure_cases.height, slice_size):
+        cases = failure_cases.slice(offset, slice_size)
+        if len(cases.columns) > 1:
+            cases = cases.select(
+                failure_case=pl.struct(pl.all()).struct.json_encode()
+            )
+        else:
+            cases = cases.rename({cases.columns[0]: 'failure_case'})
+        yield (
+            cases
+            .with_columns(
+                index=None
+                if index is None
+                else index.slice(offset, slice_size),
+                **{key: pl.lit(value) for key, value in metadata.items()},
+            )
+            .cast(FAILURE_CASES_SCHEMA)
+            .select(FAILURE_CASES_SCHEMA.keys())
+        )
+
+
+def schema_error_to_frame(schema_error: pa.errors.SchemaError) -> pl.DataFrame:
+    return pl.concat([
+        pl.DataFrame(schema=FAILURE_CASES_SCHEMA),
+        *iter_schema_error_frames(schema_error),
+    ])
+
+
+def exception_to_frame(error: ExceptionSchema) -> pl.DataFrame:
+    return pl.DataFrame(
+        [
+            {
+                'failure_case': error.error_message,
+                'schema_context': error.error_context,
+                'column': None,
+                'check': error.error_type,
+                'check_number': None,
+                'index': None,
+                'error_level': error.error_level.value,
+            }
+        ],
+        schema=FAILURE_CASES_SCHEMA,
+    )
+
+
+def iter_failure_cases(
+    errors: Sequence, slice_size: int | None = None
+) -> Iterator[pl.DataFrame]:
+    # Failure cases of every error in frames of at most `slice_size` rows,
+    # so a large report is never converted at once.
+    for error in errors:
+        if isinstance(error, pa.errors.SchemaErrors):
+            for schema_error in error.schema_errors:
+                yield from iter_schema_error_frames(schema_error, slice_size)
+        elif isinstance(error, pa.errors.SchemaError):
+            yield from iter_schema_error_frames(error, slice_size)
+        elif isinstance(error, ExceptionSchema):
+            yield exception_to_frame(error)
+        else:
+            raise TypeError(f'Unsupported error type: {type(error).__name__}')
+
+
+def get_failure_cases(errors: Sequence) -> pl.DataFrame:
+    return pl.concat([
+        pl.DataFrame(schema=FAILURE_CASES_SCHEMA),
+        *iter_failure_cases(errors),
+    ])
@@ -0,0 +1,462 @@
+from __future__ import annotations
+
+from collections.abc import Iterable
+
+import pandera.polars as pa
+import polars as pl
+from pydantic import BaseModel, ConfigDict
+
+from peh_validation_library.core.check.check_aggregates import (
+    get_aggregate_checks,
+    get_aggregate_frame,
+)
+from peh_validation_library.core.check.check_cmd import (
+    ROW_INDEX_KEY,
+    create_group_expression,
+    is_row_wise,
+)
+from peh_validation_library.core.models.schemas import CheckSchema, DFSchema
+from peh_validation_library.core.utils.enums import ErrorLevel
+from peh_validation_library.core.utils.mappers import group_expression_mapper
+from peh_validation_library.error_report.error_schemas import ExceptionSchema
+from peh_validation_library.error_report.failure_cases import (
+    FAILURE_CASES_SCHEMA,
+)
+
+MASK_KEY = 'failure_mask'
+
+# How a mask depends on the rows: ROW_SCOPE masks only look at their own
+# row, UNIQUE_SCOPE masks at the key columns of every row and FRAME_SCOPE
+# masks may look at anything. SCHEMA_SCOPE results only depend on the
+# columns of the frame and AGGREGATE_SCOPE results on one aggregation of
+# all rows; both fail the frame as a whole, not its rows.
+ROW_SCOPE = 'row'
+UNIQUE_SCOPE = 'unique'
+FRAME_SCOPE = 'frame'
+SCHEMA_SCOPE = 'schema'
+AGGREGATE_SCOPE = 'aggregate'
+FRAME_LEVEL_SCOPES = {SCHEMA_SCOPE, AGGREGATE_SCOPE}
+
+
+class FailureMask(BaseModel):
+    # Polars boolean series are stored as packed bit arrays, one bit per
+    # row, so a mask costs height / 8 bytes whatever the failure count.
+    check: str
+    column: str | None
+    schema_context: str
+    check_number: int | None
+    error_level: ErrorLevel
+    mask: pl.Series
+    failure_count: int
+    # Failure case of a check failed by the frame as a whole, such as a
+    # missing column; no row of the mask fails it.
+    frame_failure: str | None = None
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    @property
+    def failed(self) -> bool:
+        return bool(self.failure_count) or self.frame_failure is not None
+
+    def get_index(self) -> pl.Series:
+        return self.mask.arg_true()
+
+    def get_failure_case(self) -> pl.Expr:
+        if self.schema_context == 'Column':
+            return pl.col(self.column)
+        return pl.struct(pl.all()).struct.json_encode()
+
+    def render(
+        self, dataframe: pl.DataFrame, limit: int | None = None
+    ) -> pl.DataFrame:
+        if self.frame_failure is not None:
+            return pl.DataFrame(
+                [
+                    {
+                        'failure_case': self.frame_failure,
+                        'schema_context': self.schema_context,
+                        'column': self.column,
+                        'check': self.check,
+                        'check_number': self.check_number,
+                        'index': None,
+                        'error_level': self.error_level.value,
+                    }
+                ],
+                schema=FAILURE_CASES_SCHEMA,
+            ).head(1 if limit is None else limit)
+        limit = self.failure_count if limit is None else limit
+        return (
+            dataframe
+            .filter(self.mask)
+            .head(limit)
+            .select(self.get_failure_case().alias('failure_case'))
+            .with_columns(
+                schema_context=pl.lit(self.schema_context),
+                column=pl.lit(self.column),
+                check=pl.lit(self.check),
+                check_number=pl.lit(self.check_number),
+                index=self.get_index().head(limit),
+                error_level=pl.lit(self.error_level.value),
+            )
+            .cast(FAILURE_CASES_SCHEMA)
+        )
+
+
+class FailureMasks:
+    def __init__(self, masks: list[FailureMask], height: int) -> None:
+        self.masks = masks
+        self.height = height
+
+    def filter(
+        self, error_levels: Iterable[ErrorLevel] | None = None
+    ) -> list[FailureMask]:
+        if error_levels is None:
+            return self.masks
+        error_levels = set(error_levels)
+        return [
+            mask for mask in self.masks if mask.error_level in error_levels
+        ]
+
+    def any_failure(
+        self, error_levels: Iterable[ErrorLevel] | None = None
+    ) -> pl.Series:
+        combined = pl.repeat(False, self.height, eager=True)
+        for mask in self.filter(error_levels):
+            combined |= mask.mask
+        return combined.alias(MASK_KEY)
+
+    def all_failure(
+        self, error_levels: Iterable[ErrorLevel] | None = None
+    ) -> pl.Series:
+        combined = pl.repeat(True, self.height, eager=True)
+        for mask in self.filter(error_levels):
+            combined &= mask.mask
+        return combined.alias(MASK_KEY)
+
+    def get_counts(self) -> pl.DataFrame:
+        return pl.DataFrame(
+            [
+                {
+                    'check': mask.check,
+                    'column': mask.column,
+                    'error_level': mask.error_level.value,
+                    'failure_count': mask.failure_count,
+                    'failed': mask.failed,
+                }
+                for mask in self.masks
+            ],
+            schema={
+                'check': pl.Utf8,
+                'column': pl.Utf8,
+                'error_level': pl.Utf8,
+                'failure_count': pl.Int64,
+                'failed': pl.Boolean,
+            },
+        )
+
+    def render(self, dataframe: pl.DataFrame) -> pl.DataFrame:
+        return pl.concat([
+            pl.DataFrame(schema=FAILURE_CASES_SCHEMA),
+            *(mask.render(dataframe) for mask in self.masks if mask.failed),
+        ])
+
+
+def get_check_mask(
+    lazyframe: pl.LazyFrame, check: CheckSchema, key: str | None
+) -> pl.LazyFrame:
+    out = check.fn(pa.PolarsData(lazyframe, key))
+    if isinstance(out, bool):
+        return lazyframe.select(pl.repeat(not out, pl.len()).alias(MASK_KEY))
+    # Same reduction as pandera: all outputs must hold, nulls are ignored.
+    return out.select(
+        pl.all_horizontal(pl.all()).fill_null(True).not_().alias(MASK_KEY)
+    )
+
+
+def get_check_scope(check: CheckSchema) -> str:
+    if check.check_command is None or not is_row_wise(check.check_command):
+        return FRAME_SCOPE
+    return ROW_SCOPE
+
+
+def get_shared_masks(
+    lazyframe: pl.LazyFrame, config: DFSchema, columns: set[str]
+) -> dict[tuple[int, str], pl.LazyFrame]:
+    # A check object shared by several columns, as attached by a column
+    # selector, is evaluated for all of them in one cached select. The
+    # masks of the columns are projections of it, keyed by check and column.
+    checks = {}
+    check_columns = {}
+    for col in config.columns:
+        if col.id not in columns:
+            continue
+        for check in col.checks or []:
+            checks[id(check)] = check
+            check_columns.setdefault(id(check), []).append(col.id)
+
+    masks = {}
+    for check_id, shared_columns in check_columns.items():
+        exp = checks[check_id].get_expression()
+        if exp is None or len(shared_columns) == 1:
+            continue
+        shared = lazyframe.select(
+            pl
+            .all_horizontal(exp(pa.PolarsData(lazyframe, column)))
+            .fill_null(True)
+            .not_()
+            .alias(column)
+            for column in shared_columns
+        ).cache()
+        for column in shared_columns:
+            masks[check_id, column] = shared.select(
+                pl.col(column).alias(MASK_KEY)
+            )
+    return masks
+
+
+def get_group_keys(check: CheckSchema) -> tuple[tuple, tuple] | None:
+    # Group and order columns of a group command check evaluated as a plain
+    # select; None for any other check.
+    command = check.check_command
+    if (
+        check.get_expression() is None
+        or hasattr(command, 'check_case')
+        or command.command not in group_expression_mapper
+    ):
+        return None
+    return tuple(command.group_by), tuple(command.order_by or ())
+
+
+def get_group_masks(
+    lazyframe: pl.LazyFrame, config: DFSchema, columns: set[str]
+) -> dict[tuple[int, str | None], pl.LazyFrame]:
+    # Group checks sharing their group and order columns run in one select
+    # on the frame sorted once by those columns, then put back in row order.
+    # Keyed like the shared masks, with None for dataframe checks.
+    checks = [
+        (col.id, check)
+        for col in config.columns
+        if col.id in columns
+        for check in col.checks or []
+    ]
+    checks.extend((None, check) for check in config.checks or [])
+    groups = {}
+    for key, check in checks:
+        if (group_keys := get_group_keys(check)) is not None:
+            groups.setdefault(group_keys, []).append((key, check))
+
+    masks = {}
+    for (group_by, order_by), group_checks in groups.items():
+        if not set(group_by + order_by) <= columns:
+            continue
+        sorted_frame = lazyframe.with_row_index(ROW_INDEX_KEY).sort(
+            [*group_by, *order_by], maintain_order=True
+        )
+        shared = (
+            sorted_frame
+            .select(
+                ROW_INDEX_KEY,
+                *(
+                    pl
+                    .all_horizontal(
+                        create_group_expression(
+                            pa.PolarsData(sorted_frame, key),
+                            check.check_command,
+                            presorted=True,
+                        )
+                    )
+                    .fill_null(True)
+                    .not_()
+                    .alias(str(number))
+                    for number, (key, check) in enumerate(group_checks)
+                ),
+            )
+            .sort(ROW_INDEX_KEY)
+            .cache()
+        )
+        for number, (key, check) in enumerate(group_checks):
+            masks[id(check), key] = shared.select(
+                pl.col(str(number)).alias(MASK_KEY)
+            )
+    return masks
+
+
+def get_aggregate_masks(
+    lazyframe: pl.LazyFrame, config: DFSchema, columns: set[str]
+) -> dict[tuple[int, str | None], pl.LazyFrame]:
+    # Every aggregate check comes from one cached aggregation; its one row
+    # mask is the result of the frame. Keyed like the group masks.
+    checks = get_aggregate_checks(config, columns)
+    if not checks:
+        return {}
+    shared = get_aggregate_frame(lazyframe, checks).cache()
+    return {
+        (id(check), key): shared.select(
+            pl.col(str(number)).not_().alias(MASK_KEY)
+        )
+        for number, (key, check) in enumerate(checks)
+    }
+
+
+def get_missing_column_plan(
+    config: DFSchema, column: str
+) -> tuple[dict, pl.LazyFrame]:
+    # Reported like the pandera column_in_dataframe check of validate.
+    return (
+        {
+            'column': config.name,
+            'schema_context': 'DataFrameSchema',
+            'check': 'column_in_dataframe',
+            'scope': SCHEMA_SCOPE,
+            'failure_case': column,
+        },
+        pl.LazyFrame({MASK_KEY: [True]}),
+    )
+
+
+def get_mask_plans(
+    lazyframe: pl.LazyFrame, config: DFSchema
+) -> list[tuple[dict, pl.LazyFrame]]:
+    columns = set(lazyframe.collect_schema().names())
+    aggregate_masks = get_aggregate_masks(lazyframe, config, columns)
+    shared_masks = {
+        **get_shared_masks(lazyframe, config, columns),
+        **get_group_masks(lazyframe, config, columns),
+        **aggregate_masks,
+    }
+    plans = []
+    for col in config.columns:
+        if col.id not in columns:
+            if col.required:
+                plans.append(get_missing_column_plan(config, col.id))
+            continue
+        metadata = {'column': col.id, 'schema_context': 'Column'}
+        if not col.nullable:
+            plans.append((
+                {**metadata, 'check': 'not_nullable', 'scope': ROW_SCOPE},
+                lazyframe.select(pl.col(col.id).is_null().alias(MASK_KEY)),
+            ))
+        if col.unique:
+            plans.append((
+                {
+                    **metadata,
+                    'check': 'field_uniqueness',
+                    'scope': UNIQUE_SCOPE,
+                    'keys': [col.id],
+                },
+                lazyframe.select(
+                    pl.col(col.id).is_duplicated().alias(MASK_KEY)
+                ),
+            ))
+        for number, check in enumerate(col.checks or []):
+            plans.append((
+                {
+                    **metadata,
+                    'check': check.error_msg,
+                    'check_number': number,
+                    'error_level': check.error_level,
+                    'scope': AGGREGATE_SCOPE
+                    if (id(check), col.id) in aggregate_masks
+                    else get_check_scope(check),
+                },
+                shared_masks[id(check), col.id]
+                if (id(check), col.id) in shared_masks
+                else get_check_mask(lazyframe, check, col.id),
+            ))
+
+    metadata = {'column': config.name, 'schema_context': 'DataFrameSchema'}
+    if config.ids and set(config.ids) <= columns:
+        plans.append((
+            {
+                **metadata,
+                'check': 'multiple_fields_uniqueness',
+                'scope': UNIQUE_SCOPE,
+                'keys': config.ids,
+            },
+            lazyframe.select(
+                pl.struct(config.ids).is_duplicated().alias(MASK_KEY)
+            ),
+        ))
+    for number, check in enumerate(config.checks or []):
+        plans.append((
+            {
+                **metadata,
+                'check': check.error_msg,
+                'check_number': number,
+                'error_level': check.error_level,
+                'scope': AGGREGATE_SCOPE
+                if (id(check), None) in aggregate_masks
+                else get_check_scope(check),
+            },
+            shared_masks[id(check), None]
+            if (id(check), None) in shared_masks
+            else get_check_mask(lazyframe, check, None),
+        ))
+    return plans
+
+
+def make_failure_mask(
+    metadata: dict, mask: pl.Series, height: int
+) -> FailureMask:
+    if metadata['scope'] in FRAME_LEVEL_SCOPES:
+        # One result for the whole frame, never spread over its rows.
+        return FailureMask(
+            check=metadata['check'],
+            column=metadata['column'],
+            schema_context=metadata['schema_context'],
+            check_number=metadata.get('check_number'),
+            error_level=metadata.get('error_level', ErrorLevel.ERROR),
+            mask=pl.repeat(False, height, eager=True).alias(MASK_KEY),
+            failure_count=0,
+            frame_failure=(
+                metadata.get('failure_case', 'False') if mask.any() else None
+            ),
+        )
+    if len(mask) == 1 and height != 1:
+        mask = pl.repeat(mask[0], height, eager=True)
+    return FailureMask(
+        check=metadata['check'],
+        column=metadata['column'],
+        schema_context=metadata['schema_context'],
+        check_number=metadata.get('check_number'),
+        error_level=metadata.get('error_level', ErrorLevel.ERROR),
+        mask=mask.alias(MASK_KEY),
+        failure_count=mask.sum(),
+    )
+
+
+def get_exception_mask(error: ExceptionSchema, height: int) -> FailureMask:
+    # An error that stopped the masks from being computed, such as an
+    # uncastable column, as a failure of the frame.
+    return FailureMask(
+        check=error.error_type,
+        column=None,
+        schema_context=error.error_context,
+        check_number=None,
+        error_level=error.error_level,
+        mask=pl.repeat(False, height, eager=True).alias(MASK_KEY),
+        failure_count=0,
+        frame_failure=error.error_message,
+    )
+
+
+def get_masks_from_results(
+    plans: list[tuple[dict, pl.LazyFrame]],
+    results: list[pl.DataFrame],
+    height: int,
+) -> FailureMasks:
+    return FailureMasks(
+        [
+            make_failure_mask(metadata, result.get_column(MASK_KEY), height)
+            for (metadata, _), result in zip(plans, results)
+        ],
+        height,
+    )
+
+
+def get_failure_masks(
+    dataframe: pl.DataFrame, config: DFSchema
+) -> FailureMasks:
+    plans = get_mask_plans(dataframe.lazy(), config)
+    results = pl.collect_all([plan for _, plan in plans])
+    return get_masks_from_results(plans, results, dataframe.height)
@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+from collections.abc import Sequence
+
+import polars as pl
+
+from peh_validation_library.error_report.failure_masks import (
+    FailureMask,
+    FailureMasks,
+)
+
+FAILURE_SUMMARY_SCHEMA = {
+    'schema_context': pl.Utf8,
+    'column': pl.Utf8,
+    'check': pl.Utf8,
+    'check_number': pl.Int32,
+    'error_level': pl.Utf8,
+    'failure_case': pl.Utf8,
+    'count': pl.Int64,
+    'first_index': pl.Int64,
+    'last_index': pl.Int64,
+    'sample_ids': pl.List(pl.Utf8),
+}
+INDEX_KEY = 'index'
+ID_KEY = 'id'
+
+
+def get_mask_cases(
+    lazyframe: pl.LazyFrame,
+    mask: FailureMask,
+    ids: Sequence[str] | None = None,
+) -> pl.LazyFrame:
+    # Failing rows of one mask, kept lazy so the summary can aggregate them
+    # without materializing every failure case. Rows are identified by their
+    # id columns, or by their index without.
+    row_id = (
+        pl.struct(ids).struct.json_encode()
+        if ids
+        else pl.int_range(pl.len()).cast(pl.Utf8)
+    )
+    return (
+        lazyframe
+        .select(
+            mask.get_failure_case().cast(pl.Utf8).alias('failure_case'),
+            row_id.alias(ID_KEY),
+        )
+        .with_row_index(INDEX_KEY)
+        .filter(pl.lit(mask.mask))
+        .with_columns(
+            schema_context=pl.lit(mask.schema_context),
+            column=pl.lit(mask.column),
+            check=pl.lit(mask.check),
+            check_number=pl.lit(mask.check_number, pl.Int32),
+            error_level=pl.lit(mask.error_level.value),
+        )
+    )
+
+
+def get_frame_failures(masks: FailureMasks) -> pl.DataFrame:
+    # Checks failed by the frame as a whole count once, without rows.
+    return pl.DataFrame(
+        [
+            {
+                'schema_context': mask.schema_context,
+                'column': mask.column,
+                'check': mask.check,
+                'check_number': mask.check_number,
+                'error_level': mask.error_level.value,
+                'failure_case': mask.frame_failure,
+                'count': 1,
+                'sample_ids': [],
+            }
+            for mask in masks.masks
+            if mask.frame_failure is not None
+        ],
+        schema=FAILURE_SUMMARY_SCHEMA,
+    )
+
+
+def get_failure_summary(
+    dataframe: pl.DataFrame,
+    masks: FailureMasks,
+    ids: Sequence[str] | None = None,
+    sample_size: int = 5,
+) -> pl.DataFrame:
+    # One row per check, column and failing value with the number of rows,
+    # the first and last failing index and a few ids of the failing rows.
+    lazyframe = dataframe.lazy()
+    cases = [
+        get_mask_cases(lazyframe, mask, ids)
+        for mask in masks.masks
+        if mask.failure_count
+    ]
+    frame_failures = get_frame_failures(masks)
+    if not cases:
+        return frame_failures
+
+    keys = [
+        'schema_context',
+        'column',
+        'check',
+        'check_number',
+        'error_level',
+        'failure_case',
+    ]
+    return (
+        pl
+        .concat(cases, how='diagonal')
+        .group_by(keys, maintain_order=True)
+        .agg(
+            count=pl.len(),
+            first_index=pl.col(INDEX_KEY).first(),
+            last_index=pl.col(INDEX_KEY).last(),
+            sample_ids=pl.col(ID_KEY).head(sample_size),
+        )
+        .cast(FAILURE_SUMMARY_SCHEMA)
+        .select(FAILURE_SUMMARY_SCHEMA)
+        .collect()
+        .vstack(frame_failures)
+    )
@@ -0,0 +1,190 @@
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from pathlib import Path
+import sys
+import tempfile
+from typing import TextIO
+
+import polars as pl
+
+from peh_validation_library.error_report.error_collector import (
+    ScopedErrorCollector,
+)
+from peh_validation_library.error_report.failure_cases import (
+    FAILURE_CASES_SCHEMA,
+    iter_failure_cases,
+)
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # pragma: no cover - pyarrow is optional
+    pa = pq = None
+
+DEFAULT_FLUSH_SIZE = 10_000
+
+
+class ReportSink(ABC):
+    # Buffers failure cases and writes them out in slices of `flush_size`
+    # rows, so a report never has to fit in memory.
+    def __init__(self, flush_size: int = DEFAULT_FLUSH_SIZE) -> None:
+        if flush_size < 1:
+            raise ValueError('flush_size must be at least 1')
+        self.flush_size = flush_size
+        self.rows_written = 0
+        self._buffer: list[pl.DataFrame] = []
+        self._buffered_rows = 0
+
+    def __enter__(self) -> ReportSink:
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def write(self, failure_cases: pl.DataFrame) -> None:
+        while not failure_cases.is_empty():
+            size = self.flush_size - self._buffered_rows
+            self._buffer.append(failure_cases.head(size))
+            self._buffered_rows += min(size, failure_cases.height)
+            failure_cases = failure_cases.slice(size)
+            if self._buffered_rows >= self.flush_size:
+                self.flush()
+
+    def flush(self) -> None:
+        if not self._buffer:
+            return
+        frame = pl.concat(self._buffer, how='diagonal_relaxed')
+        self._buffer.clear()
+        self._buffered_rows = 0
+        self._write(frame)
+        self.rows_written += frame.height
+
+    def close(self) -> None:
+        self.flush()
+        self._close()
+
+    @abstractmethod
+    def _write(self, frame: pl.DataFrame) -> None: ...
+
+    def _close(self) -> None:
+        pass
+
+
+class JsonlSink(ReportSink):
+    # Every flush is appended and flushed to the stream, so the report can
+    # be tailed while the validation runs.
+    def __init__(
+        self,
+        output: str | Path | TextIO | None = None,
+        flush_size: int = DEFAULT_FLUSH_SIZE,
+    ) -> None:
+        super().__init__(flush_size)
+        self._owns_stream = isinstance(output, (str, Path))
+        if self._owns_stream:
+            self.stream = open(output, 'w', encoding='utf-8')
+        else:
+            self.stream = output or sys.stdout
+
+    def _write(self, frame: pl.DataFrame) -> None:
+        self.stream.write(frame.write_ndjson())
+        self.stream.flush()
+
+    def _close(self) -> None:
+        if self._owns_stream:
+            self.stream.close()
+
+
+class FileSink(ReportSink):
+    # Columnar sinks append one batch per flush with a pyarrow writer. Without
+    # pyarrow the batches are spooled to disk and combined on close.
+    def __init__(
+        self, path: str | Path, flush_size: int = DEFAULT_FLUSH_SIZE
+    ) -> None:
+        super().__init__(flush_size)
+        self.path = Path(path)
+        self._writer = None
+        self._schema = None
+        self._spool: tempfile.TemporaryDirectory | None = None
+        self._chunks = 0
+
+    @abstractmethod
+    def _open_writer(self, schema): ...
+
+    @abstractmethod
+    def _combine(self, lazyframe: pl.LazyFrame) -> None: ...
+
+    def _write(self, frame: pl.DataFrame) -> None:
+        if pa is None:
+            if self._spool is None:
+                self._spool = tempfile.TemporaryDirectory()
+            frame.write_ipc(
+                Path(self._spool.name) / f'{self._chunks:08}.arrow'
+            )
+            self._chunks += 1
+            return
+        table = frame.to_arrow()
+        if self._writer is None:
+            self._schema = table.schema
+            self._writer = self._open_writer(self._schema)
+        self._writer.write_table(table.cast(self._schema))
+
+    def _close(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+        elif self._spool is not None:
+            self._combine(pl.scan_ipc(Path(self._spool.name) / '*.arrow'))
+            self._spool.cleanup()
+        else:
+            self._combine(pl.LazyFrame(schema=FAILURE_CASES_SCHEMA))
+
+
+class ParquetSink(FileSink):
+    def _open_writer(self, schema):
+        return pq.ParquetWriter(self.path, schema)
+
+    def _combine(self, lazyframe: pl.LazyFrame) -> None:
+        lazyframe.sink_parquet(self.path)
+
+
+class IpcSink(FileSink):
+    def _open_writer(self, schema):
+        return pa.ipc.new_file(self.path, schema)
+
+    def _combine(self, lazyframe: pl.LazyFrame) -> None:
+        lazyframe.sink_ipc(self.path)
+
+
+report_sinks = {
+    'jsonl': JsonlSink,
+    'parquet': ParquetSink,
+    'ipc': IpcSink,
+}
+
+
+def get_report_sink(
+    output: str | Path | None,
+    output_format: str = 'jsonl',
+    flush_size: int = DEFAULT_FLUSH_SIZE,
+) -> ReportSink:
+    try:
+        sink = report_sinks[output_format]
+    except KeyError as err:
+        raise ValueError(
+            f'Unsupported report format {output_format!r}'
+        ) from err
+    if output is None and sink is not JsonlSink:
+        raise ValueError(f'An output path is required for {output_format}')
+    return sink(output, flush_size=flush_size)
+
+
+class ReportSinkCollector(ScopedErrorCollector):
+    # Writes every error to a sink as failure cases instead of keeping it in
+    # memory; get_errors stays empty.
+    def __init__(self, sink: ReportSink) -> None:
+        super().__init__()
+        self.sink = sink
+
+    def add_error(self, error) -> None:
+        for failure_cases in iter_failure_cases([error], self.sink.flush_size):
+            self.sink.write(failure_cases)
@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+from collections.abc import Iterator
+
+import polars as pl
+from pydantic import BaseModel, ConfigDict
+
+from peh_validation_library.core.models.schemas import DFSchema
+from peh_validation_library.core.utils.enums import ErrorLevel
+from peh_validation_library.error_report.failure_masks import (
+    MASK_KEY,
+    FailureMask,
+    get_mask_plans,
+    make_failure_mask,
+)
+from peh_validation_library.validator.scheduler import (
+    CostModel,
+    collect_timed,
+    get_plan_costs,
+    get_static_costs,
+    schedule_plans,
+)
+
+
+class CheckResult(BaseModel):
+    check: str
+    column: str | None
+    schema_context: str
+    check_number: int | None
+    error_level: ErrorLevel
+    passed: bool
+    failure_count: int
+    sample: pl.DataFrame
+    duration: float
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+
+def get_check_result(
+    mask: FailureMask,
+    dataframe: pl.DataFrame,
+    sample_size: int,
+    duration: float,
+) -> CheckResult:
+    return CheckResult(
+        check=mask.check,
+        column=mask.column,
+        schema_context=mask.schema_context,
+        check_number=mask.check_number,
+        error_level=mask.error_level,
+        passed=not mask.failed,
+        failure_count=mask.failure_count,
+        sample=mask.render(dataframe, limit=sample_size),
+        duration=duration,
+    )
+
+
+def iter_check_results(  # noqa: PLR0913
+    dataframe: pl.DataFrame,
+    config: DFSchema,
+    sample_size: int = 5,
+    batch_size: int = 1,
+    *,
+    cost_model: CostModel | None = None,
+    fail_fast: bool = False,
+) -> Iterator[CheckResult]:
+    # Runs the checks by error level and cheapest first, `batch_size` fused
+    # plans at a time, and yields the result of each check as soon as its
+    # batch finished. With `fail_fast` it stops after the first failing
+    # critical check.
+    if batch_size < 1:
+        raise ValueError('batch_size must be at least 1')
+    static_costs = get_static_costs(config)
+    plans = schedule_plans(
+        get_mask_plans(dataframe.lazy(), config), static_costs, cost_model
+    )
+    for start in range(0, len(plans), batch_size):
+        batch = plans[start : start + batch_size]
+        results, duration = collect_timed([plan for _, plan in batch])
+        costs = get_plan_costs(batch, static_costs)
+        static_total = sum(static_cost for _, static_cost, _ in costs)
+        for (metadata, _), result, (label, static_cost, _) in zip(
+            batch, results, costs
+        ):
+            if cost_model is not None:
+                cost_model.record(
+                    label, static_cost, duration * static_cost / static_total
+                )
+            mask = make_failure_mask(
+                metadata, result.get_column(MASK_KEY), dataframe.height
+            )
+            # Checks of a fused batch share its duration.
+            yield get_check_result(mask, dataframe, sample_size, duration)
+            if (
+                fail_fast
+                and mask.failed
+                and mask.error_level == ErrorLevel.CRITICAL
+            ):
+                return
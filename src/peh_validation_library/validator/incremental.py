@@ -0,0 +1,263 @@
+from __future__ import annotations
+
+import polars as pl
+from pydantic import BaseModel, ConfigDict
+
+from peh_validation_library.core.models.schemas import DFSchema
+from peh_validation_library.error_report.failure_masks import (
+    MASK_KEY,
+    ROW_SCOPE,
+    UNIQUE_SCOPE,
+    FailureMask,
+    FailureMasks,
+    get_mask_plans,
+    make_failure_mask,
+)
+
+KEY_HASH_KEY = 'key_hash'
+COUNT_KEY = 'count'
+
+
+class ValidationState(BaseModel):
+    # Everything needed to validate the next version of a dataset from its
+    # delta: per row hashes, the failure masks and, for every uniqueness
+    # constraint, the key hash of each row with the count of each key.
+    config_fingerprint: str
+    plan_labels: list[tuple]
+    row_hashes: pl.Series
+    masks: FailureMasks
+    key_hashes: dict[int, pl.Series]
+    key_counts: dict[int, pl.DataFrame]
+    delta_size: int
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+
+def get_plan_label(metadata: dict) -> tuple:
+    label = (
+        metadata['schema_context'],
+        metadata['column'],
+        metadata['check'],
+        metadata.get('check_number'),
+    )
+    # Frame failures of one check, such as missing columns, differ only by
+    # their failure case.
+    if 'failure_case' in metadata:
+        return (*label, metadata['failure_case'])
+    return label
+
+
+def get_key_hash(lazyframe: pl.LazyFrame, keys: list[str]) -> pl.LazyFrame:
+    return lazyframe.select(pl.struct(keys).hash().alias(KEY_HASH_KEY))
+
+
+def get_key_counts(key_hash: pl.Series) -> pl.DataFrame:
+    return (
+        key_hash
+        .to_frame()
+        .group_by(KEY_HASH_KEY)
+        .agg(pl.len().cast(pl.Int64).alias(COUNT_KEY))
+    )
+
+
+def get_changed_rows(
+    previous: pl.Series, current: pl.Series
+) -> pl.Series | None:
+    # Positions of new or changed rows. Removed rows are not supported and
+    # force a full validation.
+    if len(current) < len(previous):
+        return None
+    changed = (
+        current.head(len(previous)).ne_missing(previous).arg_true()
+    ).cast(pl.UInt32)
+    appended = pl.arange(
+        len(previous), len(current), dtype=pl.UInt32, eager=True
+    )
+    return pl.concat([changed, appended])
+
+
+def extend(series: pl.Series, height: int, fill_value) -> pl.Series:
+    # Always a copy: scatter updates in place and the previous state must
+    # stay untouched.
+    if len(series) >= height:
+        return series.clone()
+    return pl.concat([
+        series,
+        pl.repeat(
+            fill_value, height - len(series), dtype=series.dtype, eager=True
+        ),
+    ])
+
+
+def validate_full(
+    dataframe: pl.DataFrame, config: DFSchema, row_hashes: pl.Series
+) -> ValidationState:
+    lazyframe = dataframe.lazy()
+    plans = get_mask_plans(lazyframe, config)
+    unique_plans = [
+        (number, metadata)
+        for number, (metadata, _) in enumerate(plans)
+        if metadata['scope'] == UNIQUE_SCOPE
+    ]
+    results = pl.collect_all([
+        *(plan for _, plan in plans),
+        *(get_key_hash(lazyframe, meta['keys']) for _, meta in unique_plans),
+    ])
+
+    key_hashes = {
+        number: result.get_column(KEY_HASH_KEY)
+        for (number, _), result in zip(unique_plans, results[len(plans) :])
+    }
+    return ValidationState(
+        config_fingerprint=config.get_fingerprint(),
+        plan_labels=[get_plan_label(metadata) for metadata, _ in plans],
+        row_hashes=row_hashes,
+        masks=FailureMasks(
+            [
+                make_failure_mask(
+                    metadata, result.get_column(MASK_KEY), dataframe.height
+                )
+                for (metadata, _), result in zip(plans, results)
+            ],
+            dataframe.height,
+        ),
+        key_hashes=key_hashes,
+        key_counts={
+            number: get_key_counts(key_hash)
+            for number, key_hash in key_hashes.items()
+        },
+        delta_size=dataframe.height,
+    )
+
+
+def get_failed_state(
+    dataframe: pl.DataFrame, config: DFSchema, mask: FailureMask
+) -> ValidationState:
+    # State of a frame that could not be validated; without plans the next
+    # version is validated in full.
+    return ValidationState(
+        config_fingerprint=config.get_fingerprint(),
+        plan_labels=[],
+        row_hashes=dataframe.hash_rows(seed=0),
+        masks=FailureMasks([mask], dataframe.height),
+        key_hashes={},
+        key_counts={},
+        delta_size=dataframe.height,
+    )
+
+
+def update_unique_mask(
+    mask: pl.Series,
+    key_hash: pl.Series,
+    key_counts: pl.DataFrame,
+    changed: pl.Series,
+    delta_key_hash: pl.Series,
+) -> tuple[pl.Series, pl.Series, pl.DataFrame]:
+    previous_height = len(key_hash)
+    height = len(mask)
+    removed = key_hash.gather(changed.filter(changed < previous_height))
+    key_hash = extend(key_hash, height, 0)
+    if len(changed):
+        key_hash = key_hash.scatter(changed, delta_key_hash)
+
+    delta_counts = (
+        pl
+        .concat([
+            delta_key_hash.to_frame().with_columns(
+                pl.lit(1, pl.Int64).alias(COUNT_KEY)
+            ),
+            removed.to_frame().with_columns(
+                pl.lit(-1, pl.Int64).alias(COUNT_KEY)
+            ),
+        ])
+        .group_by(KEY_HASH_KEY)
+        .agg(pl.col(COUNT_KEY).sum())
+    )
+    key_counts = (
+        key_counts
+        .join(delta_counts, on=KEY_HASH_KEY, how='full', coalesce=True)
+        .select(
+            KEY_HASH_KEY,
+            (
+                pl.col(COUNT_KEY).fill_null(0)
+                + pl.col(f'{COUNT_KEY}_right').fill_null(0)
+            ).alias(COUNT_KEY),
+        )
+        .filter(pl.col(COUNT_KEY) > 0)
+    )
+
+    # Only rows sharing a key with a changed row can change status; they
+    # are found in the key index, not by rescanning the data.
+    affected = key_hash.is_in(delta_counts.get_column(KEY_HASH_KEY)).arg_true()
+    status = (
+        key_hash
+        .gather(affected)
+        .to_frame()
+        .join(key_counts, on=KEY_HASH_KEY, how='left', maintain_order='left')
+        .get_column(COUNT_KEY)
+        > 1
+    )
+    mask = mask.scatter(affected, status) if len(affected) else mask
+    return mask, key_hash, key_counts
+
+
+def validate_incremental(
+    dataframe: pl.DataFrame,
+    config: DFSchema,
+    state: ValidationState | None = None,
+) -> ValidationState:
+    row_hashes = dataframe.hash_rows(seed=0)
+    lazyframe = dataframe.lazy()
+    plans = get_mask_plans(lazyframe, config)
+    changed = get_changed_rows(state.row_hashes, row_hashes) if state else None
+    if (
+        changed is None
+        or state.config_fingerprint != config.get_fingerprint()
+        or state.plan_labels != [get_plan_label(meta) for meta, _ in plans]
+    ):
+        return validate_full(dataframe, config, row_hashes)
+
+    delta = dataframe.select(pl.all().gather(changed))
+    delta_plans = get_mask_plans(delta.lazy(), config)
+    queries = []
+    for (metadata, plan), (_, delta_plan) in zip(plans, delta_plans):
+        if metadata['scope'] == ROW_SCOPE:
+            queries.append(delta_plan)
+        elif metadata['scope'] == UNIQUE_SCOPE:
+            queries.append(get_key_hash(delta.lazy(), metadata['keys']))
+        else:
+            queries.append(plan)
+    results = pl.collect_all(queries)
+
+    height = dataframe.height
+    masks = []
+    key_hashes = {}
+    key_counts = {}
+    for number, ((metadata, _), result, previous) in enumerate(
+        zip(plans, results, state.masks.masks)
+    ):
+        if metadata['scope'] == ROW_SCOPE:
+            mask = extend(previous.mask, height, False)
+            if len(changed):
+                mask = mask.scatter(changed, result.get_column(MASK_KEY))
+        elif metadata['scope'] == UNIQUE_SCOPE:
+            mask, key_hashes[number], key_counts[number] = update_unique_mask(
+                extend(previous.mask, height, False),
+                state.key_hashes[number],
+                state.key_counts[number],
+                changed,
+                result.get_column(KEY_HASH_KEY),
+            )
+        else:
+            mask = result.get_column(MASK_KEY)
+        masks.append(make_failure_mask(metadata, mask, height))
+
+    return ValidationState(
+        config_fingerprint=state.config_fingerprint,
+        plan_labels=state.plan_labels,
+        row_hashes=row_hashes,
+        masks=FailureMasks(masks, height),
+        key_hashes=key_hashes,
+        key_counts=key_counts,
+        delta_size=len(changed),
+    )
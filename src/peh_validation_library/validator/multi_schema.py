@@ -0,0 +1,262 @@
+from __future__ import annotations
+
+from collections.abc import Sequence
+import json
+
+import polars as pl
+from pydantic import BaseModel, ConfigDict
+
+from peh_validation_library.core.models.schemas import CheckSchema, DFSchema
+from peh_validation_library.core.utils.enums import ErrorLevel
+from peh_validation_library.core.utils.mappers import validation_type_mapper
+from peh_validation_library.error_report.failure_masks import (
+    FailureMasks,
+    get_mask_plans,
+    get_masks_from_results,
+)
+from peh_validation_library.validator.incremental import get_plan_label
+
+RANKING_SCHEMA = {
+    'schema': pl.Utf8,
+    'rank': pl.Int64,
+    'schema_errors': pl.Int64,
+    'missing_columns': pl.Int64,
+    'undeclared_columns': pl.Int64,
+    'dtype_failures': pl.Int64,
+    'critical_failures': pl.Int64,
+    'failures': pl.Int64,
+    'failed_checks': pl.Int64,
+    'cast_error': pl.Utf8,
+}
+
+
+class MultiSchemaResult(BaseModel):
+    # Failure masks of every schema the frame could be cast to, and the
+    # schemas ranked from the best to the worst match.
+    masks: dict[str, FailureMasks]
+    dataframes: dict[str, pl.DataFrame]
+    ranking: pl.DataFrame
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    def get_report(self, name: str) -> pl.DataFrame:
+        return self.masks[name].render(self.dataframes[name])
+
+    def get_best_match(self) -> str:
+        return self.ranking.get_column('schema')[0]
+
+
+def get_cast_types(
+    config: DFSchema, columns: Sequence[str]
+) -> tuple[tuple[str, pl.DataType], ...]:
+    return tuple(
+        (col.id, validation_type_mapper[col.data_type])
+        for col in config.columns
+        if col.id in columns
+    )
+
+
+def get_dtype_failures(
+    dataframe: pl.DataFrame, configs: Sequence[DFSchema]
+) -> dict[tuple[str, pl.DataType], int]:
+    # Values that do not cast to the type a column is declared with, for
+    # every distinct column and type of the candidate schemas in one select.
+    pairs = list(
+        dict.fromkeys(
+            pair
+            for config in configs
+            for pair in get_cast_types(config, dataframe.columns)
+        )
+    )
+    if not pairs:
+        return {}
+    counts = dataframe.select(
+        (
+            pl.col(column).is_not_null()
+            & pl.col(column).cast(data_type, strict=False).is_null()
+        )
+        .sum()
+        .alias(str(number))
+        for number, (column, data_type) in enumerate(pairs)
+    ).row(0)
+    return dict(zip(pairs, counts))
+
+
+def get_schema_errors(
+    config: DFSchema,
+    columns: Sequence[str],
+    dtype_failures: dict[tuple[str, pl.DataType], int],
+) -> dict[str, int]:
+    # Mismatches between the frame and the schema itself: required columns
+    # the frame lacks, frame columns the schema does not declare and
+    # columns with values that do not cast to their declared type.
+    declared = {col.id for col in config.columns}
+    missing = sum(
+        col.required and col.id not in columns for col in config.columns
+    )
+    undeclared = sum(column not in declared for column in columns)
+    failures = [
+        dtype_failures[pair] for pair in get_cast_types(config, columns)
+    ]
+    return {
+        'schema_errors': missing + undeclared + sum(map(bool, failures)),
+        'missing_columns': missing,
+        'undeclared_columns': undeclared,
+        'dtype_failures': sum(failures),
+    }
+
+
+def get_check_key(check: CheckSchema) -> str:
+    # Checks with the same command, subject and arguments have the same
+    # mask whatever schema they come from. Custom callables only match
+    # themselves.
+    if check.check_command is None:
+        return f'fn:{id(check.fn)}'
+    return json.dumps(
+        check.check_command.model_dump(),
+        sort_keys=True,
+        default=lambda value: (
+            f'fn:{id(value)}' if callable(value) else repr(value)
+        ),
+    )
+
+
+def get_plan_keys(config: DFSchema) -> dict[tuple, tuple]:
+    # Schema independent key of every mask plan of the config, by label.
+    keys = {}
+    for col in config.columns:
+        keys[
+            'DataFrameSchema',
+            config.name,
+            'column_in_dataframe',
+            None,
+            col.id,
+        ] = ('missing', col.id)
+        keys['Column', col.id, 'not_nullable', None] = ('null', col.id)
+        keys['Column', col.id, 'field_uniqueness', None] = ('unique', col.id)
+        for number, check in enumerate(col.checks or []):
+            keys['Column', col.id, check.error_msg, number] = (
+                'check',
+                col.id,
+                get_check_key(check),
+            )
+    context = ('DataFrameSchema', config.name)
+    keys[(*context, 'multiple_fields_uniqueness', None)] = (
+        'unique',
+        *(config.ids or []),
+    )
+    for number, check in enumerate(config.checks or []):
+        keys[(*context, check.error_msg, number)] = (
+            'frame_check',
+            get_check_key(check),
+        )
+    return keys
+
+
+def get_ranking(
+    masks: dict[str, FailureMasks],
+    cast_errors: dict[str, str],
+    schema_errors: dict[str, dict[str, int]],
+) -> pl.DataFrame:
+    # Schemas the frame does not fit rank below those it does, whatever
+    # their check failures. Missing required columns are counted there
+    # rather than as failed checks.
+    rows = [
+        {
+            'schema': name,
+            **schema_errors[name],
+            'critical_failures': sum(
+                mask.failure_count
+                for mask in schema_masks.filter([ErrorLevel.CRITICAL])
+            ),
+            'failures': sum(mask.failure_count for mask in schema_masks.masks),
+            'failed_checks': sum(
+                mask.failed
+                for mask in schema_masks.masks
+                if mask.check != 'column_in_dataframe'
+            ),
+            'cast_error': None,
+        }
+        for name, schema_masks in masks.items()
+    ]
+    rows.extend(
+        {'schema': name, **schema_errors[name], 'cast_error': error}
+        for name, error in cast_errors.items()
+    )
+    return (
+        pl
+        .DataFrame(rows, schema=RANKING_SCHEMA)
+        .sort(
+            'schema_errors',
+            pl.col('cast_error').is_not_null(),
+            'critical_failures',
+            'failures',
+            'failed_checks',
+            nulls_last=True,
+            maintain_order=True,
+        )
+        .with_columns(rank=pl.int_range(1, pl.len() + 1))
+    )
+
+
+def validate_schemas(
+    dataframe: pl.DataFrame, configs: Sequence[DFSchema]
+) -> MultiSchemaResult:
+    # Every distinct cast is done once and every distinct check evaluated
+    # once, in a single collect_all over all candidate schemas.
+    names = [config.name for config in configs]
+    if len(set(names)) != len(names):
+        raise ValueError('Candidate schemas must have distinct names')
+
+    dtype_failures = get_dtype_failures(dataframe, configs)
+    schema_errors = {
+        config.name: get_schema_errors(
+            config, dataframe.columns, dtype_failures
+        )
+        for config in configs
+    }
+    casts: dict[tuple, pl.DataFrame | str] = {}
+    dataframes = {}
+    cast_errors = {}
+    for config in configs:
+        cast_types = get_cast_types(config, dataframe.columns)
+        if cast_types not in casts:
+            try:
+                casts[cast_types] = dataframe.cast(dict(cast_types))
+            except pl.exceptions.PolarsError as err:
+                casts[cast_types] = str(err)
+        if isinstance(casts[cast_types], str):
+            cast_errors[config.name] = casts[cast_types]
+        else:
+            dataframes[config.name] = casts[cast_types]
+
+    unique_plans: dict[tuple, pl.LazyFrame] = {}
+    schema_plans = {}
+    for config in configs:
+        if config.name not in dataframes:
+            continue
+        cast_types = get_cast_types(config, dataframe.columns)
+        plan_keys = get_plan_keys(config)
+        plans = get_mask_plans(dataframes[config.name].lazy(), config)
+        keys = [
+            (cast_types, plan_keys[get_plan_label(metadata)])
+            for metadata, _ in plans
+        ]
+        for key, (_, plan) in zip(keys, plans):
+            unique_plans.setdefault(key, plan)
+        schema_plans[config.name] = (plans, keys)
+
+    results = dict(
+        zip(unique_plans, pl.collect_all(list(unique_plans.values())))
+    )
+    masks = {
+        name: get_masks_from_results(
+            plans, [results[key] for key in keys], dataframe.height
+        )
+        for name, (plans, keys) in schema_plans.items()
+    }
+    return MultiSchemaResult(
+        masks=masks,
+        dataframes=dataframes,
+        ranking=get_ranking(masks, cast_errors, schema_errors),
+    )
@@ -0,0 +1,187 @@
+from __future__ import annotations
+
+from collections.abc import Mapping
+
+import polars as pl
+
+from peh_validation_library.core.models.schemas import (
+    DatasetSchema,
+    ForeignKeySchema,
+)
+from peh_validation_library.core.utils.enums import ErrorLevel
+from peh_validation_library.error_report.error_collector import (
+    ScopedErrorCollector,
+)
+from peh_validation_library.error_report.failure_cases import (
+    FAILURE_CASES_SCHEMA,
+)
+from peh_validation_library.validator.validator import Validator
+
+TABLE_KEY = 'table'
+FOREIGN_KEY_CONTEXT = 'ForeignKey'
+
+
+def get_key_sets(
+    frames: Mapping[str, pl.LazyFrame], foreign_keys: list[ForeignKeySchema]
+) -> dict[tuple, pl.LazyFrame]:
+    # One cached set of distinct keys per referenced table and columns,
+    # shared by every foreign key pointing at it.
+    key_sets = {}
+    for foreign_key in foreign_keys:
+        key = (foreign_key.ref_table, tuple(foreign_key.ref_columns))
+        if key not in key_sets:
+            key_sets[key] = (
+                frames[foreign_key.ref_table]
+                .select(foreign_key.ref_columns)
+                .drop_nulls()
+                .unique()
+                .cache()
+            )
+    return key_sets
+
+
+def get_key_error(
+    schemas: Mapping[str, pl.Schema], foreign_key: ForeignKeySchema
+) -> str | None:
+    # Why the key cannot be joined to the referenced table, if it cannot:
+    # a missing key column or key types the join does not supercast.
+    ref_columns = foreign_key.ref_columns or []
+    for table, columns in (
+        (foreign_key.table, foreign_key.columns),
+        (foreign_key.ref_table, ref_columns),
+    ):
+        missing = [
+            column for column in columns if column not in schemas[table]
+        ]
+        if missing:
+            return f'Missing key columns in {table}: {", ".join(missing)}'
+    for column, ref_column in zip(foreign_key.columns, ref_columns):
+        data_type = schemas[foreign_key.table][column]
+        ref_data_type = schemas[foreign_key.ref_table][ref_column]
+        if data_type != ref_data_type and not (
+            data_type.is_integer() and ref_data_type.is_integer()
+        ):
+            return (
+                f'Key column {foreign_key.table}.{column} ({data_type}) does '
+                f'not match {foreign_key.ref_table}.{ref_column} '
+                f'({ref_data_type})'
+            )
+    return None
+
+
+def get_key_error_frame(
+    foreign_key: ForeignKeySchema, error: str
+) -> pl.DataFrame:
+    # A key that cannot be checked fails the whole relation.
+    return pl.DataFrame(
+        [
+            {
+                'failure_case': error,
+                'schema_context': FOREIGN_KEY_CONTEXT,
+                'column': ', '.join(foreign_key.columns),
+                'check': foreign_key.get_name(),
+                'check_number': None,
+                'index': None,
+                'error_level': ErrorLevel.CRITICAL.value,
+                TABLE_KEY: foreign_key.table,
+            }
+        ],
+        schema={**FAILURE_CASES_SCHEMA, TABLE_KEY: pl.Utf8},
+    )
+
+
+def get_orphans(
+    frame: pl.LazyFrame, key_set: pl.LazyFrame, foreign_key: ForeignKeySchema
+) -> pl.LazyFrame:
+    # Rows whose key is missing from the referenced table, as failure cases.
+    # Rows with a null in the key reference nothing and are not checked.
+    columns = foreign_key.columns
+    return (
+        frame
+        .select(columns)
+        .with_row_index('index')
+        .drop_nulls(columns)
+        .join(
+            key_set,
+            left_on=columns,
+            right_on=foreign_key.ref_columns,
+            how='anti',
+            maintain_order='left',
+        )
+        .select(
+            failure_case=pl.struct(columns).struct.json_encode(),
+            schema_context=pl.lit(FOREIGN_KEY_CONTEXT),
+            column=pl.lit(', '.join(columns)),
+            check=pl.lit(foreign_key.get_name()),
+            check_number=pl.lit(None),
+            index=pl.col('index'),
+            error_level=pl.lit(foreign_key.error_level.value),
+        )
+        .cast(FAILURE_CASES_SCHEMA)
+        .with_columns(table=pl.lit(foreign_key.table))
+    )
+
+
+def check_foreign_keys(
+    frames: Mapping[str, pl.DataFrame | pl.LazyFrame], dataset: DatasetSchema
+) -> pl.DataFrame:
+    foreign_keys = [
+        foreign_key
+        for foreign_key in dataset.foreign_keys or []
+        if foreign_key.table in frames and foreign_key.ref_table in frames
+    ]
+    lazyframes = {name: frame.lazy() for name, frame in frames.items()}
+    schemas = {
+        name: frame.collect_schema() for name, frame in lazyframes.items()
+    }
+    checked = []
+    key_errors = []
+    for foreign_key in foreign_keys:
+        if error := get_key_error(schemas, foreign_key):
+            key_errors.append(get_key_error_frame(foreign_key, error))
+        else:
+            checked.append(foreign_key)
+    key_sets = get_key_sets(lazyframes, checked)
+    orphans = [
+        get_orphans(
+            lazyframes[foreign_key.table],
+            key_sets[foreign_key.ref_table, tuple(foreign_key.ref_columns)],
+            foreign_key,
+        )
+        for foreign_key in checked
+    ]
+    return pl.concat([
+        pl.DataFrame(schema={**FAILURE_CASES_SCHEMA, TABLE_KEY: pl.Utf8}),
+        *key_errors,
+        *pl.collect_all(orphans),
+    ])
+
+
+def validate_dataset(
+    frames: Mapping[str, pl.DataFrame], dataset: DatasetSchema
+) -> pl.DataFrame:
+    # Failure cases of every table and of the foreign keys between them,
+    # with the table they belong to. Foreign keys are checked on the cast
+    # tables so the key types match.
+    missing = {table.name for table in dataset.tables} - set(frames)
+    if missing:
+        raise ValueError(f'Missing tables: {", ".join(sorted(missing))}')
+
+    reports = []
+    cast_frames = {}
+    for table in dataset.tables:
+        validator = Validator(
+            frames[table.name], table, error_collector=ScopedErrorCollector()
+        )
+        reports.append(
+            validator.get_report().with_columns(
+                pl.lit(table.name).alias(TABLE_KEY)
+            )
+        )
+        try:
+            cast_frames[table.name] = validator.cast_dataframe()
+        except pl.exceptions.PolarsError:
+            # Already reported by the table validation; the foreign keys of
+            # a table that cannot be cast are not checked.
+            continue
+    return pl.concat([*reports, check_foreign_keys(cast_frames, dataset)])
@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+from collections import OrderedDict
+import hashlib
+import logging
+import os
+from pathlib import Path
+import tempfile
+import threading
+
+import polars as pl
+
+from peh_validation_library.core.models.schemas import DFSchema
+
+logger = logging.getLogger(__name__)
+
+
+def get_dataframe_hash(dataframe: pl.DataFrame) -> str:
+    # Row hashes are vectorized; imploding them into a single list hash
+    # keeps the result sensitive to row order. Polars hashes are not stable
+    # across releases, so the version is part of the key.
+    row_hashes = dataframe.hash_rows(seed=0).implode()
+    content = (
+        pl.__version__,
+        str(dataframe.schema),
+        dataframe.height,
+        row_hashes.hash(seed=1).item(),
+        row_hashes.hash(seed=2).item(),
+    )
+    return hashlib.sha256(repr(content).encode()).hexdigest()
+
+
+def get_cache_key(config: DFSchema, dataframe: pl.DataFrame) -> str:
+    return hashlib.sha256(
+        f'{config.get_fingerprint()}:{get_dataframe_hash(dataframe)}'.encode()
+    ).hexdigest()
+
+
+class ResultCache:
+    def __init__(
+        self,
+        max_entries: int = 128,
+        directory: str | Path | None = None,
+    ) -> None:
+        if max_entries < 0:
+            raise ValueError('max_entries must not be negative')
+        self.max_entries = max_entries
+        self.directory = Path(directory) if directory else None
+        if self.directory:
+            self.directory.mkdir(parents=True, exist_ok=True)
+        self._memory: OrderedDict[str, pl.DataFrame] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._memory)
+
+    def _get_path(self, key: str) -> Path:
+        return self.directory / f'{key}.arrow'
+
+    def _put_memory(self, key: str, report: pl.DataFrame) -> None:
+        if not self.max_entries:
+            return
+        with self._lock:
+            self._memory[key] = report
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.max_entries:
+                self._memory.popitem(last=False)
+
+    def get(self, key: str) -> pl.DataFrame | None:
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                return self._memory[key]
+
+        if self.directory is None:
+            return None
+        path = self._get_path(key)
+        try:
+            report = pl.read_ipc(path, memory_map=False)
+        except (OSError, pl.exceptions.PolarsError):
+            return None
+        logger.info(f'Result cache disk hit {key}')
+        self._put_memory(key, report)
+        return report
+
+    def put(self, key: str, report: pl.DataFrame) -> None:
+        self._put_memory(key, report)
+        if self.directory is None:
+            return
+        # Write then rename so readers never see a partial file.
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        os.close(fd)
+        try:
+            report.write_ipc(tmp_path)
+            os.replace(tmp_path, self._get_path(key))
+        except OSError as err:
+            logger.warning(f'Could not write result cache entry {key}: {err}')
+            Path(tmp_path).unlink(missing_ok=True)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._memory.clear()
+        if self.directory is not None:
+            for path in self.directory.glob('*.arrow'):
+                path.unlink(missing_ok=True)
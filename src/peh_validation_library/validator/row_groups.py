@@ -0,0 +1,189 @@
+from __future__ import annotations
+
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
+from itertools import accumulate
+import logging
+from pathlib import Path
+
+import polars as pl
+
+from peh_validation_library.core.check.check_stats import (
+    ColumnStatistics,
+    get_row_group_statistics,
+    passed_check_fn,
+    prune_config,
+)
+from peh_validation_library.core.models.schemas import CheckSchema, DFSchema
+from peh_validation_library.core.utils.mappers import validation_type_mapper
+from peh_validation_library.error_report.error_schemas import (
+    get_critical_error,
+)
+from peh_validation_library.error_report.failure_masks import (
+    MASK_KEY,
+    ROW_SCOPE,
+    FailureMasks,
+    get_exception_mask,
+    get_mask_plans,
+    make_failure_mask,
+)
+from peh_validation_library.validator.incremental import get_plan_label
+
+logger = logging.getLogger(__name__)
+
+
+def scan_parquet(path: str | Path, config: DFSchema) -> pl.LazyFrame:
+    # The config columns present in the file, cast to their validation types.
+    lazyframe = pl.scan_parquet(path)
+    present = set(lazyframe.collect_schema().names())
+    columns = sorted(config.get_columns() & present)
+    return lazyframe.select(columns).cast({
+        col.id: validation_type_mapper[col.data_type]
+        for col in config.columns
+        if col.id in present
+    })
+
+
+def get_proven_check_labels(
+    checks: list[CheckSchema] | None,
+    pruned_checks: list[CheckSchema] | None,
+    schema_context: str,
+    column: str,
+) -> set[tuple]:
+    return {
+        (schema_context, column, check.error_msg, number)
+        for number, (check, pruned_check) in enumerate(
+            zip(checks or [], pruned_checks or [])
+        )
+        if pruned_check.fn is passed_check_fn
+        and check.fn is not passed_check_fn
+    }
+
+
+def get_proven_labels(
+    config: DFSchema, statistics: dict[str, ColumnStatistics]
+) -> set[tuple]:
+    # Labels of the mask plans the statistics prove to have no failure.
+    pruned, _ = prune_config(config, statistics)
+    labels = set()
+    for col, pruned_col in zip(config.columns, pruned.columns):
+        if not col.nullable and pruned_col.nullable:
+            labels.add(('Column', col.id, 'not_nullable', None))
+        labels |= get_proven_check_labels(
+            col.checks, pruned_col.checks, 'Column', col.id
+        )
+    labels |= get_proven_check_labels(
+        config.checks, pruned.checks, 'DataFrameSchema', config.name
+    )
+    return labels
+
+
+def validate_row_group(
+    lazyframe: pl.LazyFrame,
+    config: DFSchema,
+    row_group: tuple[int, int],
+    row_labels: list[tuple],
+    proven: set[tuple],
+) -> list[pl.Series]:
+    # Row level masks of one row group, in the order of `row_labels`.
+    offset, length = row_group
+    if set(row_labels) <= proven:
+        logger.debug(f'Skipping row group at row {offset}, proven by stats')
+        return [pl.repeat(False, length, eager=True) for _ in row_labels]
+
+    group = lazyframe.slice(offset, length).collect()
+    plans = {
+        get_plan_label(metadata): plan
+        for metadata, plan in get_mask_plans(group.lazy(), config)
+        if metadata['scope'] == ROW_SCOPE
+    }
+    pending = [label for label in row_labels if label not in proven]
+    results = dict(
+        zip(pending, pl.collect_all([plans[label] for label in pending]))
+    )
+    return [
+        results[label].get_column(MASK_KEY)
+        if label in results
+        else pl.repeat(False, length, eager=True)
+        for label in row_labels
+    ]
+
+
+def collect_row_groups(
+    lazyframe: pl.LazyFrame,
+    config: DFSchema,
+    plans: list[tuple[dict, pl.LazyFrame]],
+    row_groups: list[tuple[int, dict[str, ColumnStatistics]]],
+    max_workers: int | None,
+) -> tuple[list[list[pl.Series]], Iterator[pl.DataFrame]]:
+    # Row level masks of every row group and the results of the other
+    # plans, which need every row.
+    row_labels = [
+        get_plan_label(metadata)
+        for metadata, _ in plans
+        if metadata['scope'] == ROW_SCOPE
+    ]
+    offsets = [0, *accumulate(length for length, _ in row_groups)]
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [
+            executor.submit(
+                validate_row_group,
+                lazyframe,
+                config,
+                (offset, length),
+                row_labels,
+                get_proven_labels(config, statistics),
+            )
+            for offset, (length, statistics) in zip(offsets, row_groups)
+        ]
+        global_results = iter(
+            pl.collect_all([
+                plan
+                for metadata, plan in plans
+                if metadata['scope'] != ROW_SCOPE
+            ])
+        )
+        group_masks = [future.result() for future in futures]
+    return group_masks, global_results
+
+
+def validate_parquet(
+    path: str | Path, config: DFSchema, max_workers: int | None = None
+) -> FailureMasks:
+    # Row level checks run per row group in parallel and are skipped for
+    # row groups whose footer statistics prove them. Uniqueness and frame
+    # level checks need every row and run once on the whole file.
+    lazyframe = scan_parquet(path, config)
+    plans = get_mask_plans(lazyframe, config)
+    row_groups = get_row_group_statistics(
+        path, lazyframe.collect_schema().names(), config
+    )
+    if not row_groups:
+        # Without the footer metadata the file is a single unit of work.
+        row_groups = [
+            (pl.scan_parquet(path).select(pl.len()).collect().item(), {})
+        ]
+    height = sum(length for length, _ in row_groups)
+
+    try:
+        group_masks, global_results = collect_row_groups(
+            lazyframe, config, plans, row_groups, max_workers
+        )
+    except pl.exceptions.PolarsError as err:
+        # Data the strict cast rejects fails the file, as in the validator.
+        logger.error(f'Error validating {path}: {err}')
+        error = get_critical_error(err, 'validate_parquet', __name__)
+        return FailureMasks([get_exception_mask(error, height)], height)
+
+    masks = []
+    row_number = 0
+    for metadata, _ in plans:
+        if metadata['scope'] == ROW_SCOPE:
+            mask = pl.concat([
+                group[row_number] for group in group_masks
+            ]).rechunk()
+            row_number += 1
+        else:
+            mask = next(global_results).get_column(MASK_KEY)
+        masks.append(make_failure_mask(metadata, mask, height))
+    return FailureMasks(masks, height)
@@ -0,0 +1,200 @@
+from __future__ import annotations
+
+from collections.abc import Sequence
+from statistics import NormalDist
+
+import polars as pl
+from pydantic import BaseModel, ConfigDict
+
+from peh_validation_library.core.models.schemas import DFSchema
+from peh_validation_library.error_report.failure_masks import (
+    MASK_KEY,
+    ROW_SCOPE,
+    SCHEMA_SCOPE,
+    UNIQUE_SCOPE,
+    FailureMask,
+    get_mask_plans,
+    make_failure_mask,
+)
+
+# Row level failure rates are estimated from the sample. Global checks are
+# only failed when the sample already breaks them; otherwise they remain
+# unverified until a full validation.
+ESTIMATED = 'estimated'
+FAILED = 'failed'
+UNVERIFIED = 'unverified'
+ALLOCATION_KEY = '__allocation__'
+
+SAMPLING_REPORT_SCHEMA = {
+    'schema_context': pl.Utf8,
+    'column': pl.Utf8,
+    'check': pl.Utf8,
+    'check_number': pl.Int32,
+    'error_level': pl.Utf8,
+    'status': pl.Utf8,
+    'sample_failures': pl.Int64,
+    'sample_size': pl.Int64,
+    'failure_rate': pl.Float64,
+    'ci_lower': pl.Float64,
+    'ci_upper': pl.Float64,
+    'estimated_failures': pl.Float64,
+}
+
+
+class SamplingResult(BaseModel):
+    estimates: pl.DataFrame
+    population_size: int
+    # Failure cases of the full validation, when the sample escalated.
+    failure_cases: pl.DataFrame | None = None
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    def has_failures(self) -> bool:
+        return bool(self.estimates.get_column('sample_failures').sum())
+
+
+def sample_dataframe(
+    dataframe: pl.DataFrame,
+    size: int,
+    stratify_by: Sequence[str] | None = None,
+    seed: int = 0,
+) -> pl.DataFrame:
+    # Uniform sample of `size` rows, or a stratified sample with every
+    # stratum sampled in proportion to its size. Row order is kept.
+    if size < 1:
+        raise ValueError('size must be at least 1')
+    if size >= dataframe.height:
+        return dataframe
+    if not stratify_by:
+        return dataframe.filter(
+            pl.int_range(pl.len()).shuffle(seed=seed) < size
+        )
+    allocation = get_allocation(dataframe, stratify_by, size)
+    return (
+        dataframe
+        .join(
+            allocation,
+            on=stratify_by,
+            how='left',
+            nulls_equal=True,
+            maintain_order='left',
+        )
+        .filter(
+            pl.int_range(pl.len()).shuffle(seed=seed).over(stratify_by)
+            < pl.col(ALLOCATION_KEY)
+        )
+        .drop(ALLOCATION_KEY)
+    )
+
+
+def get_allocation(
+    dataframe: pl.DataFrame, stratify_by: Sequence[str], size: int
+) -> pl.DataFrame:
+    # Rows sampled per stratum by largest remainder: every stratum gets the
+    # floor of its proportional share and the rows left over go to the
+    # largest fractions, so the allocation adds up to `size` exactly.
+    quota = pl.col(ALLOCATION_KEY) * size / dataframe.height
+    strata = (
+        dataframe
+        .group_by(stratify_by, maintain_order=True)
+        .agg(pl.len().alias(ALLOCATION_KEY))
+        .with_columns(
+            quota.floor().cast(pl.Int64).alias('floor'),
+            (quota - quota.floor()).alias('remainder'),
+        )
+    )
+    left_over = size - strata.get_column('floor').sum()
+    return strata.select(
+        *stratify_by,
+        (
+            pl.col('floor')
+            + (
+                pl.col('remainder').rank('ordinal', descending=True)
+                <= left_over
+            )
+        ).alias(ALLOCATION_KEY),
+    )
+
+
+def get_wilson_interval(
+    failures: pl.Expr, size: pl.Expr, z: float
+) -> tuple[pl.Expr, pl.Expr]:
+    # Wilson score interval, which stays inside [0, 1] for rare failures.
+    rate = failures / size
+    denominator = 1 + z**2 / size
+    center = (rate + z**2 / (2 * size)) / denominator
+    half_width = (
+        z
+        * (rate * (1 - rate) / size + z**2 / (4 * size**2)).sqrt()
+        / denominator
+    )
+    return (center - half_width).clip(0, 1), (center + half_width).clip(0, 1)
+
+
+def get_sample_status(scope: str, mask: FailureMask) -> str:
+    if scope == ROW_SCOPE:
+        return ESTIMATED
+    # Duplicated keys or missing columns in the sample are so in the whole
+    # frame.
+    if scope in {UNIQUE_SCOPE, SCHEMA_SCOPE} and mask.failed:
+        return FAILED
+    return UNVERIFIED
+
+
+def get_estimate_row(mask: FailureMask, status: str, sample_size: int) -> dict:
+    return {
+        'schema_context': mask.schema_context,
+        'column': mask.column,
+        'check': mask.check,
+        'check_number': mask.check_number,
+        'error_level': mask.error_level.value,
+        'status': status,
+        # A failure of the frame as a whole counts once.
+        'sample_failures': mask.failure_count
+        or int(mask.frame_failure is not None),
+        'sample_size': sample_size,
+    }
+
+
+def get_estimates(
+    rows: list[dict], population_size: int, confidence: float = 0.95
+) -> pl.DataFrame:
+    z = NormalDist().inv_cdf((1 + confidence) / 2)
+    failures = pl.col('sample_failures')
+    size = pl.col('sample_size')
+    estimated = pl.col('status') == ESTIMATED
+    ci_lower, ci_upper = get_wilson_interval(failures, size, z)
+    return (
+        pl
+        .DataFrame(rows, schema=SAMPLING_REPORT_SCHEMA)
+        .with_columns(
+            failure_rate=pl.when(estimated).then(failures / size),
+            ci_lower=pl.when(estimated).then(ci_lower),
+            ci_upper=pl.when(estimated).then(ci_upper),
+            estimated_failures=pl.when(estimated).then(
+                failures / size * population_size
+            ),
+        )
+        .cast(SAMPLING_REPORT_SCHEMA)
+    )
+
+
+def estimate_failures(
+    sample: pl.DataFrame,
+    config: DFSchema,
+    population_size: int,
+    confidence: float = 0.95,
+) -> pl.DataFrame:
+    plans = get_mask_plans(sample.lazy(), config)
+    results = pl.collect_all([plan for _, plan in plans])
+    rows = []
+    for (metadata, _), result in zip(plans, results):
+        mask = make_failure_mask(
+            metadata, result.get_column(MASK_KEY), sample.height
+        )
+        rows.append(
+            get_estimate_row(
+                mask, get_sample_status(metadata['scope'], mask), sample.height
+            )
+        )
+    return get_estimates(rows, population_size, confidence)
@@ -0,0 +1,223 @@
+from __future__ import annotations
+
+from collections.abc import Sequence
+from concurrent.futures import ThreadPoolExecutor
+import heapq
+import json
+from pathlib import Path
+import threading
+import time
+
+import polars as pl
+
+from peh_validation_library.core.check.schemas import SimpleCheckExpression
+from peh_validation_library.core.models.schemas import CheckSchema, DFSchema
+from peh_validation_library.core.utils.enums import ErrorLevel
+from peh_validation_library.validator.incremental import get_plan_label
+
+# Order in which checks are run: critical failures are reported first.
+ERROR_LEVEL_PRIORITY = {
+    ErrorLevel.CRITICAL: 0,
+    ErrorLevel.ERROR: 1,
+    ErrorLevel.WARNING: 2,
+}
+
+# Relative cost of a command evaluated on one column. Hash based commands
+# build a table of the column and cost the most.
+COMMAND_COSTS = {
+    'is_null': 1.0,
+    'is_not_null': 1.0,
+    'eq': 2.0,
+    'ne': 2.0,
+    'eq_missing': 2.0,
+    'ne_missing': 2.0,
+    'gt': 2.0,
+    'ge': 2.0,
+    'lt': 2.0,
+    'le': 2.0,
+    'is_in': 4.0,
+    'is_unique': 20.0,
+    'is_duplicated': 20.0,
+}
+# Commands without a static estimate, such as custom callables.
+DEFAULT_COST = 10.0
+# Extra cost of every column a check reads besides its subject.
+COLUMN_COST = 2.0
+# Weight of the latest duration in the profiled average.
+SMOOTHING = 0.3
+
+
+def estimate_expression_cost(expression) -> float:
+    if not isinstance(expression, SimpleCheckExpression):
+        return sum(
+            estimate_expression_cost(exp) for exp in expression.expressions
+        )
+    cost = COMMAND_COSTS.get(expression.command, DEFAULT_COST)
+    extra_columns = len(expression.arg_columns or []) + max(
+        len(expression.subject or []) - 1, 0
+    )
+    return cost + COLUMN_COST * extra_columns
+
+
+def estimate_check_cost(check: CheckSchema) -> float:
+    if check.check_command is None:
+        return DEFAULT_COST
+    return estimate_expression_cost(check.check_command)
+
+
+def get_static_costs(config: DFSchema) -> dict[tuple, float]:
+    # Static cost of every mask plan of the config, by plan label.
+    costs = {}
+    for col in config.columns:
+        context = ('Column', col.id)
+        costs[(*context, 'not_nullable', None)] = COMMAND_COSTS['is_null']
+        costs[(*context, 'field_uniqueness', None)] = COMMAND_COSTS[
+            'is_unique'
+        ]
+        for number, check in enumerate(col.checks or []):
+            costs[(*context, check.error_msg, number)] = estimate_check_cost(
+                check
+            )
+
+    context = ('DataFrameSchema', config.name)
+    costs[(*context, 'multiple_fields_uniqueness', None)] = COMMAND_COSTS[
+        'is_unique'
+    ] * len(config.ids or [])
+    for number, check in enumerate(config.checks or []):
+        costs[(*context, check.error_msg, number)] = estimate_check_cost(check)
+    return costs
+
+
+def get_plan_priority(metadata: dict) -> int:
+    return ERROR_LEVEL_PRIORITY[metadata.get('error_level', ErrorLevel.ERROR)]
+
+
+def get_history_key(label: tuple) -> str:
+    return json.dumps(label)
+
+
+class CostModel:
+    # Profiled durations of checks, in seconds, by plan label. Checks never
+    # profiled are estimated from their static cost, scaled by the average
+    # duration of one cost unit among the profiled checks.
+    def __init__(self, history: dict[str, float] | None = None) -> None:
+        self.history = dict(history or {})
+        self._static_total = 0.0
+        self._seconds_total = 0.0
+        self._lock = threading.Lock()
+
+    def record(self, label: tuple, static_cost: float, seconds: float) -> None:
+        key = get_history_key(label)
+        with self._lock:
+            previous = self.history.get(key)
+            self.history[key] = (
+                seconds
+                if previous is None
+                else SMOOTHING * seconds + (1 - SMOOTHING) * previous
+            )
+            self._static_total += static_cost
+            self._seconds_total += seconds
+
+    def estimate(self, label: tuple, static_cost: float) -> float:
+        key = get_history_key(label)
+        if key in self.history:
+            return self.history[key]
+        if self._static_total:
+            return static_cost * self._seconds_total / self._static_total
+        return static_cost
+
+    def save(self, path: str | Path) -> None:
+        Path(path).write_text(json.dumps(self.history), encoding='utf-8')
+
+    @classmethod
+    def load(cls, path: str | Path) -> CostModel:
+        return cls(json.loads(Path(path).read_text(encoding='utf-8')))
+
+
+def get_plan_costs(
+    plans: list[tuple[dict, pl.LazyFrame]],
+    static_costs: dict[tuple, float],
+    cost_model: CostModel | None = None,
+) -> list[tuple[tuple, float, float]]:
+    # Label, static cost and estimated cost of every plan.
+    costs = []
+    for metadata, _ in plans:
+        label = get_plan_label(metadata)
+        static_cost = static_costs.get(label, DEFAULT_COST)
+        costs.append((
+            label,
+            static_cost,
+            cost_model.estimate(label, static_cost)
+            if cost_model is not None
+            else static_cost,
+        ))
+    return costs
+
+
+def schedule_plans(
+    plans: list[tuple[dict, pl.LazyFrame]],
+    static_costs: dict[tuple, float],
+    cost_model: CostModel | None = None,
+) -> list[tuple[dict, pl.LazyFrame]]:
+    # By error level and cheapest first, which minimizes the time to the
+    # first failure of the highest level.
+    costs = get_plan_costs(plans, static_costs, cost_model)
+    order = sorted(
+        range(len(plans)),
+        key=lambda i: (get_plan_priority(plans[i][0]), costs[i][2]),
+    )
+    return [plans[i] for i in order]
+
+
+def get_balanced_batches(
+    costs: Sequence[float], batch_count: int
+) -> list[list[int]]:
+    # Longest processing time first: every item, most expensive first, goes
+    # to the batch with the lowest total cost so far.
+    batches = [[] for _ in range(max(min(batch_count, len(costs)), 1))]
+    heap = [(0.0, number) for number in range(len(batches))]
+    for index in sorted(range(len(costs)), key=lambda i: -costs[i]):
+        total, number = heapq.heappop(heap)
+        batches[number].append(index)
+        heapq.heappush(heap, (total + costs[index], number))
+    return [sorted(batch) for batch in batches if batch]
+
+
+def collect_timed(
+    lazyframes: list[pl.LazyFrame],
+) -> tuple[list[pl.DataFrame], float]:
+    started = time.perf_counter()
+    results = pl.collect_all(lazyframes)
+    return results, time.perf_counter() - started
+
+
+def collect_balanced(
+    plans: list[tuple[dict, pl.LazyFrame]],
+    config: DFSchema,
+    max_workers: int,
+    cost_model: CostModel | None = None,
+) -> list[pl.DataFrame]:
+    # Results of the plans, in order, computed as `max_workers` batches of
+    # about equal estimated cost running in parallel.
+    costs = get_plan_costs(plans, get_static_costs(config), cost_model)
+    batches = get_balanced_batches([cost for *_, cost in costs], max_workers)
+    results = [None] * len(plans)
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [
+            executor.submit(collect_timed, [plans[i][1] for i in batch])
+            for batch in batches
+        ]
+        for batch, future in zip(batches, futures):
+            frames, seconds = future.result()
+            static_total = sum(costs[i][1] for i in batch)
+            for index, frame in zip(batch, frames):
+                results[index] = frame
+                if cost_model is not None:
+                    # A batch duration is shared by static cost.
+                    label, static_cost, _ = costs[index]
+                    cost_model.record(
+                        label,
+                        static_cost,
+                        seconds * static_cost / static_total,
+                    )
+    return results
@@ -1,23 +1,90 @@
 from __future__ import annotations
 
-from collections.abc import Mapping, Sequence
+import asyncio
+from collections.abc import AsyncIterator, Iterator, Mapping, Sequence
+from concurrent.futures import Executor
+from functools import partial
 import logging
+from pathlib import Path
 import traceback
 
 import pandera.polars as pa
 import polars as pl
 
+from peh_validation_library.config.config_analysis import analyze_config
 from peh_validation_library.config.config_reader import ConfigReader
+from peh_validation_library.core.check.check_aggregates import (
+    settle_aggregate_checks,
+)
+from peh_validation_library.core.check.check_stats import (
+    ColumnStatistics,
+    get_constraint_statistics,
+    get_parquet_statistics,
+    get_pruned_config,
+    get_verified_dtypes,
+    prune_config,
+)
 from peh_validation_library.core.models.schemas import (
     DFSchema,
 )
 from peh_validation_library.core.utils.mappers import validation_type_mapper
-from peh_validation_library.dataframe.df_reader import read_dataframe
+from peh_validation_library.dataframe.df_reader import (
+    read_dataframe,
+    read_dataframe_file,
+)
+from peh_validation_library.error_report.condition_report import (
+    get_condition_report,
+)
 from peh_validation_library.error_report.error_collector import (
     ErrorCollector,
+    ScopedErrorCollector,
 )
 from peh_validation_library.error_report.error_schemas import (
     ExceptionSchema,
+    get_critical_error,
+)
+from peh_validation_library.error_report.failure_cases import (
+    get_failure_cases,
+)
+from peh_validation_library.error_report.failure_masks import (
+    FailureMasks,
+    get_exception_mask,
+    get_failure_masks,
+    get_mask_plans,
+    get_masks_from_results,
+)
+from peh_validation_library.error_report.failure_summary import (
+    get_failure_summary,
+)
+from peh_validation_library.validator.check_results import (
+    CheckResult,
+    get_check_result,
+    iter_check_results,
+)
+from peh_validation_library.validator.incremental import (
+    ValidationState,
+    get_failed_state,
+    validate_incremental,
+)
+from peh_validation_library.validator.multi_schema import (
+    MultiSchemaResult,
+    validate_schemas,
+)
+from peh_validation_library.validator.result_cache import (
+    ResultCache,
+    get_cache_key,
+)
+from peh_validation_library.validator.sampling import (
+    FAILED,
+    SamplingResult,
+    estimate_failures,
+    get_estimate_row,
+    get_estimates,
+    sample_dataframe,
+)
+from peh_validation_library.validator.scheduler import (
+    CostModel,
+    collect_balanced,
 )
 
 logger = logging.getLogger(__name__)
@@ -29,29 +96,109 @@ class Validator:
         dataframe: pl.DataFrame,
         config: DFSchema,
         logger: logging.Logger = logger,
+        error_collector: ScopedErrorCollector | None = None,
     ) -> None:
         self.dataframe = dataframe
         self.config = config
         self.__logger = logger
-        self.__error_collector = ErrorCollector()
+        self.__error_collector = error_collector or ErrorCollector()
+        # Column statistics known before the data is scanned, such as the
+        # row group statistics of a parquet footer.
+        self.statistics: dict[str, ColumnStatistics] = {}
+
+    def cast_dataframe(self) -> pl.DataFrame:
+        return self.dataframe.cast({
+            col.id: validation_type_mapper[col.data_type]
+            for col in self.config.columns
+            if col.id in self.dataframe.columns
+        })
+
+    def _cast_or_report(self, context: str) -> ExceptionSchema | None:
+        # Casts the frame for the mask based validations; a frame that
+        # cannot be cast is a critical error, as in validate.
+        self.__logger.info('Casting DataFrame Types')
+        try:
+            self.dataframe = self.cast_dataframe()
+        except Exception as err:
+            self.__logger.error(f'Error validating dataframe: {err}')
+            error = get_critical_error(err, context, __name__)
+            self.__error_collector.add_error(error)
+            return error
+        return None
+
+    def validate(self, use_statistics: bool = False) -> list:
+        return self._validate(self.__error_collector, use_statistics)
 
-    def validate(self) -> None:
+    def get_pruned_config(self) -> DFSchema:
+        # Checks the column statistics prove for every row pass without a
+        # row level evaluation.
+        config, skipped = get_pruned_config(
+            self.dataframe.lazy(), self.config, self.statistics
+        )
+        self.__logger.info(f'Column statistics settled {skipped} check(s)')
+        return config
+
+    def get_constrained_config(self) -> DFSchema:
+        # Nullable and unique constraints of all columns settled by one
+        # aggregation; only violating columns keep their pandera check.
+        config, skipped = prune_config(
+            self.config,
+            get_constraint_statistics(self.dataframe.lazy(), self.config),
+        )
+        self.__logger.info(f'Column constraints settled {skipped} check(s)')
+        return config
+
+    def build_schema(self, use_statistics: bool = False) -> pa.DataFrameSchema:
+        # Schema of the cast frame, with the structural constraints and
+        # dtypes already known to hold left out of the pandera validation.
         self.__logger.info(f'Building DataFrame schema {self.config.name =}')
-        df_schema = self.config.build()
+        config = (
+            self.get_pruned_config()
+            if use_statistics
+            else self.get_constrained_config()
+        )
+        # Aggregate checks are answered together by one aggregation.
+        config = settle_aggregate_checks(self.dataframe.lazy(), config)
+        return config.build(
+            verified_dtypes=get_verified_dtypes(self.dataframe.schema, config)
+        )
+
+    def check_config(self, error_collector: ScopedErrorCollector) -> bool:
+        # Config problems found from the frame columns alone, all reported
+        # at once before anything is cast.
+        problems = analyze_config(self.config, self.dataframe.columns)
+        for problem in problems:
+            self.__logger.error(f'Invalid configuration: {problem}')
+            error_collector.add_error(
+                ExceptionSchema(
+                    error_type='ConfigError',
+                    error_message=problem,
+                    error_level='critical',
+                    error_traceback='',
+                    error_context='Validator.check_config',
+                    error_source=__name__,
+                )
+            )
+        return not problems
 
+    def _validate(
+        self,
+        error_collector: ScopedErrorCollector,
+        use_statistics: bool = False,
+    ) -> list:
+        if not self.check_config(error_collector):
+            return error_collector.get_errors()
         try:
             self.__logger.info('Casting DataFrame Types')
-            self.dataframe = self.dataframe.cast({
-                col.id: validation_type_mapper[col.data_type]
-                for col in self.config.columns
-                if col.id in self.dataframe.columns
-            })
+            self.dataframe = self.cast_dataframe()
+            # The constraints are settled on the cast columns.
+            df_schema = self.build_schema(use_statistics)
             self.__logger.info('Starting DataFrame validation')
             self.dataframe.pipe(df_schema.validate, lazy=True)
 
         except pa.errors.SchemaErrors as err:
             self.__logger.info('Collecting validation errors')
-            self.__error_collector.add_error(err)
+            error_collector.add_error(err)
         # Pandera not implemented for polars some lazy validation.
         # Run in again in eager mode to catch the error.
         # This is a workaround for the issue.
@@ -62,12 +209,12 @@ class Validator:
 
             except pa.errors.SchemaError as err:
                 self.__logger.warning('Collecting eager validation error')
-                self.__error_collector.add_error(err)
+                error_collector.add_error(err)
         except Exception as err:
             msg = f'Error validating dataframe: {err}'
             self.__logger.error(msg)
             error_traceback = traceback.format_exc()
-            self.__error_collector.add_error(
+            error_collector.add_error(
                 ExceptionSchema(
                     error_type=type(err).__name__,
                     error_message=str(err),
@@ -78,7 +225,169 @@ class Validator:
                 )
             )
         finally:
-            return self.__error_collector.get_errors()
+            return error_collector.get_errors()
+
+    def get_report(self, cache: ResultCache | None = None) -> pl.DataFrame:
+        # Failure cases of a validation, served from the cache when the same
+        # compiled config already validated identical data.
+        key = None
+        if cache is not None:
+            key = get_cache_key(self.config, self.dataframe)
+            if (report := cache.get(key)) is not None:
+                self.__logger.info('Returning cached validation report')
+                return report
+
+        report = get_failure_cases(self._validate_isolated())
+        if cache is not None:
+            cache.put(key, report)
+        return report
+
+    def get_failure_masks(
+        self,
+        max_workers: int | None = None,
+        cost_model: CostModel | None = None,
+    ) -> FailureMasks:
+        # Row level failures as one bit per row and check instead of
+        # pandera failure case lists; render them only when needed. With
+        # `max_workers` the checks run as batches of balanced estimated cost.
+        if error := self._cast_or_report('Validator.get_failure_masks'):
+            return FailureMasks(
+                [get_exception_mask(error, self.dataframe.height)],
+                self.dataframe.height,
+            )
+        self.__logger.info('Computing failure masks')
+        if max_workers is None:
+            return get_failure_masks(self.dataframe, self.config)
+        plans = get_mask_plans(self.dataframe.lazy(), self.config)
+        results = collect_balanced(plans, self.config, max_workers, cost_model)
+        return get_masks_from_results(plans, results, self.dataframe.height)
+
+    def iter_validate(
+        self,
+        sample_size: int = 5,
+        batch_size: int = 1,
+        *,
+        cost_model: CostModel | None = None,
+        fail_fast: bool = False,
+    ) -> Iterator[CheckResult]:
+        # Yields each check result as soon as it is known, critical and
+        # cheap checks first, instead of waiting for the whole validation.
+        if error := self._cast_or_report('Validator.iter_validate'):
+            yield get_check_result(
+                get_exception_mask(error, self.dataframe.height),
+                self.dataframe,
+                sample_size,
+                0.0,
+            )
+            return
+        self.__logger.info('Starting iterative validation')
+        yield from iter_check_results(
+            self.dataframe,
+            self.config,
+            sample_size,
+            batch_size,
+            cost_model=cost_model,
+            fail_fast=fail_fast,
+        )
+
+    async def iter_validate_async(
+        self, executor: Executor | None = None, **kwargs
+    ) -> AsyncIterator[CheckResult]:
+        # Each batch runs in the executor so the event loop stays free
+        # between results. Keyword arguments go to iter_validate.
+        loop = asyncio.get_running_loop()
+        results = self.iter_validate(**kwargs)
+        done = object()
+        while (
+            result := await loop.run_in_executor(executor, next, results, done)
+        ) is not done:
+            yield result
+
+    def validate_sample(  # noqa: PLR0913
+        self,
+        size: int = 10_000,
+        stratify_by: Sequence[str] | None = None,
+        seed: int = 0,
+        confidence: float = 0.95,
+        escalate: bool = False,
+    ) -> SamplingResult:
+        # Estimated failure rates from a sample of the rows. With `escalate`
+        # a sample with failures triggers a full validation. Only the sample
+        # is cast; the full validation casts the whole frame itself.
+        population_size = self.dataframe.height
+        sampled = Validator(
+            sample_dataframe(self.dataframe, size, stratify_by, seed),
+            self.config,
+            self.__logger,
+            self.__error_collector,
+        )
+        sample = sampled.dataframe
+        if error := sampled._cast_or_report('Validator.validate_sample'):
+            return SamplingResult(
+                estimates=get_estimates(
+                    [
+                        get_estimate_row(
+                            get_exception_mask(error, sample.height),
+                            FAILED,
+                            sample.height,
+                        )
+                    ],
+                    population_size,
+                ),
+                population_size=population_size,
+                failure_cases=get_failure_cases([error]),
+            )
+        self.__logger.info(f'Validating a sample of {sample.height} rows')
+        result = SamplingResult(
+            estimates=estimate_failures(
+                sampled.dataframe, self.config, population_size, confidence
+            ),
+            population_size=population_size,
+        )
+        if escalate and result.has_failures():
+            self.__logger.info('Sample has failures, running full validation')
+            result.failure_cases = get_failure_cases(self._validate_isolated())
+        return result
+
+    def compare_schemas(
+        self, configs: Sequence[DFSchema]
+    ) -> MultiSchemaResult:
+        # Validates the frame against its config and the other candidate
+        # configs at once, sharing casts and identical checks.
+        self.__logger.info(f'Validating against {len(configs) + 1} schemas')
+        return validate_schemas(self.dataframe, [self.config, *configs])
+
+    def get_failure_summary(self, sample_size: int = 5) -> pl.DataFrame:
+        # Failures grouped by check, column and failing value, so the report
+        # grows with the number of distinct problems instead of rows.
+        masks = self.get_failure_masks()
+        return get_failure_summary(
+            self.dataframe, masks, self.config.ids, sample_size
+        )
+
+    def validate_incremental(
+        self, state: ValidationState | None = None
+    ) -> ValidationState:
+        # Row level checks only run on rows added or changed since `state`;
+        # the returned state holds the merged failure masks.
+        if error := self._cast_or_report('Validator.validate_incremental'):
+            return get_failed_state(
+                self.dataframe,
+                self.config,
+                get_exception_mask(error, self.dataframe.height),
+            )
+        self.__logger.info('Starting incremental validation')
+        new_state = validate_incremental(self.dataframe, self.config, state)
+        self.__logger.info(f'Validated {new_state.delta_size} changed rows')
+        return new_state
+
+    def get_condition_report(self) -> pl.DataFrame:
+        # Separates rows where a condition check did not apply from rows
+        # that passed or failed it.
+        return get_condition_report(self.dataframe, self.config)
+
+    def _validate_isolated(self) -> list:
+        return list(self._validate(ScopedErrorCollector()))
 
     @classmethod
     def build_validator(
@@ -86,7 +395,9 @@ class Validator:
         config: Mapping[str, str | Sequence | Mapping],
         dataframe: dict[str, Sequence],
         logger: logging.Logger = logger,
+        error_collector: ScopedErrorCollector | None = None,
     ) -> Validator:
+        error_collector = error_collector or ErrorCollector()
         try:
             df = read_dataframe(dataframe)
             config_reader = ConfigReader(config)
@@ -95,7 +406,7 @@ class Validator:
             msg = f'Error reading inputs: {err}'
             logger.error(msg)
             error_traceback = traceback.format_exc()
-            ErrorCollector().add_error(
+            error_collector.add_error(
                 ExceptionSchema(
                     error_type=type(err).__name__,
                     error_message=str(err),
@@ -105,8 +416,123 @@ class Validator:
                     error_source=__name__,
                 )
             )
-            return ErrorCollector().get_errors()
+            return error_collector.get_errors()
+
+        logger.info('Validator build complete')
+
+        return cls(
+            dataframe=df,
+            config=df_schema,
+            logger=logger,
+            error_collector=error_collector,
+        )
+
+    @classmethod
+    def build_validator_from_file(
+        cls,
+        config: Mapping[str, str | Sequence | Mapping],
+        path: str | Path,
+        logger: logging.Logger = logger,
+        error_collector: ScopedErrorCollector | None = None,
+    ) -> Validator:
+        error_collector = error_collector or ErrorCollector()
+        try:
+            df_schema = ConfigReader(config).get_df_schema()
+            # Columns no check references are never loaded from the file.
+            columns = df_schema.get_columns()
+            df = read_dataframe_file(path, columns=columns)
+            statistics = (
+                get_parquet_statistics(path, columns, df_schema)
+                if Path(path).suffix.lower() == '.parquet'
+                else {}
+            )
+        except Exception as err:
+            msg = f'Error reading inputs: {err}'
+            logger.error(msg)
+            error_traceback = traceback.format_exc()
+            error_collector.add_error(
+                ExceptionSchema(
+                    error_type=type(err).__name__,
+                    error_message=str(err),
+                    error_level='critical',
+                    error_traceback=error_traceback,
+                    error_context='Validator.build_validator_from_file',
+                    error_source=__name__,
+                )
+            )
+            return error_collector.get_errors()
 
         logger.info('Validator build complete')
 
-        return cls(dataframe=df, config=df_schema, logger=logger)
+        validator = cls(
+            dataframe=df,
+            config=df_schema,
+            logger=logger,
+            error_collector=error_collector,
+        )
+        validator.statistics = statistics
+        return validator
+
+    async def validate_async(
+        self,
+        executor: Executor | None = None,
+        timeout: float | None = None,
+    ) -> list:
+        # Each call collects into its own collector and returns a copy, so
+        # concurrent validations never share results. Cancelling or timing
+        # out stops waiting for the worker; a late finish only writes into
+        # its discarded collector.
+        loop = asyncio.get_running_loop()
+        try:
+            return await asyncio.wait_for(
+                loop.run_in_executor(executor, self._validate_isolated),
+                timeout,
+            )
+        except asyncio.TimeoutError as err:
+            msg = f'Validation timed out after {timeout} seconds'
+            self.__logger.error(msg)
+            return [
+                ExceptionSchema(
+                    error_type=type(err).__name__,
+                    error_message=msg,
+                    error_level='critical',
+                    error_traceback=traceback.format_exc(),
+                    error_context='Validator.validate_async',
+                    error_source=__name__,
+                )
+            ]
+
+    @classmethod
+    async def build_validator_async(
+        cls,
+        config: Mapping[str, str | Sequence | Mapping],
+        dataframe: dict[str, Sequence],
+        logger: logging.Logger = logger,
+        executor: Executor | None = None,
+        timeout: float | None = None,
+    ) -> Validator | list:
+        loop = asyncio.get_running_loop()
+        build_fn = partial(
+            cls.build_validator,
+            config=config,
+            dataframe=dataframe,
+            logger=logger,
+            error_collector=ScopedErrorCollector(),
+        )
+        try:
+            return await asyncio.wait_for(
+                loop.run_in_executor(executor, build_fn), timeout
+            )
+        except asyncio.TimeoutError as err:
+            msg = f'Validator build timed out after {timeout} seconds'
+            logger.error(msg)
+            return [
+                ExceptionSchema(
+                    error_type=type(err).__name__,
+                    error_message=msg,
+                    error_level='critical',
+                    error_traceback=traceback.format_exc(),
+                    error_context='Validator.build_validator_async',
+                    error_source=__name__,
+                )
+            ]
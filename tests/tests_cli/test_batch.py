@@ -0,0 +1,166 @@
+import json
+
+import polars as pl
+import pytest
+
+from peh_validation_library.cli.batch import (
+    EXIT_CRITICAL,
+    EXIT_OK,
+    expand_inputs,
+    main,
+    run_batch,
+)
+
+
+@pytest.fixture
+def config_file(tmp_path):
+    config = {
+        'name': 'test_config',
+        'columns': [
+            {
+                'id': 'test_column',
+                'data_type': 'integer',
+                'nullable': False,
+                'unique': True,
+                'required': True,
+                'checks': [
+                    {
+                        'command': 'is_in',
+                        'arg_values': [1, 2, 3],
+                        'error_level': 'critical',
+                    }
+                ]
+            },
+            {
+                'id': 'second_column',
+                'data_type': 'varchar',
+                'nullable': True,
+                'unique': False,
+                'required': True,
+            },
+        ],
+    }
+    path = tmp_path / 'config.json'
+    path.write_text(json.dumps(config))
+    return path
+
+
+@pytest.fixture
+def data_dir(tmp_path):
+    data_dir = tmp_path / 'data'
+    data_dir.mkdir()
+    pl.DataFrame({
+        'test_column': [1, 2, 3],
+        'second_column': ['a', 'b', None],
+    }).write_csv(data_dir / 'valid.csv')
+    pl.DataFrame({
+        'test_column': [1, 2, 5],
+        'second_column': ['a', 'b', 'c'],
+    }).write_parquet(data_dir / 'invalid.parquet')
+    (data_dir / 'notes.txt').write_text('not a data file')
+    return data_dir
+
+
+def test_expand_inputs(data_dir):
+    from_dir = expand_inputs([str(data_dir)])
+    from_glob = expand_inputs([str(data_dir / '*.csv')])
+    from_files = expand_inputs([
+        str(data_dir / 'valid.csv'), str(data_dir / 'valid.csv')
+    ])
+
+    assert [p.name for p in from_dir] == ['invalid.parquet', 'valid.csv']
+    assert [p.name for p in from_glob] == ['valid.csv']
+    assert [p.name for p in from_files] == ['valid.csv']
+
+
+def test_main_valid_files(config_file, data_dir, tmp_path):
+    output = tmp_path / 'report.jsonl'
+
+    exit_code = main([
+        str(config_file), str(data_dir / 'valid.csv'), '-o', str(output)
+    ])
+
+    assert exit_code == EXIT_OK
+    assert output.read_text() == ''
+
+
+def test_main_critical_errors_jsonl(config_file, data_dir, tmp_path):
+    output = tmp_path / 'report.jsonl'
+
+    exit_code = main([
+        str(config_file), str(data_dir), '-o', str(output), '-w', '2'
+    ])
+
+    report = pl.read_ndjson(output)
+    assert exit_code == EXIT_CRITICAL
+    assert report.height == 1
+    assert report['source'][0].endswith('invalid.parquet')
+    assert report['failure_case'][0] == '5'
+    assert report['error_level'][0] == 'critical'
+    assert report['index'][0] == 2
+
+
+def test_main_parquet_report(config_file, data_dir, tmp_path):
+    output = tmp_path / 'report.parquet'
+
+    exit_code = main([
+        str(config_file), str(data_dir / '*'), '-o', str(output)
+    ])
+
+    report = pl.read_parquet(output)
+    assert exit_code == EXIT_CRITICAL
+    assert set(report['source'].str.split('/').list.last()) == {
+        'invalid.parquet', 'notes.txt'
+    }
+    assert report.filter(
+        pl.col('source').str.ends_with('notes.txt')
+    )['check'][0] == 'RuntimeError'
+
+
+def test_main_ipc_report(config_file, data_dir, tmp_path):
+    output = tmp_path / 'report.arrow'
+
+    exit_code = main([
+        str(config_file), str(data_dir), '-o', str(output),
+        '--flush-size', '1',
+    ])
+
+    report = pl.read_ipc(output)
+    assert exit_code == EXIT_CRITICAL
+    assert report['failure_case'].to_list() == ['5']
+
+
+def test_main_invalid_config(data_dir, tmp_path):
+    config_file = tmp_path / 'config.json'
+    config_file.write_text(json.dumps({'invalid_key': 'invalid_value'}))
+
+    exit_code = main([str(config_file), str(data_dir)])
+
+    assert exit_code == EXIT_CRITICAL
+
+
+def test_main_jsonl_stdout(config_file, data_dir, capsys):
+    exit_code = main([str(config_file), str(data_dir / 'invalid.parquet')])
+
+    lines = capsys.readouterr().out.splitlines()
+    assert exit_code == EXIT_CRITICAL
+    assert len(lines) == 1
+    assert json.loads(lines[0])['failure_case'] == '5'
+
+
+def test_run_batch_worker_failure(data_dir, tmp_path):
+    output = tmp_path / 'report.jsonl'
+
+    # The worker initializer fails on this config and breaks the pool.
+    exit_code = run_batch(
+        {'invalid_key': 'invalid_value'},
+        [data_dir / 'valid.csv', data_dir / 'invalid.parquet'],
+        output=output,
+        max_workers=1,
+    )
+
+    report = pl.read_ndjson(output)
+    assert exit_code == EXIT_CRITICAL
+    assert report.height == 2
+    assert set(report['check']) == {'BrokenProcessPool'}
+    assert set(report['error_level']) == {'critical'}
@@ -231,3 +231,84 @@ def test_get_config_validation_error():
 
     assert "Error reading configuration:" in str(err.value)
 
+
+
+def get_selector_config(selectors):
+    return {
+        'name': 'test_config',
+        'columns': [
+            {
+                'id': col_id,
+                'data_type': data_type,
+                'nullable': True,
+                'unique': False,
+                'required': True,
+            }
+            for col_id, data_type in [
+                ('m_lead', 'decimal'),
+                ('m_zinc', 'decimal'),
+                ('m_count', 'integer'),
+                ('label', 'varchar'),
+            ]
+        ],
+        'selectors': selectors,
+    }
+
+
+@pytest.mark.parametrize(
+    'selector, expected',
+    [
+        ({'regex': '^m_'}, ['m_lead', 'm_zinc', 'm_count']),
+        ({'data_type': 'decimal'}, ['m_lead', 'm_zinc']),
+        ({'regex': '^m_', 'data_type': 'integer'}, ['m_count']),
+        ({'columns': ['label', 'm_zinc']}, ['m_zinc', 'label']),
+    ],
+)
+def test_get_config_selectors(selector, expected):
+    selector['checks'] = [{'command': 'is_not_null'}]
+
+    conf = ConfigReader(get_selector_config([selector])).get_df_schema()
+
+    selected = [col for col in conf.columns if col.checks]
+    assert [col.id for col in selected] == expected
+    # One shared check object, not one copy per column.
+    assert len({id(col.checks[0]) for col in selected}) == 1
+
+
+@pytest.mark.parametrize(
+    'selector',
+    [
+        {'checks': []},
+        {'columns': ['missing'], 'checks': []},
+        {'regex': '^m_'},
+    ],
+)
+def test_get_config_invalid_selectors(selector):
+    conf = ConfigReader(get_selector_config([selector]))
+
+    with pytest.raises(RuntimeError, match='Error reading configuration'):
+        conf.get_df_schema()
+
+
+def test_get_config_group_by_defaults_to_ids():
+    conf_input = get_selector_config([])
+    conf_input['ids'] = ['label']
+    conf_input['columns'][0]['checks'] = [
+        {'command': 'is_increasing_in_group', 'order_by': ['m_count']},
+        {'command': 'is_in', 'arg_values': [1]},
+    ]
+
+    conf = ConfigReader(conf_input).get_df_schema()
+
+    group_check, other_check = conf.columns[0].checks
+    assert group_check.check_command.group_by == ['label']
+    assert other_check.check_command.group_by is None
+    assert conf.get_columns() == {'label', 'm_lead', 'm_zinc', 'm_count'}
+
+
+def test_get_config_group_check_without_group_by():
+    conf_input = get_selector_config([])
+    conf_input['columns'][0]['checks'] = [{'command': 'is_unique_in_group'}]
+
+    with pytest.raises(RuntimeError, match='needs group_by'):
+        ConfigReader(conf_input).get_df_schema()
@@ -0,0 +1,135 @@
+import polars as pl
+import pytest
+
+from peh_validation_library.config.config_analysis import analyze_config
+from peh_validation_library.config.config_reader import ConfigReader
+from peh_validation_library.error_report.error_collector import (
+    ScopedErrorCollector,
+)
+from peh_validation_library.validator.validator import Validator
+
+
+def get_config_input(checks, column_checks=None, ids=None):
+    config_input = {
+        'name': 'test_config',
+        'columns': [
+            {
+                'id': col_id,
+                'data_type': data_type,
+                'nullable': True,
+                'unique': False,
+                'required': True,
+                'checks': (column_checks or []) if col_id == 'label' else [],
+            }
+            for col_id, data_type in [
+                ('count', 'integer'),
+                ('label', 'varchar'),
+                ('visit', 'date'),
+            ]
+        ],
+        'checks': checks,
+    }
+    if ids:
+        config_input['ids'] = ids
+    return config_input
+
+
+def test_analysis_reports_every_problem():
+    config_input = get_config_input(
+        checks=[
+            {'command': 'is_not_null'},
+            {
+                'command': 'has_mean_between',
+                'subject': ['label'],
+                'arg_values': [0, 1],
+            },
+            {
+                'check_case': 'condition',
+                'expressions': [
+                    {
+                        'command': 'is_greater_than',
+                        'subject': ['count'],
+                        'arg_values': ['5'],
+                    },
+                    {
+                        'command': 'is_less_than',
+                        'subject': ['visit'],
+                        'arg_columns': ['count'],
+                    },
+                ],
+            },
+        ],
+        column_checks=[
+            {'command': 'is_greater_than', 'arg_values': ['a']},
+            {'command': 'is_in', 'arg_reference': 'missing'},
+        ],
+    )
+
+    with pytest.raises(RuntimeError) as err:
+        ConfigReader(config_input).get_df_schema()
+
+    message = str(err.value)
+    for problem in [
+        "Column 'label' check 0 (Is Greater Than): gt cannot order text",
+        "Column 'label' check 1 (Is In): Unknown reference set 'missing'",
+        'Dataframe check 0 (Is Not Null): is_not_null on a dataframe needs',
+        'has_mean_between needs numeric columns, not text',
+        "argument '5' does not compare with numeric values",
+        "cannot compare temporal column with 'count'",
+    ]:
+        assert problem in message
+
+
+def test_analysis_accepts_valid_config():
+    config = ConfigReader(
+        get_config_input(
+            checks=[
+                {
+                    'command': 'is_greater_than',
+                    'subject': ['visit'],
+                    'arg_values': ['2020-01-01'],
+                },
+                {'command': 'has_min_rows', 'arg_values': [1]},
+            ],
+            column_checks=[{'command': 'is_in', 'arg_values': ['a']}],
+        )
+    ).get_df_schema()
+
+    assert analyze_config(config, ['count', 'label', 'visit']) == []
+
+
+def test_analysis_with_frame_columns():
+    config = ConfigReader(
+        get_config_input(
+            checks=[{'command': 'is_not_null', 'subject': ['extra']}],
+            ids=['extra', 'other'],
+        )
+    ).get_df_schema()
+
+    assert analyze_config(config, ['count', 'extra']) == [
+        "Unknown id column 'other'"
+    ]
+    assert analyze_config(config, ['count']) == [
+        "Unknown id column 'extra'",
+        "Unknown id column 'other'",
+        "Dataframe check 0 (Is Not Null): unknown column 'extra'",
+    ]
+
+
+def test_validator_reports_config_errors_before_casting():
+    config = ConfigReader(
+        get_config_input(checks=[{'command': 'is_null', 'subject': ['x']}])
+    ).get_df_schema()
+    # The count column cannot be cast, but the config error comes first.
+    dataframe = pl.DataFrame({'count': ['a'], 'label': ['b']})
+
+    errors = Validator(
+        dataframe, config, error_collector=ScopedErrorCollector()
+    ).validate()
+
+    assert [(error.error_type, error.error_message) for error in errors] == [
+        (
+            'ConfigError',
+            "Dataframe check 0 (Is Null): unknown column 'x'",
+        )
+    ]
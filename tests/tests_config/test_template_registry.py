@@ -0,0 +1,151 @@
+import json
+import os
+
+import polars as pl
+import pytest
+
+from peh_validation_library.config.template_registry import TemplateRegistry
+from peh_validation_library.error_report.error_collector import (
+    ScopedErrorCollector,
+)
+from peh_validation_library.validator.validator import Validator
+
+
+def get_template(max_value=10, label_values=('a', 'b')):
+    return {
+        'name': 'test_config',
+        'columns': [
+            {
+                'id': 'count',
+                'data_type': 'integer',
+                'nullable': False,
+                'unique': False,
+                'required': True,
+                'checks': [
+                    {'command': 'is_less_than', 'arg_values': [max_value]}
+                ],
+            },
+            {
+                'id': 'label',
+                'data_type': 'varchar',
+                'nullable': False,
+                'unique': False,
+                'required': True,
+                'checks': [
+                    {'command': 'is_in', 'arg_values': list(label_values)}
+                ],
+            },
+        ],
+        'checks': [{'command': 'has_min_rows', 'arg_values': [1]}],
+    }
+
+
+def write_template(path, template, modified):
+    path.write_text(json.dumps(template))
+    # File systems with coarse timestamps would miss quick edits.
+    os.utime(path, ns=(modified, modified))
+
+
+@pytest.fixture
+def path(tmp_path):
+    path = tmp_path / 'survey.json'
+    write_template(path, get_template(), 1_000_000_000)
+    return path
+
+
+def test_register_template(path):
+    registry = TemplateRegistry()
+
+    template = registry.register(path)
+
+    assert 'survey' in registry
+    assert template.version == 1
+    assert template.recompiled == 3
+    assert registry.get('survey') is template.config
+    with pytest.raises(KeyError, match='Unknown template'):
+        registry.get('other')
+
+
+def test_reload_recompiles_changed_parts(path):
+    registry = TemplateRegistry()
+    first = registry.register(path).config
+
+    write_template(path, get_template(max_value=5), 2_000_000_000)
+    assert registry.refresh() == ['survey']
+
+    template = registry.get_template('survey')
+    assert registry.get_versions() == {'survey': 2}
+    assert template.recompiled == 1
+    assert template.config.columns[0] is not first.columns[0]
+    assert template.config.columns[1] is first.columns[1]
+    assert template.config.checks[0] is first.checks[0]
+    # The validation started on the first version keeps it.
+    dataframe = pl.DataFrame({'count': [7], 'label': ['a']})
+    old_errors = Validator(
+        dataframe, first, error_collector=ScopedErrorCollector()
+    ).validate()
+    new_errors = Validator(
+        dataframe, template.config, error_collector=ScopedErrorCollector()
+    ).validate()
+    assert (len(old_errors), len(new_errors)) == (0, 1)
+
+
+def test_reload_unchanged_or_invalid(path):
+    registry = TemplateRegistry()
+    first = registry.register(path, name='custom')
+
+    assert registry.reload('custom') is False
+    # Touched but identical content is no new version.
+    write_template(path, get_template(), 2_000_000_000)
+    assert registry.reload('custom') is False
+    # A broken edit keeps the last good version.
+    path.write_text('{"name": ')
+    os.utime(path, ns=(3_000_000_000, 3_000_000_000))
+    assert registry.reload('custom') is False
+    write_template(path, get_template(max_value='x'), 4_000_000_000)
+    assert registry.reload('custom') is False
+
+    assert registry.get('custom') is first.config
+    assert registry.get_versions() == {'custom': 1}
+
+
+def test_watch_template(path):
+    registry = TemplateRegistry()
+    registry.register(path)
+    registry.watch(interval=0.01)
+
+    try:
+        write_template(path, get_template(label_values='c'), 2_000_000_000)
+        for _ in range(500):
+            if registry.get_versions()['survey'] == 2:
+                break
+            registry._stop.wait(0.01)
+    finally:
+        registry.stop()
+
+    assert registry.get_versions() == {'survey': 2}
+    assert registry.get_template('survey').recompiled == 1
+
+
+def test_watch_survives_refresh_errors(path, monkeypatch, caplog):
+    registry = TemplateRegistry()
+    registry.register(path)
+    calls = []
+
+    def refresh():
+        calls.append(None)
+        if len(calls) == 1:
+            raise KeyError('survey')
+
+    monkeypatch.setattr(registry, 'refresh', refresh)
+    registry.watch(interval=0.01)
+    try:
+        for _ in range(500):
+            if len(calls) > 1:
+                break
+            registry._stop.wait(0.01)
+    finally:
+        registry.stop()
+
+    assert len(calls) > 1
+    assert 'Could not refresh templates' in caplog.text
@@ -0,0 +1,155 @@
+from unittest.mock import patch
+
+import polars as pl
+import pytest
+
+from peh_validation_library.config.config_reader import ConfigReader
+from peh_validation_library.core.check.check_aggregates import (
+    get_aggregate_checks,
+    get_aggregate_frame,
+    settle_aggregate_checks,
+)
+from peh_validation_library.error_report.error_collector import (
+    ScopedErrorCollector,
+)
+from peh_validation_library.error_report.failure_masks import (
+    get_failure_masks,
+)
+from peh_validation_library.validator.validator import Validator
+
+
+@pytest.fixture
+def config():
+    return ConfigReader({
+        'name': 'test_config',
+        'columns': [
+            {
+                'id': 'col_a',
+                'data_type': 'integer',
+                'nullable': True,
+                'unique': False,
+                'required': True,
+                'checks': [
+                    {
+                        'command': 'has_null_fraction_at_most',
+                        'arg_values': [0.2],
+                    },
+                    {'command': 'has_mean_between', 'arg_values': [1, 3]},
+                    {'command': 'is_less_than', 'arg_values': [10]},
+                ],
+            },
+            {
+                'id': 'col_b',
+                'data_type': 'integer',
+                'nullable': True,
+                'unique': False,
+                'required': True,
+                'checks': [
+                    {
+                        'command': 'has_quantile_between',
+                        'arg_values': [0.5, 0, 2],
+                    },
+                    {
+                        'command': 'has_distinct_ratio_at_least',
+                        'arg_values': [0.6],
+                    },
+                ],
+            },
+        ],
+        'checks': [
+            {'command': 'has_min_rows', 'arg_values': [10]},
+        ],
+    }).get_df_schema()
+
+
+@pytest.fixture
+def dataframe():
+    return pl.DataFrame({
+        'col_a': [1, 2, None, 3],
+        'col_b': [1, 1, 1, 5],
+    })
+
+
+def test_get_aggregate_frame(config, dataframe):
+    checks = get_aggregate_checks(config, dataframe.columns)
+
+    row = get_aggregate_frame(dataframe.lazy(), checks).collect().row(0)
+
+    assert [key for key, _ in checks] == [
+        'col_a', 'col_a', 'col_b', 'col_b', None
+    ]
+    assert row == (False, True, True, False, False)
+
+
+def test_settle_aggregate_checks(config, dataframe):
+    with patch.object(
+        pl.LazyFrame, 'collect', autospec=True, side_effect=pl.LazyFrame.collect
+    ) as collect:
+        settled = settle_aggregate_checks(dataframe.lazy(), config)
+
+    # One aggregation answers all five checks.
+    assert collect.call_count == 1
+    assert settled.columns[0].checks[0].fn(None) is False
+    assert settled.columns[0].checks[2] is config.columns[0].checks[2]
+
+
+def test_validate_aggregate_checks(config, dataframe):
+    validator = Validator(
+        dataframe, config, error_collector=ScopedErrorCollector()
+    )
+
+    report = validator.get_report()
+
+    assert report.select('column', 'check_number', 'index').rows() == [
+        ('col_a', 0, None),
+        ('col_b', 1, None),
+        ('test_config', 0, None),
+    ]
+
+
+def test_aggregate_failure_masks(config, dataframe):
+    masks = get_failure_masks(dataframe, config)
+
+    # Aggregate failures belong to the frame, not to its rows.
+    assert masks.get_counts().select('failure_count', 'failed').rows() == [
+        (0, True),
+        (0, False),
+        (0, False),
+        (0, False),
+        (0, True),
+        (0, True),
+    ]
+    assert masks.render(dataframe).select(
+        'column', 'check_number', 'index'
+    ).rows() == [
+        ('col_a', 0, None),
+        ('col_b', 1, None),
+        ('test_config', 0, None),
+    ]
+
+
+def test_aggregate_failure_masks_empty_frame(config):
+    dataframe = pl.DataFrame(schema={'col_a': pl.Int64, 'col_b': pl.Int64})
+    validator = Validator(
+        dataframe, config, error_collector=ScopedErrorCollector()
+    )
+
+    masks = validator.get_failure_masks()
+
+    assert masks.render(dataframe).select(
+        'failure_case', 'column', 'check', 'index'
+    ).rows() == validator.get_report().select(
+        'failure_case', 'column', 'check', 'index'
+    ).rows()
+    assert ('test_config', 0) in masks.render(dataframe).select(
+        'column', 'check_number'
+    ).rows()
+
+
+def test_aggregate_check_needs_arg_values(config):
+    with pytest.raises(RuntimeError, match='needs arg_values'):
+        ConfigReader({
+            'name': 'test_config',
+            'columns': [],
+            'checks': [{'command': 'has_min_rows'}],
+        }).get_df_schema()
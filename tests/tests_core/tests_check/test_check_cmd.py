@@ -6,6 +6,10 @@ from polars.testing import assert_frame_equal
 from hypothesis import given, settings, strategies as st 
 
 from peh_validation_library.core.check.check_cmd import (
+    CONDITION_OUTPUT_KEY,
+    create_condition_output,
+    create_group_expression,
+    is_row_wise,
     create_single_expression,
     get_single_expression,
     get_expression,
@@ -849,3 +853,144 @@ class TestGetCheckFn:
             pl.when(pl.col("col_b").gt(5)).then(pl.col("col_a").lt(8))
         ).collect()
         assert_frame_equal(result, expected_result)
+
+
+class TestCreateConditionOutput:
+    @pytest.mark.parametrize(
+        'consequent', [
+            SimpleCheckExpression(command='lt', arg_values=[6]),
+            SimpleCheckExpression(command='is_in', arg_values=[2, 4, 6]),
+            SimpleCheckExpression(command='le', arg_columns=['col_b']),
+            SimpleCheckExpression(command='is_unique'),
+        ],
+    )
+    @given(df=dataframes(
+        [
+            column(
+                'col_a',
+                strategy=st.integers(min_value=1, max_value=10),
+                allow_null=True,
+            ),
+            column(
+                'col_b',
+                strategy=st.integers(min_value=1, max_value=10),
+                allow_null=True,
+            ),
+        ],
+        max_size=20,
+        lazy=True,
+    ))
+    def test_condition_output(self, df, consequent):
+        data = pa.PolarsData(df, 'col_a')
+        case_check_expr = CaseCheckExpression(
+            check_case=CheckCases.CONDITION,
+            expressions=[
+                SimpleCheckExpression(
+                    command='gt', subject=['col_b'], arg_values=[3]
+                ),
+                consequent,
+            ],
+        )
+
+        result = create_condition_output(data, case_check_expr).collect()
+        expected_result = df.select(
+            pl.when(create_single_expression(
+                data, case_check_expr.expressions[0]
+            )).then(
+                create_single_expression(data, consequent).fill_null(True)
+            ).alias(CONDITION_OUTPUT_KEY)
+        ).collect()
+
+        assert_frame_equal(result, expected_result)
+
+    def test_condition_output_not_met_is_null(self):
+        df = pl.LazyFrame({'col_a': [1, 5, None, 8], 'col_b': [1, 2, 3, 4]})
+        data = pa.PolarsData(df, 'col_b')
+        case_check_expr = CaseCheckExpression(
+            check_case=CheckCases.CONDITION,
+            expressions=[
+                SimpleCheckExpression(
+                    command='gt', subject=['col_a'], arg_values=[3]
+                ),
+                SimpleCheckExpression(command='is_in', arg_values=[2, 3]),
+            ],
+        )
+
+        result = create_condition_output(data, case_check_expr).collect()
+
+        assert result[CONDITION_OUTPUT_KEY].to_list() == [
+            None, True, None, False
+        ]
+
+    def test_is_row_wise(self):
+        assert is_row_wise(SimpleCheckExpression(command='gt'))
+        assert not is_row_wise(CaseCheckExpression(
+            check_case=CheckCases.CONJUNCTION,
+            expressions=[
+                SimpleCheckExpression(command='gt'),
+                SimpleCheckExpression(command='is_unique'),
+            ],
+        ))
+
+
+class TestCreateGroupExpression:
+    @pytest.fixture
+    def df(self):
+        return pl.LazyFrame({
+            'subject': [1, 1, 2, 1, 2],
+            'day': [3, 1, 1, 2, 2],
+            'value': [5, 1, 2, 1, 2],
+            'visit': ['v2', 'base', 'base', 'v1', 'base'],
+        })
+
+    @pytest.mark.parametrize(
+        'command, key, arg_values, expected',
+        [
+            ('is_unique_in_group', 'value', None,
+             [True, False, False, False, False]),
+            ('is_increasing_in_group', 'value', None,
+             [True, None, None, False, False]),
+            ('is_non_decreasing_in_group', 'value', None,
+             [True, None, None, True, True]),
+            ('has_one_per_group', 'visit', ['base'],
+             [True, True, False, True, False]),
+        ],
+    )
+    def test_group_expression(self, df, command, key, arg_values, expected):
+        simple_check_expr = SimpleCheckExpression(
+            command=command,
+            arg_values=arg_values,
+            group_by=['subject'],
+            order_by=['day'],
+        )
+
+        result = df.select(
+            create_single_expression(
+                pa.PolarsData(df, key), simple_check_expr
+            )
+        ).collect()
+
+        assert result[key].to_list() == expected
+        assert not is_row_wise(simple_check_expr)
+
+    def test_group_expression_presorted(self, df):
+        simple_check_expr = SimpleCheckExpression(
+            command='is_increasing_in_group',
+            group_by=['subject'],
+            order_by=['day'],
+        )
+        sorted_df = df.sort('subject', 'day')
+
+        result = sorted_df.select(
+            create_group_expression(
+                pa.PolarsData(sorted_df, 'value'),
+                simple_check_expr,
+                presorted=True,
+            )
+        ).collect()
+
+        assert result['value'].to_list() == [None, False, True, None, False]
+
+    def test_group_expression_needs_group_by(self):
+        with pytest.raises(ValueError, match='needs group_by'):
+            SimpleCheckExpression(command='is_unique_in_group')
@@ -0,0 +1,308 @@
+import pytest
+import polars as pl
+
+from peh_validation_library.config.config_reader import ConfigReader
+from peh_validation_library.core.check.check_stats import (
+    get_column_statistics,
+    get_constraint_statistics,
+    get_parquet_statistics,
+    get_pruned_config,
+    get_verified_dtypes,
+    is_range_proven,
+    passed_check_fn,
+    prove_check,
+    prune_config,
+)
+from peh_validation_library.core.check.schemas import SimpleCheckExpression
+from peh_validation_library.error_report.error_collector import (
+    ScopedErrorCollector,
+)
+from peh_validation_library.validator.validator import Validator
+
+
+def get_config(checks, unique=False):
+    return ConfigReader({
+        'name': 'test_config',
+        'columns': [
+            {
+                'id': 'col_a',
+                'data_type': 'integer',
+                'nullable': True,
+                'unique': unique,
+                'required': True,
+                'checks': checks,
+            },
+        ],
+    }).get_df_schema()
+
+
+STATISTICS = {'min': 1, 'max': 5, 'null_count': 0, 'len': 5, 'n_unique': 5}
+
+
+@pytest.mark.parametrize(
+    'command, arg_values, expected',
+    [
+        ('ge', [1], True),
+        ('ge', [2], False),
+        ('gt', [0], True),
+        ('le', [5], True),
+        ('lt', [5], False),
+        ('ne', [6], True),
+        ('ne', [3], False),
+        ('eq', [1], False),
+        ('is_in', [1, 2, 3, 4, 5], True),
+        ('is_in', [1, 2, 4, 5], False),
+        ('is_not_null', None, True),
+        ('is_unique', None, True),
+        ('is_null', None, False),
+    ],
+)
+def test_prove_check(command, arg_values, expected):
+    command = SimpleCheckExpression(command=command, arg_values=arg_values)
+
+    assert prove_check(command, STATISTICS) is expected
+
+
+def test_prove_check_all_null():
+    statistics = {'min': None, 'max': None, 'null_count': 3, 'len': 3}
+
+    assert prove_check(
+        SimpleCheckExpression(command='gt', arg_values=[10]), statistics
+    )
+    assert not prove_check(
+        SimpleCheckExpression(command='is_not_null'), statistics
+    )
+
+
+def test_is_range_proven_non_integer():
+    assert not is_range_proven([1.0, 2.0], 1.0, 2.0)
+    assert is_range_proven(['a'], 'a', 'a')
+
+
+def test_get_column_statistics():
+    lazyframe = pl.LazyFrame({'col_a': [3, None, 1], 'col_b': ['a', 'b', 'b']})
+
+    statistics = get_column_statistics(
+        lazyframe, {'col_a': False, 'col_b': True, 'missing': False}
+    )
+
+    assert statistics == {
+        'col_a': {'min': 1, 'max': 3, 'null_count': 1, 'len': 3},
+        'col_b': {
+            'min': 'a',
+            'max': 'b',
+            'null_count': 0,
+            'n_unique': 2,
+            'len': 3,
+        },
+    }
+
+
+def test_get_pruned_config():
+    config = get_config(
+        [
+            {'command': 'is_greater_than_or_equal_to', 'arg_values': [0]},
+            {'command': 'is_less_than', 'arg_values': [3]},
+        ],
+        unique=True,
+    )
+    lazyframe = pl.LazyFrame({'col_a': [0, 1, 2]})
+
+    pruned, skipped = get_pruned_config(lazyframe, config)
+
+    assert skipped == 3
+    assert pruned.columns[0].unique is False
+    assert all(c.fn is passed_check_fn for c in pruned.columns[0].checks)
+    # The original config is left untouched.
+    assert config.columns[0].unique is True
+    assert all(c.fn is not passed_check_fn for c in config.columns[0].checks)
+
+
+def test_get_pruned_config_keeps_possible_violations():
+    config = get_config([
+        {'command': 'is_greater_than', 'arg_values': [1]},
+    ])
+    lazyframe = pl.LazyFrame({'col_a': [0, 1, 2]})
+
+    pruned, skipped = get_pruned_config(lazyframe, config)
+
+    assert skipped == 0
+    assert pruned.columns[0].checks[0].fn is config.columns[0].checks[0].fn
+
+
+def test_get_parquet_statistics(tmp_path):
+    pytest.importorskip('pyarrow')
+    path = tmp_path / 'data.parquet'
+    pl.DataFrame({'col_a': [4, None, 1, 7]}).write_parquet(
+        path, row_group_size=2
+    )
+
+    statistics = get_parquet_statistics(path, ['col_a'], get_config([]))
+
+    assert statistics == {
+        'col_a': {'len': 4, 'null_count': 1, 'min': 1, 'max': 7}
+    }
+
+
+def test_validate_use_statistics():
+    config = get_config([
+        {'command': 'is_greater_than_or_equal_to', 'arg_values': [1]},
+        {'command': 'is_less_than', 'arg_values': [3]},
+    ])
+    dataframe = pl.DataFrame({'col_a': [1, 2, 3]})
+
+    errors = Validator(
+        dataframe, config, error_collector=ScopedErrorCollector()
+    ).validate(use_statistics=True)
+    failure_cases = errors[0].failure_cases
+
+    assert failure_cases.get_column('failure_case').to_list() == ['3']
+
+
+def get_wide_config(width):
+    return ConfigReader({
+        'name': 'test_config',
+        'columns': [
+            {
+                'id': f'col_{i}',
+                'data_type': 'integer',
+                'nullable': i % 2 == 0,
+                'unique': i % 3 == 0,
+                'required': True,
+            }
+            for i in range(width)
+        ],
+    }).get_df_schema()
+
+
+def test_get_constraint_statistics():
+    config = get_wide_config(4)
+    lazyframe = pl.LazyFrame({
+        'col_0': [1, 1, None],
+        'col_1': [1, None, 3],
+        'col_2': [1, 2, 3],
+    })
+
+    statistics = get_constraint_statistics(lazyframe, config)
+
+    assert statistics == {
+        'col_0': {'len': 3, 'n_unique': 2},
+        'col_1': {'len': 3, 'null_count': 1},
+    }
+
+
+def test_get_verified_dtypes():
+    config = get_wide_config(3)
+    schema = {'col_0': pl.Int64, 'col_1': pl.Utf8}
+
+    assert get_verified_dtypes(schema, config) == {'col_0'}
+
+
+def test_validator_settles_constraints_in_one_pass():
+    config = get_wide_config(300)
+    dataframe = pl.DataFrame({f'col_{i}': [i, i + 1, i + 2] for i in range(300)})
+    dataframe = dataframe.with_columns(
+        col_3=pl.Series([1, 1, 2]), col_5=pl.Series([1, None, 2])
+    )
+    validator = Validator(
+        dataframe, config, error_collector=ScopedErrorCollector()
+    )
+
+    schema = validator.build_schema()
+    report = validator.get_report()
+
+    # Only the violating columns keep their nullable and unique checks,
+    # and no column needs a dtype check.
+    assert [col for col, column in schema.columns.items() if column.unique] == [
+        'col_3'
+    ]
+    assert {
+        col for col, column in schema.columns.items() if not column.nullable
+    } == {'col_5'}
+    assert all(column.dtype is None for column in schema.columns.values())
+    assert sorted(report['column'].unique()) == ['col_3', 'col_5']
+
+
+def test_nan_is_never_proven():
+    config = get_config([
+        {'command': 'is_less_than', 'arg_values': [3]},
+        {'command': 'is_in', 'arg_values': [1, 2]},
+    ])
+    lazyframe = pl.LazyFrame({'col_a': [1.0, float('nan'), 2.0]})
+
+    statistics = get_column_statistics(lazyframe, {'col_a': False})
+    pruned, skipped = get_pruned_config(lazyframe, config)
+
+    assert statistics['col_a']['nan_count'] == 1
+    assert skipped == 0
+    assert not prove_check(
+        SimpleCheckExpression(command='lt', arg_values=[3]),
+        {'min': 1.0, 'max': 2.0, 'null_count': 0, 'len': 3},
+    )
+    assert prove_check(
+        SimpleCheckExpression(command='lt', arg_values=[3]),
+        {'min': 1.0, 'max': 2.0, 'null_count': 0, 'len': 3, 'nan_count': 0},
+    )
+
+
+def test_validate_use_statistics_with_nan():
+    config = ConfigReader({
+        'name': 'test_config',
+        'columns': [
+            {
+                'id': 'col_a',
+                'data_type': 'decimal',
+                'nullable': True,
+                'unique': False,
+                'required': True,
+                'checks': [{'command': 'is_less_than', 'arg_values': [3]}],
+            },
+        ],
+    }).get_df_schema()
+    dataframe = pl.DataFrame({'col_a': [1.0, float('nan')]})
+
+    errors = Validator(
+        dataframe, config, error_collector=ScopedErrorCollector()
+    ).validate(use_statistics=True)
+
+    assert errors[0].failure_cases['index'].to_list() == [1]
+
+
+def test_get_parquet_statistics_float(tmp_path):
+    pq = pytest.importorskip('pyarrow.parquet')
+    path = tmp_path / 'data.parquet'
+    # Unlike polars, pyarrow writes min and max skipping NaN.
+    pq.write_table(
+        pl.DataFrame({'col_a': [1.0, float('nan')]}).to_arrow(), path
+    )
+    config = ConfigReader({
+        'name': 'test_config',
+        'columns': [
+            {
+                'id': 'col_a',
+                'data_type': 'decimal',
+                'nullable': True,
+                'unique': False,
+                'required': True,
+                'checks': [{'command': 'is_less_than', 'arg_values': [3]}],
+            },
+        ],
+    }).get_df_schema()
+
+    statistics = get_parquet_statistics(path, ['col_a'], config)
+    pruned, skipped = prune_config(config, statistics)
+
+    # Footers have no NaN count, so the float bounds prove nothing.
+    assert statistics['col_a']['max'] == 1.0
+    assert 'nan_count' not in statistics['col_a']
+    assert skipped == 0
+
+
+def test_get_parquet_statistics_without_pyarrow(tmp_path, monkeypatch):
+    path = tmp_path / 'data.parquet'
+    pl.DataFrame({'col_a': [1, 2]}).write_parquet(path)
+    monkeypatch.setattr(
+        'peh_validation_library.core.check.check_stats.pq', None
+    )
+
+    assert get_parquet_statistics(path, ['col_a'], get_config([])) == {}
@@ -0,0 +1,205 @@
+from importlib.metadata import EntryPoint
+import pickle
+
+import polars as pl
+from polars.testing import assert_series_equal
+import pytest
+
+from peh_validation_library.config.config_reader import ConfigReader
+from peh_validation_library.core.check.check_cmd import is_row_wise
+from peh_validation_library.core.check.custom_checks import (
+    PLUGIN_GROUP,
+    get_check_names,
+    load_check_plugins,
+    register_check,
+    unregister_check,
+)
+from peh_validation_library.core.check.schemas import SimpleCheckExpression
+from peh_validation_library.error_report.error_collector import (
+    ScopedErrorCollector,
+)
+from peh_validation_library.error_report.failure_masks import (
+    get_failure_masks,
+    get_shared_masks,
+)
+from peh_validation_library.validator.validator import Validator
+
+
+@pytest.fixture
+def custom_checks():
+    @register_check()
+    def is_within(subject, arg_values=None, arg_columns=None):
+        low, high = arg_columns or arg_values
+        return subject.is_between(low, high)
+
+    @register_check('is_above_mean', row_wise=False)
+    def above_mean(subject, arg_values=None, arg_columns=None):
+        return subject > subject.mean()
+
+    yield
+    unregister_check('is_within')
+    unregister_check('is_above_mean')
+
+
+def get_config(checks):
+    return ConfigReader({
+        'name': 'test_config',
+        'columns': [
+            {
+                'id': col_id,
+                'data_type': 'integer',
+                'nullable': True,
+                'unique': False,
+                'required': True,
+            }
+            for col_id in ['col_a', 'col_b', 'low', 'high']
+        ],
+        'selectors': [{'columns': ['col_a', 'col_b'], 'checks': checks}],
+    }).get_df_schema()
+
+
+@pytest.fixture
+def dataframe():
+    return pl.DataFrame({
+        'col_a': [1, 5, 9],
+        'col_b': [4, 2, 3],
+        'low': [0, 3, 3],
+        'high': [2, 6, 8],
+    })
+
+
+@pytest.mark.usefixtures('custom_checks')
+def test_custom_check_by_name(dataframe):
+    config = get_config([
+        {'command': 'is_within', 'arg_values': [2, 4]},
+        {'command': 'is_within', 'arg_columns': ['low', 'high']},
+        {'command': 'is_above_mean'},
+    ])
+
+    masks = get_failure_masks(dataframe, config)
+    report = Validator(
+        dataframe, config, error_collector=ScopedErrorCollector()
+    ).get_report()
+
+    assert [mask.get_index().to_list() for mask in masks.masks] == [
+        [0, 1, 2], [2], [0, 1], [], [0, 1], [1, 2],
+    ]
+    assert report.height == 10
+    # The custom expressions are fused like the built-in commands.
+    shared = get_shared_masks(dataframe.lazy(), config, set(dataframe.columns))
+    assert len(shared) == 6
+
+
+@pytest.mark.usefixtures('custom_checks')
+def test_custom_check_fingerprint_by_name():
+    checks = [{'command': 'is_within', 'arg_values': [2, 4]}]
+
+    config = get_config([dict(check) for check in checks])
+
+    assert config.get_fingerprint() == get_config(checks).get_fingerprint()
+    assert config.columns[0].checks[0].check_command.command == 'is_within'
+
+
+@pytest.mark.usefixtures('custom_checks')
+def test_custom_check_row_wise():
+    assert is_row_wise(SimpleCheckExpression(command='is_within'))
+    assert not is_row_wise(SimpleCheckExpression(command='is_above_mean'))
+
+
+@pytest.mark.usefixtures('custom_checks')
+def test_register_check_errors():
+    with pytest.raises(ValueError, match='built-in'):
+        register_check('is_in')(lambda subject, **kwargs: subject)
+    with pytest.raises(ValueError, match='already registered'):
+        register_check('is_within')(lambda subject, **kwargs: subject)
+    with pytest.raises(KeyError, match='Unknown custom check'):
+        unregister_check('is_in')
+
+
+def test_unknown_check_command():
+    with pytest.raises(RuntimeError, match='Unknown check command'):
+        get_config([{'command': 'is_within'}])
+
+
+def is_positive(subject, arg_values=None, arg_columns=None):
+    return subject > 0
+
+
+@pytest.fixture
+def plugins(monkeypatch):
+    monkeypatch.setattr(
+        'peh_validation_library.core.check.custom_checks.entry_points',
+        lambda group: [
+            EntryPoint(
+                name='is_broken',
+                value=f'{__name__}:missing_plugin',
+                group=group,
+            ),
+            EntryPoint(
+                name='is_positive',
+                value=f'{__name__}:is_positive',
+                group=group,
+            )
+        ]
+        if group == PLUGIN_GROUP
+        else [],
+    )
+    load_check_plugins.cache_clear()
+    yield
+    unregister_check('is_positive')
+    load_check_plugins.cache_clear()
+
+
+@pytest.mark.usefixtures('plugins')
+def test_check_plugins(dataframe):
+    config = get_config([{'command': 'is_positive'}])
+
+    masks = get_failure_masks(dataframe.with_columns(col_b=-1), config)
+
+    assert 'is_positive' in get_check_names()
+    assert {'is_in', 'has_min_rows', 'is_unique_in_group'} <= set(
+        get_check_names()
+    )
+    assert [mask.failure_count for mask in masks.masks] == [0, 3]
+
+
+@pytest.mark.usefixtures('custom_checks')
+def test_register_check_replace(dataframe):
+    @register_check('is_within', replace=True)
+    def is_within(subject, arg_values=None, arg_columns=None):
+        return subject.is_null()
+
+    config = get_config([{'command': 'is_within', 'arg_values': [1, 3]}])
+    masks = get_failure_masks(dataframe, config)
+
+    assert masks.masks[-1].failure_count == dataframe.height
+
+
+@pytest.mark.usefixtures('plugins')
+def test_broken_check_plugin(caplog):
+    assert load_check_plugins() == ('is_positive',)
+    assert 'Could not load check plugin is_broken' in caplog.text
+
+
+@pytest.mark.usefixtures('plugins')
+def test_compiled_config_pickles(dataframe):
+    config = get_config([
+        {'command': 'is_positive'},
+        {'command': 'is_in', 'arg_values': [1, 2, 4]},
+        {
+            'check_case': 'conjunction',
+            'expressions': [
+                {'command': 'is_greater_than', 'arg_columns': ['low']},
+                {'command': 'is_less_than', 'arg_columns': ['high']},
+            ],
+        },
+    ])
+
+    restored = pickle.loads(pickle.dumps(config))
+
+    assert restored.get_fingerprint() == config.get_fingerprint()
+    for mask, expected in zip(
+        get_failure_masks(dataframe, restored).masks,
+        get_failure_masks(dataframe, config).masks,
+    ):
+        assert_series_equal(mask.mask, expected.mask)
@@ -0,0 +1,133 @@
+import os
+
+import polars as pl
+import pytest
+
+from peh_validation_library.config.config_reader import ConfigReader
+from peh_validation_library.core.check import reference_sets
+from peh_validation_library.core.check.reference_sets import (
+    clear_reference_sets,
+    get_reference_fingerprint,
+    get_reference_set,
+    register_reference_set,
+)
+from peh_validation_library.error_report.error_collector import (
+    ScopedErrorCollector,
+)
+from peh_validation_library.validator.validator import Validator
+
+
+@pytest.fixture(autouse=True)
+def clean_reference_sets():
+    yield
+    clear_reference_sets()
+
+
+@pytest.fixture
+def units_path(tmp_path):
+    path = tmp_path / 'units.arrow'
+    pl.DataFrame({
+        'code': ['mg/L', 'ug/L', 'ng/mL'],
+        'label': ['a', 'b', 'c'],
+    }).write_ipc(path)
+    return path
+
+
+def get_config(references):
+    return ConfigReader({
+        'name': 'test_config',
+        'references': references,
+        'columns': [
+            {
+                'id': 'unit',
+                'data_type': 'varchar',
+                'nullable': True,
+                'unique': False,
+                'required': True,
+                'checks': [
+                    {'command': 'is_in', 'arg_reference': 'units'},
+                ],
+            },
+        ],
+    }).get_df_schema()
+
+
+@pytest.mark.parametrize('suffix', ['.arrow', '.parquet'])
+def test_get_reference_set(tmp_path, suffix):
+    path = tmp_path / f'units{suffix}'
+    frame = pl.DataFrame({'label': ['x'], 'code': ['mg/L']})
+    if suffix == '.arrow':
+        frame.write_ipc(path)
+    else:
+        frame.write_parquet(path)
+
+    register_reference_set('units', path, column='code')
+
+    assert get_reference_set('units').to_list() == ['mg/L']
+
+
+def test_get_reference_set_is_loaded_once(units_path, monkeypatch):
+    register_reference_set('units', units_path, column='code')
+    first = get_reference_set('units')
+    monkeypatch.setitem(reference_sets.reference_readers, '.arrow', None)
+
+    assert get_reference_set('units') is first
+
+
+def test_get_reference_set_reloads_changed_file(units_path):
+    register_reference_set('units', units_path)
+    fingerprint = get_reference_fingerprint('units')
+    pl.DataFrame({'code': ['g']}).write_ipc(units_path)
+    os.utime(units_path, ns=(0, 10**18))
+
+    assert get_reference_set('units').to_list() == ['g']
+    assert get_reference_fingerprint('units') != fingerprint
+
+
+def test_reference_set_errors(tmp_path):
+    with pytest.raises(KeyError, match='Unknown reference set'):
+        get_reference_set('missing')
+    with pytest.raises(RuntimeError, match='unsupported file type'):
+        register_reference_set('units', tmp_path / 'units.csv')
+
+
+def test_is_in_reference_set(units_path):
+    config = get_config({'units': {'path': str(units_path), 'column': 'code'}})
+    dataframe = pl.DataFrame({'unit': ['mg/L', 'kg', None, 'ng/mL']})
+
+    errors = Validator(
+        dataframe, config, error_collector=ScopedErrorCollector()
+    ).validate()
+
+    failure_cases = errors[0].failure_cases
+    assert failure_cases['failure_case'].to_list() == ['kg']
+    assert "reference set 'units'" in config.columns[0].checks[0].error_msg
+
+
+def test_fingerprint_tracks_reference_file(units_path):
+    config = get_config({'units': {'path': str(units_path)}})
+    fingerprint = config.get_fingerprint()
+    pl.DataFrame({'code': ['g']}).write_ipc(units_path)
+    os.utime(units_path, ns=(0, 10**18))
+
+    assert config.get_fingerprint() != fingerprint
+
+
+def test_register_conflicting_reference_set(units_path, tmp_path):
+    other_path = tmp_path / 'other.arrow'
+    pl.DataFrame({'code': ['kg']}).write_ipc(other_path)
+    config = get_config({'units': {'path': str(units_path)}})
+    # The same registration again is accepted.
+    get_config({'units': {'path': str(units_path)}})
+
+    with pytest.raises(RuntimeError, match='already registered'):
+        get_config({'units': {'path': str(other_path)}})
+
+    # A compiled check keeps the set it was parsed with.
+    clear_reference_sets()
+    register_reference_set('units', other_path)
+    dataframe = pl.DataFrame({'unit': ['mg/L', 'kg']})
+    errors = Validator(
+        dataframe, config, error_collector=ScopedErrorCollector()
+    ).validate()
+    assert errors[0].failure_cases['failure_case'].to_list() == ['kg']
@@ -1,5 +1,6 @@
 import pandera.polars as pa
 
+from peh_validation_library.config.config_reader import ConfigReader
 from peh_validation_library.core.models.schemas import CheckSchema, ColSchema, DFSchema
 from peh_validation_library.core.utils.enums import ValidationType, ErrorLevel
 
@@ -35,4 +36,44 @@ def test_df_schema_build():
     assert built_df.name == "test_dataframe"
     assert "test_column" in built_df.columns
     assert built_df.metadata == {"meta_key": "meta_value"}
-    assert len(built_df.checks) == 1
\ No newline at end of file
+    assert len(built_df.checks) == 1
+
+def test_df_schema_get_columns():
+    conf_input = {
+        'name': 'test_config',
+        'columns': [
+            {
+                'id': 'col_a',
+                'data_type': 'integer',
+                'nullable': False,
+                'unique': False,
+                'required': True,
+                'checks': [
+                    {
+                        'check_case': 'condition',
+                        'expressions': [
+                            {'command': 'is_in', 'arg_values': [1, 2]},
+                            {
+                                'command': 'is_equal_to',
+                                'subject': ['col_b'],
+                                'arg_columns': ['col_c'],
+                            },
+                        ]
+                    },
+                ]
+            },
+        ],
+        'ids': ['col_id'],
+        'checks': [
+            {
+                'command': 'is_not_null',
+                'subject': ['col_d'],
+            }
+        ]
+    }
+
+    df_schema = ConfigReader(conf_input).get_df_schema()
+
+    assert df_schema.get_columns() == {
+        'col_a', 'col_b', 'col_c', 'col_d', 'col_id'
+    }
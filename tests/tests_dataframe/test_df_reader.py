@@ -1,7 +1,10 @@
 import polars as pl
 
 import pytest
-from peh_validation_library.dataframe.df_reader import read_dataframe
+from peh_validation_library.dataframe.df_reader import (
+    read_dataframe,
+    read_dataframe_file,
+)
 
 
 def test_df_reader():
@@ -104,3 +107,46 @@ def test_df_reader_none_data_object():
         read_dataframe(None)
     
     assert "Error reading dataframe:" in str(err.value)
+
+
+@pytest.mark.parametrize('suffix, writer', [
+    ('.csv', 'write_csv'),
+    ('.parquet', 'write_parquet'),
+    ('.jsonl', 'write_ndjson'),
+    ('.arrow', 'write_ipc'),
+])
+def test_read_dataframe_file(tmp_path, suffix, writer):
+    df = pl.DataFrame({'col_a': [1, 2, 3], 'col_b': ['x', 'y', 'z']})
+    path = tmp_path / f'data{suffix}'
+    getattr(df, writer)(path)
+
+    out = read_dataframe_file(path)
+
+    assert out.equals(df)
+
+
+def test_read_dataframe_file_unsupported(tmp_path):
+    path = tmp_path / 'data.txt'
+    path.write_text('col_a\n1')
+
+    with pytest.raises(RuntimeError) as err:
+        read_dataframe_file(path)
+
+    assert "unsupported file type" in str(err.value)
+
+
+def test_read_dataframe_file_missing(tmp_path):
+    with pytest.raises(RuntimeError) as err:
+        read_dataframe_file(tmp_path / 'missing.csv')
+
+    assert "Error reading dataframe" in str(err.value)
+
+
+def test_read_dataframe_file_columns(tmp_path):
+    df = pl.DataFrame({'col_a': [1, 2], 'col_b': ['x', 'y'], 'col_c': [1, 2]})
+    path = tmp_path / 'data.parquet'
+    df.write_parquet(path)
+
+    out = read_dataframe_file(path, columns={'col_a', 'col_c', 'missing'})
+
+    assert out.columns == ['col_a', 'col_c']
@@ -0,0 +1,64 @@
+import polars as pl
+
+from peh_validation_library.config.config_reader import ConfigReader
+from peh_validation_library.error_report.condition_report import (
+    CONDITION_REPORT_SCHEMA,
+    get_condition_report,
+)
+
+
+def test_get_condition_report():
+    conf_input = {
+        'name': 'test_config',
+        'columns': [
+            {
+                'id': 'col_a',
+                'data_type': 'integer',
+                'nullable': True,
+                'unique': False,
+                'required': True,
+                'checks': [
+                    {
+                        'check_case': 'condition',
+                        'expressions': [
+                            {
+                                'command': 'is_equal_to',
+                                'subject': ['col_b'],
+                                'arg_values': ['x'],
+                            },
+                            {'command': 'is_in', 'arg_values': [1, 2]},
+                        ],
+                        'error_level': 'critical',
+                    },
+                    {'command': 'is_not_null'},
+                ]
+            },
+        ],
+        'checks': [
+            {
+                'check_case': 'condition',
+                'expressions': [
+                    {
+                        'command': 'is_greater_than',
+                        'subject': ['col_a'],
+                        'arg_values': [1],
+                    },
+                    {'command': 'is_null', 'subject': ['col_b']},
+                ]
+            }
+        ]
+    }
+    config = ConfigReader(conf_input).get_df_schema()
+    dataframe = pl.DataFrame({
+        'col_a': [1, 3, 2, 5],
+        'col_b': ['x', 'x', 'y', None],
+    })
+
+    result = get_condition_report(dataframe, config)
+
+    assert result.schema == pl.Schema(CONDITION_REPORT_SCHEMA)
+    assert result.rows() == [
+        ('Condition of Is Equal To, Is In', 'col_a', 'critical', 2, 1, 1),
+        ('Condition of Is Greater Than, Is Null', 'test_config', 'error',
+         1, 1, 2),
+    ]
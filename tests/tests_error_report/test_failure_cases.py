@@ -0,0 +1,87 @@
+import logging
+
+import polars as pl
+import pytest
+
+from peh_validation_library.error_report.error_collector import ErrorCollector
+from peh_validation_library.error_report.error_schemas import ExceptionSchema
+from peh_validation_library.error_report.failure_cases import (
+    FAILURE_CASES_SCHEMA,
+    get_failure_cases,
+)
+from peh_validation_library.validator.validator import Validator
+
+
+@pytest.fixture
+def error_collector():
+    error_collector = ErrorCollector()
+    error_collector.clear_errors()
+    yield error_collector
+    error_collector.clear_errors()
+
+
+def test_get_failure_cases_schema_errors(error_collector):
+    config = {
+        'name': 'test_config',
+        'columns': [
+            {
+                'id': 'test_column',
+                'data_type': 'integer',
+                'nullable': False,
+                'unique': True,
+                'required': True,
+                'checks': [
+                    {
+                        'command': 'is_in',
+                        'arg_values': [1, 2],
+                        'error_level': 'critical',
+                    }
+                ]
+            },
+        ],
+    }
+    validator = Validator.build_validator(
+        config=config,
+        dataframe={'test_column': [1, 3, 3]},
+        logger=logging.getLogger('test_logger'),
+    )
+
+    result = get_failure_cases(validator.validate())
+
+    assert result.schema == pl.Schema(FAILURE_CASES_SCHEMA)
+    assert result.height == 4
+    assert result.filter(
+        pl.col('error_level') == 'critical'
+    )['index'].to_list() == [1, 2]
+    assert result.filter(
+        pl.col('check') == 'field_uniqueness'
+    )['error_level'].to_list() == ['error', 'error']
+
+
+def test_get_failure_cases_exception():
+    error = ExceptionSchema(
+        error_type='RuntimeError',
+        error_message='Something failed',
+        error_level='critical',
+        error_traceback='',
+        error_context='test',
+    )
+
+    result = get_failure_cases([error])
+
+    assert result.rows(named=True) == [{
+        'failure_case': 'Something failed',
+        'schema_context': 'test',
+        'column': None,
+        'check': 'RuntimeError',
+        'check_number': None,
+        'index': None,
+        'error_level': 'critical',
+    }]
+
+
+def test_get_failure_cases_empty():
+    result = get_failure_cases([])
+
+    assert result.is_empty()
+    assert result.columns == list(FAILURE_CASES_SCHEMA)
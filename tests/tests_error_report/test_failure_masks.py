@@ -0,0 +1,215 @@
+import polars as pl
+import pytest
+
+from peh_validation_library.config.config_reader import ConfigReader
+from peh_validation_library.core.utils.enums import ErrorLevel
+from peh_validation_library.error_report.error_collector import (
+    ScopedErrorCollector,
+)
+from peh_validation_library.error_report.failure_masks import (
+    get_failure_masks,
+    get_group_masks,
+)
+from peh_validation_library.validator.validator import Validator
+
+
+@pytest.fixture
+def config():
+    conf_input = {
+        'name': 'test_config',
+        'columns': [
+            {
+                'id': 'col_a',
+                'data_type': 'integer',
+                'nullable': False,
+                'unique': True,
+                'required': True,
+                'checks': [
+                    {
+                        'command': 'is_in',
+                        'arg_values': [1, 2, 3],
+                        'error_level': 'critical',
+                    },
+                ]
+            },
+            {
+                'id': 'col_b',
+                'data_type': 'integer',
+                'nullable': True,
+                'unique': False,
+                'required': True,
+                'checks': [
+                    {
+                        'command': 'is_greater_than',
+                        'arg_columns': ['col_a'],
+                        'error_level': 'warning',
+                    },
+                ]
+            },
+        ],
+        'ids': ['col_a', 'col_b'],
+        'checks': [
+            {
+                'command': 'is_less_than',
+                'subject': ['col_b'],
+                'arg_values': [10],
+            }
+        ]
+    }
+    return ConfigReader(conf_input).get_df_schema()
+
+
+@pytest.fixture
+def dataframe():
+    return pl.DataFrame({
+        'col_a': [1, 2, 4, 4, None],
+        'col_b': [2, 1, 5, 12, 3],
+    })
+
+
+def test_get_failure_masks(config, dataframe):
+    masks = get_failure_masks(dataframe, config)
+
+    counts = masks.get_counts()
+    assert counts['check'].to_list() == [
+        'not_nullable',
+        'field_uniqueness',
+        'The column Is In [1, 2, 3]',
+        'The column Is Greater Than [\'col_a\']',
+        'multiple_fields_uniqueness',
+        'Column(s) [\'col_b\'] Is Less Than [10]',
+    ]
+    assert counts['failure_count'].to_list() == [1, 2, 2, 1, 0, 1]
+    assert masks.masks[2].get_index().to_list() == [2, 3]
+    assert masks.masks[0].mask.dtype == pl.Boolean
+    assert len(masks.masks[0].mask) == dataframe.height
+
+
+def test_failure_masks_combine(config, dataframe):
+    masks = get_failure_masks(dataframe, config)
+
+    critical = masks.any_failure([ErrorLevel.CRITICAL])
+    any_failure = masks.any_failure()
+    all_failure = masks.all_failure([ErrorLevel.CRITICAL, ErrorLevel.WARNING])
+
+    assert critical.to_list() == [False, False, True, True, False]
+    assert any_failure.to_list() == [False, True, True, True, True]
+    assert all_failure.to_list() == [False, False, False, False, False]
+
+
+def test_failure_masks_render(config, dataframe):
+    masks = get_failure_masks(dataframe, config)
+
+    report = masks.render(dataframe)
+
+    critical = report.filter(pl.col('error_level') == 'critical')
+    assert report.height == 7
+    assert critical['failure_case'].to_list() == ['4', '4']
+    assert critical['index'].to_list() == [2, 3]
+    assert report.filter(
+        pl.col('schema_context') == 'DataFrameSchema'
+    )['failure_case'].to_list() == ['{"col_a":4,"col_b":12}']
+
+
+def test_get_failure_masks_selectors():
+    config = ConfigReader({
+        'name': 'test_config',
+        'columns': [
+            {
+                'id': col_id,
+                'data_type': 'integer',
+                'nullable': True,
+                'unique': False,
+                'required': True,
+                'checks': [{'command': 'is_not_null'}],
+            }
+            for col_id in ['m_a', 'm_b', 'm_c']
+        ],
+        'selectors': [
+            {
+                'regex': '^m_',
+                'checks': [
+                    {'command': 'is_less_than', 'arg_values': [10]},
+                ],
+            },
+        ],
+    }).get_df_schema()
+    dataframe = pl.DataFrame({
+        'm_a': [1, 12, None],
+        'm_b': [11, 12, 3],
+        'm_c': [1, 2, 3],
+    })
+
+    masks = get_failure_masks(dataframe, config)
+
+    counts = masks.get_counts().filter(
+        pl.col('check') == 'The column Is Less Than [10]'
+    )
+    assert counts['column'].to_list() == ['m_a', 'm_b', 'm_c']
+    assert counts['failure_count'].to_list() == [1, 2, 0]
+    assert masks.masks[3].get_index().to_list() == [0, 1]
+    assert masks.masks[3].check_number == 1
+    validator = Validator(
+        dataframe, config, error_collector=ScopedErrorCollector()
+    )
+    assert masks.render(dataframe).sort('column', 'index').equals(
+        validator.get_report().sort('column', 'index')
+    )
+
+
+def test_get_failure_masks_group_checks():
+    config = ConfigReader({
+        'name': 'test_config',
+        'columns': [
+            {
+                'id': col_id,
+                'data_type': 'integer',
+                'nullable': True,
+                'unique': False,
+                'required': True,
+                'checks': [
+                    {
+                        'command': 'is_increasing_in_group',
+                        'group_by': ['subject'],
+                        'order_by': ['day'],
+                    },
+                ],
+            }
+            for col_id in ['day', 'value']
+        ],
+        'checks': [
+            {
+                'command': 'has_one_per_group',
+                'subject': ['day'],
+                'arg_values': [1],
+                'group_by': ['subject'],
+                'order_by': ['day'],
+            },
+        ],
+    }).get_df_schema()
+    dataframe = pl.DataFrame({
+        'subject': [1, 1, 2, 1, 2],
+        'day': [3, 1, 1, 2, 1],
+        'value': [5, 1, 2, 1, 3],
+    })
+
+    group_masks = get_group_masks(
+        dataframe.lazy(), config, set(dataframe.columns)
+    )
+    masks = get_failure_masks(dataframe, config)
+
+    # All three checks share the group and order columns, so they come
+    # from one sorted select.
+    assert len(group_masks) == 3
+    assert [mask.get_index().to_list() for mask in masks.masks] == [
+        [4], [3], [2, 4],
+    ]
+    validator = Validator(
+        dataframe, config, error_collector=ScopedErrorCollector()
+    )
+    # Pandera adds its check output to dataframe level failure cases.
+    assert masks.render(dataframe).drop('failure_case').sort(
+        'column', 'index'
+    ).equals(
+        validator.get_report().drop('failure_case').sort('column', 'index')
+    )
@@ -0,0 +1,86 @@
+import polars as pl
+import pytest
+
+from peh_validation_library.config.config_reader import ConfigReader
+from peh_validation_library.error_report.failure_masks import (
+    get_failure_masks,
+)
+from peh_validation_library.error_report.failure_summary import (
+    FAILURE_SUMMARY_SCHEMA,
+    get_failure_summary,
+)
+
+
+@pytest.fixture
+def config():
+    conf_input = {
+        'name': 'test_config',
+        'columns': [
+            {
+                'id': 'code',
+                'data_type': 'varchar',
+                'nullable': True,
+                'unique': False,
+                'required': True,
+                'checks': [
+                    {'command': 'is_in', 'arg_values': ['a', 'b']},
+                ]
+            },
+        ],
+        'checks': [
+            {
+                'command': 'is_not_equal_to',
+                'subject': ['code'],
+                'arg_values': ['z'],
+            }
+        ]
+    }
+    return ConfigReader(conf_input).get_df_schema()
+
+
+@pytest.fixture
+def dataframe():
+    return pl.DataFrame({
+        'sample_id': [f's{i}' for i in range(8)],
+        'code': ['a', 'x', 'x', 'b', 'x', 'z', 'x', 'x'],
+    })
+
+
+def test_get_failure_summary(config, dataframe):
+    masks = get_failure_masks(dataframe, config)
+
+    summary = get_failure_summary(dataframe, masks, sample_size=2)
+
+    assert summary.schema == pl.Schema(FAILURE_SUMMARY_SCHEMA)
+    assert summary.select(
+        'schema_context', 'failure_case', 'count', 'first_index', 'last_index'
+    ).rows() == [
+        ('Column', 'x', 5, 1, 7),
+        ('Column', 'z', 1, 5, 5),
+        ('DataFrameSchema', '{"sample_id":"s5","code":"z"}', 1, 5, 5),
+    ]
+    assert summary['sample_ids'].to_list()[0] == ['1', '2']
+
+
+def test_get_failure_summary_ids(config, dataframe):
+    masks = get_failure_masks(dataframe, config)
+
+    summary = get_failure_summary(dataframe, masks, ids=['sample_id'])
+
+    assert summary['sample_ids'].to_list()[0] == [
+        '{"sample_id":"s1"}',
+        '{"sample_id":"s2"}',
+        '{"sample_id":"s4"}',
+        '{"sample_id":"s6"}',
+        '{"sample_id":"s7"}',
+    ]
+
+
+def test_get_failure_summary_no_failures(config):
+    dataframe = pl.DataFrame({'sample_id': ['s0'], 'code': ['a']})
+    masks = get_failure_masks(dataframe, config)
+
+    summary = get_failure_summary(dataframe, masks)
+
+    assert summary.is_empty()
+    assert summary.schema == pl.Schema(FAILURE_SUMMARY_SCHEMA)
@@ -0,0 +1,151 @@
+import io
+
+import polars as pl
+import pytest
+from polars.testing import assert_frame_equal
+
+from peh_validation_library.config.config_reader import ConfigReader
+from peh_validation_library.error_report import report_sink
+from peh_validation_library.error_report.failure_cases import (
+    FAILURE_CASES_SCHEMA,
+)
+from peh_validation_library.error_report.report_sink import (
+    JsonlSink,
+    ReportSinkCollector,
+    get_report_sink,
+)
+from peh_validation_library.validator.validator import Validator
+
+
+def get_frame(start, stop):
+    return pl.DataFrame(
+        {
+            'failure_case': [str(i) for i in range(start, stop)],
+            'schema_context': 'Column',
+            'column': 'col_a',
+            'check': 'is_in',
+            'check_number': 0,
+            'index': list(range(start, stop)),
+            'error_level': 'error',
+        },
+        schema=FAILURE_CASES_SCHEMA,
+    )
+
+
+def test_jsonl_sink_flushes_by_size():
+    stream = io.StringIO()
+    sink = JsonlSink(stream, flush_size=3)
+
+    sink.write(get_frame(0, 2))
+    assert stream.getvalue() == ''
+
+    # A frame is split to flush exactly flush_size rows.
+    sink.write(get_frame(2, 4))
+    assert len(stream.getvalue().splitlines()) == 3
+
+    sink.write(get_frame(4, 5))
+    sink.close()
+    assert len(stream.getvalue().splitlines()) == 5
+    assert sink.rows_written == 5
+
+
+@pytest.mark.parametrize('with_pyarrow', [True, False])
+@pytest.mark.parametrize(
+    'output_format, reader',
+    [('parquet', pl.read_parquet), ('ipc', pl.read_ipc)],
+)
+def test_file_sinks(
+    tmp_path, monkeypatch, output_format, reader, with_pyarrow
+):
+    if with_pyarrow:
+        pytest.importorskip('pyarrow')
+    else:
+        monkeypatch.setattr(report_sink, 'pa', None)
+    path = tmp_path / f'report.{output_format}'
+
+    with get_report_sink(path, output_format, flush_size=2) as sink:
+        for start in range(0, 10, 3):
+            sink.write(get_frame(start, min(start + 3, 10)))
+
+    assert_frame_equal(reader(path), get_frame(0, 10))
+
+
+def test_file_sink_empty_report(tmp_path):
+    path = tmp_path / 'report.parquet'
+
+    with get_report_sink(path, 'parquet'):
+        pass
+
+    assert pl.read_parquet(path).schema == pl.Schema(FAILURE_CASES_SCHEMA)
+
+
+def test_get_report_sink_errors(tmp_path):
+    with pytest.raises(ValueError, match='Unsupported report format'):
+        get_report_sink(tmp_path / 'report.csv', 'csv')
+    with pytest.raises(ValueError, match='output path is required'):
+        get_report_sink(None, 'parquet')
+
+
+def test_report_sink_collector():
+    config = ConfigReader({
+        'name': 'test_config',
+        'columns': [
+            {
+                'id': 'col_a',
+                'data_type': 'integer',
+                'nullable': True,
+                'unique': False,
+                'required': True,
+                'checks': [{'command': 'is_in', 'arg_values': [1, 2]}],
+            },
+        ],
+    }).get_df_schema()
+    stream = io.StringIO()
+
+    with JsonlSink(stream) as sink:
+        errors = Validator(
+            pl.DataFrame({'col_a': [1, 3, 4]}),
+            config,
+            error_collector=ReportSinkCollector(sink),
+        ).validate()
+
+    assert errors == []
+    report = pl.read_ndjson(io.StringIO(stream.getvalue()))
+    assert report['failure_case'].to_list() == ['3', '4']
+
+
+class RecordingSink(report_sink.ReportSink):
+    def __init__(self, flush_size):
+        super().__init__(flush_size)
+        self.heights = []
+
+    def _write(self, frame):
+        self.heights.append(frame.height)
+
+
+def test_report_sink_collector_slices_errors():
+    config = ConfigReader({
+        'name': 'test_config',
+        'columns': [
+            {
+                'id': 'col_a',
+                'data_type': 'integer',
+                'nullable': True,
+                'unique': False,
+                'required': True,
+                'checks': [{'command': 'is_in', 'arg_values': [1]}],
+            },
+        ],
+    }).get_df_schema()
+    sink = RecordingSink(flush_size=2)
+
+    with sink:
+        Validator(
+            pl.DataFrame({'col_a': [1, 3, 4, 5, 6, 7]}),
+            config,
+            error_collector=ReportSinkCollector(sink),
+        ).validate()
+
+    assert sink.heights == [2, 2, 1]
+    with pytest.raises(TypeError, match='abstract'):
+        report_sink.FileSink('report.parquet')
@@ -0,0 +1,91 @@
+import asyncio
+
+import polars as pl
+import pytest
+
+from peh_validation_library.config.config_reader import ConfigReader
+from peh_validation_library.core.utils.enums import ErrorLevel
+from peh_validation_library.validator.check_results import (
+    iter_check_results,
+)
+from peh_validation_library.validator.validator import Validator
+
+
+@pytest.fixture
+def config():
+    return ConfigReader({
+        'name': 'test_config',
+        'columns': [
+            {
+                'id': 'col_a',
+                'data_type': 'integer',
+                'nullable': True,
+                'unique': False,
+                'required': True,
+                'checks': [
+                    {
+                        'command': 'is_less_than',
+                        'arg_values': [3],
+                        'error_level': 'warning',
+                    },
+                    {
+                        'command': 'is_in',
+                        'arg_values': [1, 2, 3, 4],
+                        'error_level': 'critical',
+                    },
+                    {'command': 'is_greater_than', 'arg_values': [0]},
+                ],
+            },
+        ],
+    }).get_df_schema()
+
+
+@pytest.fixture
+def dataframe():
+    return pl.DataFrame({'col_a': [1, 5, 3, 6, 2]})
+
+
+@pytest.mark.parametrize('batch_size', [1, 2, 10])
+def test_iter_check_results(config, dataframe, batch_size):
+    results = list(
+        iter_check_results(
+            dataframe, config, sample_size=1, batch_size=batch_size
+        )
+    )
+
+    assert [result.error_level for result in results] == [
+        ErrorLevel.CRITICAL,
+        ErrorLevel.ERROR,
+        ErrorLevel.WARNING,
+    ]
+    assert [result.passed for result in results] == [False, True, False]
+    assert [result.failure_count for result in results] == [2, 0, 3]
+    assert results[0].sample['failure_case'].to_list() == ['5']
+    assert results[0].sample['index'].to_list() == [1]
+    assert results[1].sample.is_empty()
+    assert all(result.duration >= 0 for result in results)
+
+
+def test_iter_check_results_invalid_batch_size(config, dataframe):
+    with pytest.raises(ValueError, match='batch_size'):
+        next(iter_check_results(dataframe, config, batch_size=0))
+
+
+def test_iter_validate_is_lazy(config, dataframe):
+    results = Validator(dataframe, config).iter_validate()
+
+    first = next(results)
+
+    assert first.error_level == ErrorLevel.CRITICAL
+    assert len(list(results)) == 2
+
+
+def test_iter_validate_async(config, dataframe):
+    async def collect():
+        validator = Validator(dataframe, config)
+        return [
+            result.failure_count
+            async for result in validator.iter_validate_async()
+        ]
+
+    assert asyncio.run(collect()) == [2, 0, 3]
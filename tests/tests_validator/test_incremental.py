@@ -0,0 +1,156 @@
+import polars as pl
+import pytest
+
+from peh_validation_library.config.config_reader import ConfigReader
+from peh_validation_library.error_report.failure_masks import (
+    get_failure_masks,
+)
+from peh_validation_library.validator.incremental import (
+    get_changed_rows,
+    validate_incremental,
+)
+
+
+@pytest.fixture
+def config():
+    conf_input = {
+        'name': 'test_config',
+        'columns': [
+            {
+                'id': 'id',
+                'data_type': 'integer',
+                'nullable': False,
+                'unique': True,
+                'required': True,
+            },
+            {
+                'id': 'round',
+                'data_type': 'integer',
+                'nullable': False,
+                'unique': False,
+                'required': True,
+                'checks': [
+                    {
+                        'command': 'is_greater_than_or_equal_to',
+                        'arg_values': [1],
+                    },
+                ]
+            },
+            {
+                'id': 'value',
+                'data_type': 'decimal',
+                'nullable': True,
+                'unique': False,
+                'required': True,
+                'checks': [
+                    {'command': 'is_unique'},
+                ]
+            },
+        ],
+        'ids': ['id', 'round'],
+        'checks': [
+            {
+                'check_case': 'condition',
+                'expressions': [
+                    {
+                        'command': 'is_greater_than',
+                        'subject': ['round'],
+                        'arg_values': [1],
+                    },
+                    {'command': 'is_not_null', 'subject': ['value']},
+                ]
+            }
+        ]
+    }
+    return ConfigReader(conf_input).get_df_schema()
+
+
+@pytest.fixture
+def dataframe():
+    return pl.DataFrame({
+        'id': [1, 2, 3, 4],
+        'round': [1, 1, 0, 2],
+        'value': [0.5, 0.7, 0.5, None],
+    })
+
+
+def assert_same_masks(state, dataframe, config):
+    expected = get_failure_masks(dataframe, config)
+    assert len(state.masks.masks) == len(expected.masks)
+    for mask, expected_mask in zip(state.masks.masks, expected.masks):
+        assert mask.check == expected_mask.check
+        assert mask.mask.to_list() == expected_mask.mask.to_list()
+        assert mask.failure_count == expected_mask.failure_count
+
+
+def test_get_changed_rows():
+    previous = pl.Series([1, 2, 3], dtype=pl.UInt64)
+
+    changed = get_changed_rows(
+        previous, pl.Series([1, 5, 3, 7, 8], dtype=pl.UInt64)
+    )
+
+    assert changed.to_list() == [1, 3, 4]
+    assert get_changed_rows(previous, previous.head(2)) is None
+
+
+def test_validate_incremental_first_run(config, dataframe):
+    state = validate_incremental(dataframe, config)
+
+    assert state.delta_size == dataframe.height
+    assert_same_masks(state, dataframe, config)
+
+
+def test_validate_incremental_append(config, dataframe):
+    state = validate_incremental(dataframe, config)
+    appended = pl.concat([
+        dataframe,
+        pl.DataFrame({
+            'id': [5, 1, 6],
+            'round': [3, 1, 2],
+            'value': [0.9, 0.1, None],
+        }),
+    ])
+
+    new_state = validate_incremental(appended, config, state)
+
+    assert new_state.delta_size == 3
+    assert_same_masks(new_state, appended, config)
+    # The previous state is left untouched.
+    assert_same_masks(state, dataframe, config)
+
+
+def test_validate_incremental_change_resolves_duplicate(config):
+    dataframe = pl.DataFrame({
+        'id': [1, 1, 2],
+        'round': [1, 1, 1],
+        'value': [0.1, 0.2, 0.3],
+    })
+    state = validate_incremental(dataframe, config)
+    changed = dataframe.with_columns(
+        id=pl.Series([1, 3, 2]),
+    )
+
+    new_state = validate_incremental(changed, config, state)
+
+    assert new_state.delta_size == 1
+    assert_same_masks(new_state, changed, config)
+    assert new_state.masks.any_failure().sum() == 0
+
+
+def test_validate_incremental_removed_rows(config, dataframe):
+    state = validate_incremental(dataframe, config)
+
+    new_state = validate_incremental(dataframe.head(2), config, state)
+
+    assert new_state.delta_size == 2
+    assert_same_masks(new_state, dataframe.head(2), config)
+
+
+def test_validate_incremental_unchanged(config, dataframe):
+    state = validate_incremental(dataframe, config)
+
+    new_state = validate_incremental(dataframe, config, state)
+
+    assert new_state.delta_size == 0
+    assert_same_masks(new_state, dataframe, config)
@@ -0,0 +1,159 @@
+from unittest.mock import patch
+
+import polars as pl
+import pytest
+from polars.testing import assert_series_equal
+
+from peh_validation_library.config.config_reader import ConfigReader
+from peh_validation_library.error_report.failure_masks import (
+    get_failure_masks,
+)
+from peh_validation_library.validator import multi_schema
+from peh_validation_library.validator.multi_schema import validate_schemas
+from peh_validation_library.validator.validator import Validator
+
+
+def get_config(name, data_type='integer', arg_values=(1, 2, 3)):
+    return ConfigReader({
+        'name': name,
+        'columns': [
+            {
+                'id': 'col_a',
+                'data_type': data_type,
+                'nullable': False,
+                'unique': False,
+                'required': True,
+                'checks': [
+                    {'command': 'is_in', 'arg_values': list(arg_values)},
+                    {'command': 'is_not_null', 'error_level': 'critical'},
+                ],
+            },
+        ],
+    }).get_df_schema()
+
+
+@pytest.fixture
+def dataframe():
+    return pl.DataFrame({'col_a': ['1', '2', '4', None]})
+
+
+def test_validate_schemas(dataframe):
+    configs = [
+        get_config('v1'),
+        get_config('v2', arg_values=(1, 2, 3, 4)),
+        get_config('v3', data_type='date'),
+    ]
+
+    result = validate_schemas(dataframe, configs)
+
+    assert result.ranking.select('schema', 'rank', 'failures').rows() == [
+        ('v2', 1, 2),
+        ('v1', 2, 3),
+        ('v3', 3, None),
+    ]
+    assert result.ranking['cast_error'][2] is not None
+    assert result.get_best_match() == 'v2'
+    for name, config in zip(['v1', 'v2'], configs):
+        expected = get_failure_masks(result.dataframes[name], config)
+        for mask, expected_mask in zip(
+            result.masks[name].masks, expected.masks
+        ):
+            assert_series_equal(mask.mask, expected_mask.mask)
+    assert result.get_report('v1').height == 3
+
+
+def test_validate_schemas_shares_plans(dataframe):
+    configs = [get_config('v1'), get_config('v2')]
+
+    with patch.object(
+        multi_schema.pl, 'collect_all', wraps=pl.collect_all
+    ) as collect_all:
+        result = validate_schemas(dataframe, configs)
+
+    # Both schemas have the same 3 plans, each evaluated once.
+    assert len(collect_all.call_args.args[0]) == 3
+    assert result.dataframes['v1'] is result.dataframes['v2']
+
+
+def test_validate_schemas_duplicate_names(dataframe):
+    with pytest.raises(ValueError, match='distinct names'):
+        validate_schemas(dataframe, [get_config('v1'), get_config('v1')])
+
+
+def test_validator_compare_schemas(dataframe):
+    validator = Validator(dataframe, get_config('v1'))
+
+    result = validator.compare_schemas([get_config('v2', arg_values=[4])])
+
+    assert result.ranking['schema'].to_list() == ['v1', 'v2']
+
+
+def test_validate_schemas_counts_schema_errors():
+    dataframe = pl.DataFrame({
+        'col_a': ['1', '2', '4'],
+        'col_b': ['x', 'y', 'z'],
+    })
+    fits = ConfigReader({
+        'name': 'fits',
+        'columns': [
+            {
+                'id': col_id,
+                'data_type': 'varchar',
+                'nullable': False,
+                'unique': False,
+                'required': True,
+                'checks': [{'command': 'is_in', 'arg_values': ['x', 'y']}],
+            }
+            for col_id in ('col_a', 'col_b')
+        ],
+    }).get_df_schema()
+    missing = ConfigReader({
+        'name': 'missing',
+        'columns': [
+            {
+                'id': col_id,
+                'data_type': 'varchar',
+                'nullable': False,
+                'unique': False,
+                'required': True,
+            }
+            for col_id in ('col_a', 'col_c', 'col_d')
+        ],
+    }).get_df_schema()
+    configs = [missing, get_config('v2', arg_values=(1, 2, 4)), fits]
+
+    result = validate_schemas(dataframe, configs)
+
+    assert result.ranking.select(
+        'schema',
+        'schema_errors',
+        'missing_columns',
+        'undeclared_columns',
+        'dtype_failures',
+        'failures',
+    ).rows() == [
+        ('fits', 0, 0, 0, 0, 4),
+        ('v2', 1, 0, 1, 0, 0),
+        ('missing', 3, 2, 1, 0, 0),
+    ]
+    assert [
+        mask.frame_failure
+        for mask in result.masks['missing'].masks
+        if mask.check == 'column_in_dataframe' and mask.failed
+    ] == ['col_c', 'col_d']
+
+
+def test_validate_schemas_counts_dtype_failures():
+    dataframe = pl.DataFrame({'col_a': ['1', 'x', 'y']})
+
+    result = validate_schemas(
+        dataframe,
+        [
+            get_config('v1'),
+            get_config('v2', data_type='varchar', arg_values=('x', 'y')),
+        ],
+    )
+
+    assert result.ranking.select(
+        'schema', 'schema_errors', 'dtype_failures'
+    ).rows() == [('v2', 0, 0), ('v1', 1, 2)]
@@ -0,0 +1,175 @@
+import polars as pl
+import pytest
+
+from peh_validation_library.config.config_reader import ConfigReader
+from peh_validation_library.validator.referential import (
+    check_foreign_keys,
+    validate_dataset,
+)
+
+
+def get_table(name, columns, ids=None):
+    config = {
+        'name': name,
+        'columns': [
+            {
+                'id': col,
+                'data_type': 'integer',
+                'nullable': True,
+                'unique': False,
+                'required': True,
+            }
+            for col in columns
+        ],
+    }
+    if ids:
+        config['ids'] = ids
+    return config
+
+
+@pytest.fixture
+def dataset_config():
+    return {
+        'name': 'study',
+        'tables': [
+            get_table('subjects', ['subject_id'], ids=['subject_id']),
+            get_table(
+                'samples',
+                ['sample_id', 'subject_id'],
+                ids=['sample_id'],
+            ),
+            get_table('measurements', ['sample_id', 'subject_id', 'value']),
+        ],
+        'foreign_keys': [
+            {
+                'table': 'samples',
+                'columns': ['subject_id'],
+                'ref_table': 'subjects',
+            },
+            {
+                'table': 'measurements',
+                'columns': ['subject_id'],
+                'ref_table': 'subjects',
+                'error_level': 'critical',
+            },
+            {
+                'table': 'measurements',
+                'columns': ['sample_id', 'subject_id'],
+                'ref_table': 'samples',
+                'ref_columns': ['sample_id', 'subject_id'],
+            },
+        ],
+    }
+
+
+@pytest.fixture
+def frames():
+    return {
+        'subjects': pl.DataFrame({'subject_id': [1, 2, 3]}),
+        'samples': pl.DataFrame({
+            'sample_id': [10, 11, 12],
+            'subject_id': [1, 4, None],
+        }),
+        'measurements': pl.DataFrame({
+            'sample_id': [10, 10, 11, 13],
+            'subject_id': [1, 2, 4, 3],
+            'value': [0, 1, 2, 3],
+        }),
+    }
+
+
+def test_get_dataset_schema(dataset_config):
+    dataset = ConfigReader(dataset_config).get_dataset_schema()
+
+    assert [table.name for table in dataset.tables] == [
+        'subjects', 'samples', 'measurements'
+    ]
+    assert dataset.foreign_keys[0].ref_columns == ['subject_id']
+
+
+@pytest.mark.parametrize(
+    'foreign_key, match',
+    [
+        ({'table': 'unknown', 'columns': ['a'], 'ref_table': 'subjects'},
+         'Unknown table'),
+        ({'table': 'measurements', 'columns': ['value'],
+          'ref_table': 'measurements'}, 'referenced columns'),
+    ],
+)
+def test_get_dataset_schema_invalid_foreign_key(
+    dataset_config, foreign_key, match
+):
+    dataset_config['foreign_keys'] = [foreign_key]
+
+    with pytest.raises(RuntimeError, match=match):
+        ConfigReader(dataset_config).get_dataset_schema()
+
+
+def test_check_foreign_keys(dataset_config, frames):
+    dataset = ConfigReader(dataset_config).get_dataset_schema()
+
+    report = check_foreign_keys(frames, dataset)
+
+    assert report.select(
+        'table', 'failure_case', 'index', 'error_level'
+    ).rows() == [
+        ('samples', '{"subject_id":4}', 1, 'error'),
+        ('measurements', '{"subject_id":4}', 2, 'critical'),
+        ('measurements', '{"sample_id":10,"subject_id":2}', 1, 'error'),
+        ('measurements', '{"sample_id":13,"subject_id":3}', 3, 'error'),
+    ]
+    assert set(report['schema_context']) == {'ForeignKey'}
+
+
+def test_validate_dataset(dataset_config, frames):
+    dataset = ConfigReader(dataset_config).get_dataset_schema()
+    frames['subjects'] = pl.DataFrame({'subject_id': ['1', '1', 'x']})
+
+    report = validate_dataset(frames, dataset)
+
+    # The subjects table cannot be cast, so only the samples to
+    # measurements key is checked.
+    assert report.filter(pl.col('table') == 'subjects')[
+        'error_level'
+    ].to_list() == ['critical']
+    assert report.filter(pl.col('schema_context') == 'ForeignKey').height == 2
+
+
+def test_validate_dataset_missing_table(dataset_config, frames):
+    dataset = ConfigReader(dataset_config).get_dataset_schema()
+    del frames['samples']
+
+    with pytest.raises(ValueError, match='Missing tables: samples'):
+        validate_dataset(frames, dataset)
+
+
+def test_check_foreign_keys_unusable_keys(dataset_config, frames):
+    dataset = ConfigReader(dataset_config).get_dataset_schema()
+    frames['samples'] = frames['samples'].drop('subject_id')
+    frames['subjects'] = frames['subjects'].cast(pl.Utf8)
+
+    report = check_foreign_keys(frames, dataset)
+
+    assert report.select(
+        'table', 'failure_case', 'index', 'error_level'
+    ).rows() == [
+        (
+            'samples',
+            'Missing key columns in samples: subject_id',
+            None,
+            'critical',
+        ),
+        (
+            'measurements',
+            'Key column measurements.subject_id (Int64) does not match '
+            'subjects.subject_id (String)',
+            None,
+            'critical',
+        ),
+        (
+            'measurements',
+            'Missing key columns in samples: subject_id',
+            None,
+            'critical',
+        ),
+    ]
@@ -0,0 +1,128 @@
+import copy
+
+import polars as pl
+from polars.testing import assert_frame_equal
+import pytest
+
+from peh_validation_library.config.config_reader import ConfigReader
+from peh_validation_library.validator.result_cache import (
+    ResultCache,
+    get_cache_key,
+    get_dataframe_hash,
+)
+from peh_validation_library.validator.validator import Validator
+
+
+@pytest.fixture
+def config_input():
+    return {
+        'name': 'test_config',
+        'columns': [
+            {
+                'id': 'test_column',
+                'data_type': 'integer',
+                'nullable': False,
+                'unique': False,
+                'required': True,
+                'checks': [{'command': 'is_in', 'arg_values': [1, 2]}],
+            },
+        ],
+    }
+
+
+def test_get_dataframe_hash():
+    df = pl.DataFrame({'a': [1, 2, 3], 'b': ['x', 'y', 'z']})
+
+    assert get_dataframe_hash(df) == get_dataframe_hash(df.clone())
+    assert get_dataframe_hash(df) != get_dataframe_hash(df.reverse())
+    assert get_dataframe_hash(df) != get_dataframe_hash(
+        df.cast({'a': pl.Int32})
+    )
+    assert get_dataframe_hash(df) != get_dataframe_hash(df.head(2))
+
+
+def test_get_cache_key(config_input):
+    df = pl.DataFrame({'test_column': [1, 2, 3]})
+    config = ConfigReader(copy.deepcopy(config_input)).get_df_schema()
+    same_config = ConfigReader(copy.deepcopy(config_input)).get_df_schema()
+    config_input['columns'][0]['checks'][0]['arg_values'] = [1, 2, 3]
+    other_config = ConfigReader(config_input).get_df_schema()
+
+    assert get_cache_key(config, df) == get_cache_key(same_config, df)
+    assert get_cache_key(config, df) != get_cache_key(other_config, df)
+
+
+def test_result_cache_memory_bound():
+    cache = ResultCache(max_entries=2)
+    report = pl.DataFrame({'a': [1]})
+
+    cache.put('a', report)
+    cache.put('b', report)
+    cache.get('a')
+    cache.put('c', report)
+
+    assert len(cache) == 2
+    assert cache.get('b') is None
+    assert cache.get('a') is report
+
+
+def test_result_cache_disk_tier(tmp_path):
+    report = pl.DataFrame({'a': [1, 2]})
+    ResultCache(directory=tmp_path).put('key', report)
+
+    cache = ResultCache(max_entries=0, directory=tmp_path)
+
+    assert_frame_equal(cache.get('key'), report)
+    assert cache.get('missing') is None
+    cache.clear()
+    assert cache.get('key') is None
+
+
+def test_validator_get_report_cache_hit(config_input, monkeypatch):
+    cache = ResultCache()
+    dataframe = {'test_column': [1, 2, 3]}
+
+    first = Validator.build_validator(
+        config=copy.deepcopy(config_input), dataframe=dataframe
+        ).get_report(cache=cache)
+
+    validator = Validator.build_validator(
+        config=copy.deepcopy(config_input), dataframe=dataframe
+        )
+
+    def fail():
+        raise AssertionError('validation should be served from cache')
+
+    monkeypatch.setattr(validator, '_validate_isolated', fail)
+    second = validator.get_report(cache=cache)
+
+    assert first['failure_case'].to_list() == ['3']
+    assert second is first
+
+
+def get_is_below(limit):
+    def is_below(data, arg_values=None, arg_columns=None, subject=None):
+        return data.lazyframe.select(pl.col(data.key) < limit)
+
+    return is_below
+
+
+def test_cache_key_closures(config_input):
+    cache = ResultCache()
+    dataframe = {'test_column': [1, 2, 3]}
+    reports = []
+    for limit in [2, 3, 2]:
+        conf = copy.deepcopy(config_input)
+        conf['columns'][0]['checks'] = [{'command': get_is_below(limit)}]
+        reports.append(
+            Validator.build_validator(
+                config=conf, dataframe=dataframe
+            ).get_report(cache=cache)
+        )
+
+    # Same qualified name, different captured limit: no shared entry.
+    assert [report['failure_case'].to_list() for report in reports] == [
+        ['2', '3'], ['3'], ['2', '3']
+    ]
+    assert reports[2] is reports[0]
+    assert len(cache) == 2
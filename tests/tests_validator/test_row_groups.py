@@ -0,0 +1,163 @@
+import logging
+
+import pytest
+import polars as pl
+from polars.testing import assert_frame_equal, assert_series_equal
+
+from peh_validation_library.config.config_reader import ConfigReader
+from peh_validation_library.error_report.failure_masks import get_failure_masks
+from peh_validation_library.validator.row_groups import (
+    get_proven_labels,
+    scan_parquet,
+    validate_parquet,
+)
+
+
+@pytest.fixture
+def config():
+    return ConfigReader({
+        'name': 'test_config',
+        'columns': [
+            {
+                'id': 'col_a',
+                'data_type': 'integer',
+                'nullable': False,
+                'unique': True,
+                'required': True,
+                'checks': [
+                    {
+                        'command': 'is_greater_than_or_equal_to',
+                        'arg_values': [0],
+                    },
+                ],
+            },
+            {
+                'id': 'col_b',
+                'data_type': 'varchar',
+                'nullable': True,
+                'unique': False,
+                'required': True,
+                'checks': [
+                    {'command': 'is_in', 'arg_values': ['x', 'y']},
+                ],
+            },
+        ],
+    }).get_df_schema()
+
+
+@pytest.fixture
+def parquet_path(tmp_path):
+    path = tmp_path / 'data.parquet'
+    pl.DataFrame({
+        'col_a': [0, 1, 2, 3, -1, None, 5, 5],
+        'col_b': ['x', 'y', 'x', 'y', 'z', 'x', 'y', 'x'],
+        'unused': list(range(8)),
+    }).write_parquet(path, row_group_size=2)
+    return path
+
+
+def test_scan_parquet_projects_config_columns(config, parquet_path):
+    lazyframe = scan_parquet(parquet_path, config)
+
+    assert lazyframe.collect_schema() == pl.Schema({
+        'col_a': pl.Int64,
+        'col_b': pl.Utf8,
+    })
+
+
+def test_get_proven_labels(config):
+    statistics = {'col_a': {'min': 1, 'max': 3, 'null_count': 0, 'len': 2}}
+
+    assert get_proven_labels(config, statistics) == {
+        ('Column', 'col_a', 'not_nullable', None),
+        ('Column', 'col_a', config.columns[0].checks[0].error_msg, 0),
+    }
+
+
+@pytest.mark.parametrize('max_workers', [1, 4])
+def test_validate_parquet_matches_full_validation(
+    config, parquet_path, max_workers
+):
+    expected = get_failure_masks(
+        scan_parquet(parquet_path, config).collect(), config
+    )
+
+    masks = validate_parquet(parquet_path, config, max_workers=max_workers)
+
+    assert masks.height == expected.height
+    assert_frame_equal(masks.get_counts(), expected.get_counts())
+    for mask, expected_mask in zip(masks.masks, expected.masks):
+        assert_series_equal(mask.mask, expected_mask.mask)
+
+
+def test_validate_parquet_skips_proven_row_groups(
+    config, tmp_path, caplog
+):
+    pytest.importorskip('pyarrow')
+    path = tmp_path / 'data.parquet'
+    pl.DataFrame({
+        'col_a': [0, 1, 2, 3],
+        'col_b': ['x', 'x', 'x', 'z'],
+    }).write_parquet(path, row_group_size=2)
+
+    with caplog.at_level(logging.DEBUG):
+        masks = validate_parquet(path, config)
+
+    assert caplog.text.count('Skipping row group') == 1
+    assert masks.get_counts().get_column('failure_count').to_list() == [
+        0, 0, 0, 1,
+    ]
+
+
+def test_validate_parquet_never_skips_nan(tmp_path):
+    pq = pytest.importorskip('pyarrow.parquet')
+    path = tmp_path / 'data.parquet'
+    # pyarrow footers hold min and max without the NaN values.
+    pq.write_table(
+        pl.DataFrame({'col_a': [1.0, float('nan')]}).to_arrow(), path
+    )
+    config = ConfigReader({
+        'name': 'test_config',
+        'columns': [
+            {
+                'id': 'col_a',
+                'data_type': 'decimal',
+                'nullable': True,
+                'unique': False,
+                'required': True,
+                'checks': [{'command': 'is_less_than', 'arg_values': [3]}],
+            },
+        ],
+    }).get_df_schema()
+
+    masks = validate_parquet(path, config)
+
+    assert masks.masks[0].get_index().to_list() == [1]
+
+
+def test_validate_parquet_reports_cast_errors(config, tmp_path):
+    path = tmp_path / 'data.parquet'
+    pl.DataFrame({
+        'col_a': ['0', 'x'],
+        'col_b': ['x', 'y'],
+    }).write_parquet(path)
+
+    masks = validate_parquet(path, config)
+
+    report = masks.render(pl.DataFrame())
+    assert report.select('check', 'schema_context', 'error_level').rows() == [
+        ('InvalidOperationError', 'validate_parquet', 'critical')
+    ]
+
+
+def test_validate_parquet_reports_missing_columns(config, tmp_path):
+    path = tmp_path / 'data.parquet'
+    pl.DataFrame({'col_a': [0, 1]}).write_parquet(path)
+
+    masks = validate_parquet(path, config)
+
+    assert [
+        (mask.check, mask.frame_failure)
+        for mask in masks.masks
+        if mask.failed
+    ] == [('column_in_dataframe', 'col_b')]
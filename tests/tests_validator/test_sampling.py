@@ -0,0 +1,161 @@
+import polars as pl
+import pytest
+
+from peh_validation_library.config.config_reader import ConfigReader
+from peh_validation_library.validator.sampling import (
+    ESTIMATED,
+    FAILED,
+    SAMPLING_REPORT_SCHEMA,
+    UNVERIFIED,
+    estimate_failures,
+    sample_dataframe,
+)
+from peh_validation_library.validator.validator import Validator
+
+
+@pytest.fixture
+def config():
+    return ConfigReader({
+        'name': 'test_config',
+        'columns': [
+            {
+                'id': 'col_a',
+                'data_type': 'integer',
+                'nullable': True,
+                'unique': True,
+                'required': True,
+                'checks': [
+                    {'command': 'is_less_than', 'arg_values': [900]},
+                ],
+            },
+            {
+                'id': 'site',
+                'data_type': 'varchar',
+                'nullable': True,
+                'unique': False,
+                'required': True,
+                'checks': [],
+            },
+        ],
+    }).get_df_schema()
+
+
+@pytest.fixture
+def dataframe():
+    return pl.DataFrame({
+        'col_a': list(range(1000)),
+        'site': ['a'] * 800 + ['b'] * 200,
+    })
+
+
+def test_sample_dataframe_uniform(dataframe):
+    sample = sample_dataframe(dataframe, 100, seed=1)
+
+    assert sample.height == 100
+    assert sample['col_a'].is_sorted()
+    assert sample.equals(sample_dataframe(dataframe, 100, seed=1))
+
+
+def test_sample_dataframe_stratified(dataframe):
+    sample = sample_dataframe(dataframe, 100, stratify_by=['site'])
+
+    assert sample['site'].value_counts(sort=True).rows() == [
+        ('a', 80),
+        ('b', 20),
+    ]
+
+
+def test_sample_dataframe_small_frame(dataframe):
+    assert sample_dataframe(dataframe, 5000) is dataframe
+    with pytest.raises(ValueError, match='size'):
+        sample_dataframe(dataframe, 0)
+
+
+def test_estimate_failures(config, dataframe):
+    sample = sample_dataframe(dataframe, 200, seed=3)
+
+    estimates = estimate_failures(sample, config, dataframe.height)
+
+    assert estimates.schema == pl.Schema(SAMPLING_REPORT_SCHEMA)
+    row = estimates.row(1, named=True)
+    assert row['status'] == ESTIMATED
+    assert row['ci_lower'] <= 0.1 <= row['ci_upper']
+    assert row['estimated_failures'] == pytest.approx(
+        row['failure_rate'] * 1000
+    )
+    unique = estimates.row(0, named=True)
+    assert unique['status'] == UNVERIFIED
+    assert unique['failure_rate'] is None
+
+
+def test_estimate_failures_duplicates_in_sample(config):
+    sample = pl.DataFrame({'col_a': [1, 1, 2], 'site': ['a', 'a', 'b']})
+
+    estimates = estimate_failures(sample, config, 10)
+
+    assert estimates['status'][0] == FAILED
+
+
+def test_validate_sample_escalates(config, dataframe):
+    validator = Validator(dataframe, config)
+
+    result = validator.validate_sample(size=100, escalate=True)
+
+    assert result.population_size == 1000
+    assert result.has_failures()
+    assert result.failure_cases.height == 100
+
+
+def test_validate_sample_without_failures(config, dataframe):
+    validator = Validator(dataframe.head(500), config)
+
+    result = validator.validate_sample(size=100, escalate=True)
+
+    assert not result.has_failures()
+    assert result.failure_cases is None
+
+
+def test_sample_dataframe_many_small_strata():
+    dataframe = pl.DataFrame({
+        'col_a': list(range(1000)),
+        'site': [f'site_{i % 300}' for i in range(1000)],
+    })
+
+    sample = sample_dataframe(dataframe, 100, stratify_by=['site'], seed=2)
+    estimates = estimate_failures(sample, config_for(sample), 1000)
+
+    # Rounding up every stratum would sample 300 rows.
+    assert sample.height == 100
+    assert estimates['sample_size'].unique().to_list() == [100]
+
+
+def config_for(dataframe):
+    return ConfigReader({
+        'name': 'test_config',
+        'columns': [
+            {
+                'id': col,
+                'data_type': 'varchar',
+                'nullable': False,
+                'unique': False,
+                'required': True,
+            }
+            for col in dataframe.columns
+        ],
+    }).get_df_schema()
+
+
+def test_validate_sample_casts_the_sample_only(config, dataframe, monkeypatch):
+    heights = []
+    cast_dataframe = Validator.cast_dataframe
+
+    def record_cast(validator):
+        heights.append(validator.dataframe.height)
+        return cast_dataframe(validator)
+
+    monkeypatch.setattr(Validator, 'cast_dataframe', record_cast)
+
+    result = Validator(dataframe, config).validate_sample(size=100)
+
+    assert heights == [100]
+    assert result.population_size == 1000
@@ -0,0 +1,154 @@
+import polars as pl
+import pytest
+from polars.testing import assert_series_equal
+
+from peh_validation_library.config.config_reader import ConfigReader
+from peh_validation_library.error_report.failure_masks import (
+    get_failure_masks,
+    get_mask_plans,
+)
+from peh_validation_library.validator.check_results import (
+    iter_check_results,
+)
+from peh_validation_library.validator.incremental import get_plan_label
+from peh_validation_library.validator.scheduler import (
+    COMMAND_COSTS,
+    CostModel,
+    collect_balanced,
+    estimate_check_cost,
+    get_balanced_batches,
+    get_static_costs,
+    schedule_plans,
+)
+from peh_validation_library.validator.validator import Validator
+
+
+@pytest.fixture
+def config():
+    return ConfigReader({
+        'name': 'test_config',
+        'columns': [
+            {
+                'id': 'col_a',
+                'data_type': 'integer',
+                'nullable': True,
+                'unique': True,
+                'required': True,
+                'checks': [
+                    {
+                        'command': 'is_greater_than',
+                        'arg_columns': ['col_b'],
+                        'error_level': 'critical',
+                    },
+                    {
+                        'command': 'is_not_null',
+                        'error_level': 'critical',
+                    },
+                    {'command': 'is_in', 'arg_values': [1, 2, 3]},
+                ],
+            },
+            {
+                'id': 'col_b',
+                'data_type': 'integer',
+                'nullable': False,
+                'unique': False,
+                'required': True,
+                'checks': [],
+            },
+        ],
+    }).get_df_schema()
+
+
+@pytest.fixture
+def dataframe():
+    return pl.DataFrame({'col_a': [1, 2, None, 4], 'col_b': [0, 5, 1, 2]})
+
+
+def test_estimate_check_cost(config):
+    checks = config.columns[0].checks
+
+    assert estimate_check_cost(checks[0]) > estimate_check_cost(checks[1])
+    assert estimate_check_cost(checks[1]) == COMMAND_COSTS['is_not_null']
+
+
+def test_schedule_plans(config, dataframe):
+    plans = get_mask_plans(dataframe.lazy(), config)
+
+    scheduled = schedule_plans(plans, get_static_costs(config))
+
+    assert [metadata['check'] for metadata, _ in scheduled] == [
+        config.columns[0].checks[1].error_msg,
+        config.columns[0].checks[0].error_msg,
+        'not_nullable',
+        config.columns[0].checks[2].error_msg,
+        'field_uniqueness',
+    ]
+
+
+def test_schedule_plans_uses_history(config, dataframe):
+    plans = get_mask_plans(dataframe.lazy(), config)
+    static_costs = get_static_costs(config)
+    cost_model = CostModel()
+    # The profiled durations reverse the static order of both checks.
+    fast, slow = plans[1], plans[2]
+    cost_model.record(get_plan_label(slow[0]), 1.0, 10.0)
+    cost_model.record(get_plan_label(fast[0]), 1.0, 0.1)
+
+    scheduled = schedule_plans(plans, static_costs, cost_model)
+
+    assert [metadata['check'] for metadata, _ in scheduled][:2] == [
+        fast[0]['check'],
+        slow[0]['check'],
+    ]
+
+
+def test_cost_model_save_load(tmp_path):
+    cost_model = CostModel()
+    cost_model.record(('Column', 'a', 'check', 0), 2.0, 1.0)
+    cost_model.record(('Column', 'a', 'check', 0), 2.0, 2.0)
+    path = tmp_path / 'costs.json'
+
+    cost_model.save(path)
+    loaded = CostModel.load(path)
+
+    assert loaded.estimate(('Column', 'a', 'check', 0), 2.0) == pytest.approx(
+        1.3
+    )
+    # Unprofiled checks are scaled by the seconds per cost unit seen so far.
+    assert cost_model.estimate(('Column', 'b', 'check', 0), 4.0) == 3.0
+
+
+def test_get_balanced_batches():
+    batches = get_balanced_batches([8, 1, 4, 4, 2, 1], 2)
+
+    assert batches == [[0, 4], [1, 2, 3, 5]]
+    assert get_balanced_batches([1.0], 4) == [[0]]
+    assert get_balanced_batches([], 2) == []
+
+
+def test_collect_balanced_matches_collect_all(config, dataframe):
+    plans = get_mask_plans(dataframe.lazy(), config)
+    cost_model = CostModel()
+
+    results = collect_balanced(plans, config, 3, cost_model)
+
+    for result, expected in zip(
+        results, pl.collect_all([plan for _, plan in plans])
+    ):
+        assert result.equals(expected)
+    assert len(cost_model.history) == len(plans)
+
+
+def test_iter_check_results_fail_fast(config, dataframe):
+    results = list(iter_check_results(dataframe, config, fail_fast=True))
+
+    assert [result.passed for result in results] == [False]
+
+
+def test_validator_get_failure_masks_parallel(config, dataframe):
+    expected = get_failure_masks(dataframe, config)
+
+    masks = Validator(dataframe, config).get_failure_masks(max_workers=2)
+
+    for mask, expected_mask in zip(masks.masks, expected.masks):
+        assert_series_equal(mask.mask, expected_mask.mask)
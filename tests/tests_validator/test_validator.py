@@ -1,7 +1,12 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+import copy
 import logging
+import time
 
 import pytest
 import polars as pl
+from polars.testing import assert_frame_equal
 
 from peh_validation_library.validator.validator import Validator
 from peh_validation_library.error_report.error_collector import ErrorCollector
@@ -119,4 +124,359 @@ def test_build_validator_error_handling(error_collector):
     assert len(error_collector.get_errors()) == 1
     error = error_collector.get_errors()[0]
     assert isinstance(error, ExceptionSchema)
-    assert error.error_level.name == 'CRITICAL'
\ No newline at end of file
+    assert error.error_level.name == 'CRITICAL'
+
+@pytest.fixture
+def simple_config():
+    return {
+        'name': 'test_config',
+        'columns': [
+            {
+                'id': 'test_column',
+                'data_type': 'integer',
+                'nullable': False,
+                'unique': True,
+                'required': True,
+                'checks': [
+                    {
+                        'command': 'is_in',
+                        'arg_values': [1, 2],
+                    }
+                ]
+            },
+        ],
+    }
+
+
+@pytest.fixture
+def slow_check_fn():
+    def check_fn(data, arg_values=None, arg_columns=None, subject=None):
+        time.sleep(arg_values[0])
+        return data.lazyframe.select(pl.col(data.key).is_null())
+
+    return check_fn
+
+
+def test_validate_async_same_result_as_sync(error_collector, simple_config):
+    dataframe = {'test_column': [1, 2, 3]}
+
+    validator = Validator.build_validator(
+        config=copy.deepcopy(simple_config), dataframe=dataframe
+        )
+    validator.validate()
+    sync_errors = error_collector.get_errors()[0].failure_cases
+    error_collector.clear_errors()
+
+    async def run():
+        validator = await Validator.build_validator_async(
+            config=copy.deepcopy(simple_config), dataframe=dataframe
+            )
+        return await validator.validate_async()
+
+    async_errors = asyncio.run(run())[0].failure_cases
+
+    assert_frame_equal(sync_errors, async_errors)
+
+
+def test_validate_async_custom_executor(error_collector, simple_config):
+    dataframe = {'test_column': [1, 2]}
+
+    async def run(executor):
+        validator = await Validator.build_validator_async(
+            config=simple_config, dataframe=dataframe, executor=executor
+            )
+        return await validator.validate_async(executor=executor)
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        errors = asyncio.run(run(executor))
+
+    assert errors == []
+
+
+def test_validate_async_timeout(error_collector, slow_check_fn):
+    config = {
+        'name': 'test_config',
+        'columns': [
+            {
+                'id': 'test_column',
+                'data_type': 'integer',
+                'nullable': False,
+                'unique': False,
+                'required': True,
+                'checks': [
+                    {'command': slow_check_fn, 'arg_values': [0.5]}
+                ]
+            },
+        ],
+    }
+    validator = Validator.build_validator(
+        config=config, dataframe={'test_column': [1, 2]}
+        )
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        errors = asyncio.run(
+            validator.validate_async(executor=executor, timeout=0.01)
+            )
+    # The executor has waited for the worker: its late result is isolated.
+
+    assert len(errors) == 1
+    assert isinstance(errors[0], ExceptionSchema)
+    assert errors[0].error_type == 'TimeoutError'
+    assert errors[0].error_level.name == 'CRITICAL'
+    assert error_collector.get_errors() == []
+
+
+def test_validate_async_cancel(error_collector, slow_check_fn):
+    config = {
+        'name': 'test_config',
+        'columns': [
+            {
+                'id': 'test_column',
+                'data_type': 'integer',
+                'nullable': False,
+                'unique': False,
+                'required': True,
+                'checks': [
+                    {'command': slow_check_fn, 'arg_values': [0.5]}
+                ]
+            },
+        ],
+    }
+    validator = Validator.build_validator(
+        config=config, dataframe={'test_column': [1, 2]}
+        )
+
+    async def run(executor):
+        task = asyncio.create_task(validator.validate_async(executor=executor))
+        await asyncio.sleep(0.01)
+        task.cancel()
+        await task
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        with pytest.raises(asyncio.CancelledError):
+            asyncio.run(run(executor))
+
+    assert error_collector.get_errors() == []
+
+
+def test_validate_async_event_loop_responsive(error_collector, simple_config):
+    dataframe = {'test_column': list(range(200_000))}
+
+    async def heartbeat(stop):
+        ticks = 0
+        while not stop.is_set():
+            await asyncio.sleep(0.001)
+            ticks += 1
+        return ticks
+
+    async def run():
+        stop = asyncio.Event()
+        beat = asyncio.create_task(heartbeat(stop))
+        validators = [
+            Validator.build_validator(
+                config=copy.deepcopy(simple_config), dataframe=dataframe
+                )
+            for _ in range(4)
+        ]
+        start = time.perf_counter()
+        await asyncio.gather(*(v.validate_async() for v in validators))
+        elapsed = time.perf_counter() - start
+        stop.set()
+        return await beat, elapsed
+
+    ticks, elapsed = asyncio.run(run())
+
+    # The loop kept scheduling the heartbeat while validations ran.
+    assert ticks > 0
+    assert ticks >= elapsed / 0.05
+
+
+def test_validate_async_concurrent_results_isolated(
+    error_collector, simple_config
+):
+    async def run():
+        good = await Validator.build_validator_async(
+            config=copy.deepcopy(simple_config),
+            dataframe={'test_column': [1, 2]},
+            )
+        bad = await Validator.build_validator_async(
+            config=copy.deepcopy(simple_config),
+            dataframe={'test_column': [1, 2, 3]},
+            )
+        return await asyncio.gather(
+            good.validate_async(), bad.validate_async()
+            )
+
+    good_errors, bad_errors = asyncio.run(run())
+
+    assert good_errors == []
+    assert len(bad_errors) == 1
+    assert bad_errors[0].failure_cases['failure_case'].to_list() == ['3']
+    assert error_collector.get_errors() == []
+
+
+def test_build_validator_from_file(error_collector, simple_config, tmp_path):
+    path = tmp_path / 'data.csv'
+    pl.DataFrame({
+        'test_column': [1, 2, 3],
+        'aux_column': ['x', 'y', 'z'],
+    }).write_csv(path)
+
+    validator = Validator.build_validator_from_file(
+        config=simple_config, path=path
+        )
+    errors = validator.validate()
+
+    assert validator.dataframe.columns == ['test_column']
+    assert errors[0].failure_cases['failure_case'].to_list() == ['3']
+
+
+def test_build_validator_from_file_error(error_collector, simple_config):
+    errors = Validator.build_validator_from_file(
+        config=simple_config, path='missing.csv'
+        )
+
+    assert isinstance(errors[0], ExceptionSchema)
+    assert errors[0].error_level.name == 'CRITICAL'
+
+
+def test_validate_dataframe_condition_check(error_collector):
+    config = {
+        'name': 'test_config',
+        'columns': [
+            {
+                'id': 'col_a',
+                'data_type': 'integer',
+                'nullable': False,
+                'unique': False,
+                'required': True,
+            },
+            {
+                'id': 'col_b',
+                'data_type': 'varchar',
+                'nullable': True,
+                'unique': False,
+                'required': True,
+            },
+        ],
+        'checks': [
+            {
+                'check_case': 'condition',
+                'expressions': [
+                    {
+                        'command': 'is_equal_to',
+                        'subject': ['col_a'],
+                        'arg_values': [3],
+                    },
+                    {'command': 'is_null', 'subject': ['col_b']},
+                ]
+            }
+        ],
+    }
+    validator = Validator.build_validator(
+        config=config,
+        dataframe={'col_a': [1, 3, 3], 'col_b': ['x', None, 'y']},
+        )
+
+    errors = validator.validate()
+    report = validator.get_condition_report()
+
+    assert errors[0].failure_cases['index'].to_list() == [2]
+    assert report.select(
+        'condition_not_met', 'passed', 'failed'
+    ).row(0) == (1, 1, 1)
+
+
+def test_get_failure_masks_matches_validate(error_collector, simple_config):
+    validator = Validator.build_validator(
+        config=simple_config, dataframe={'test_column': [1, 3, 3]}
+        )
+
+    errors = validator.validate()
+    masks = validator.get_failure_masks()
+
+    assert sorted(
+        masks.render(validator.dataframe)['index'].to_list()
+    ) == sorted(
+        errors[0].failure_cases['index'].to_list()
+    )
+
+
+def test_validate_incremental(error_collector, simple_config):
+    first = Validator.build_validator(
+        config=copy.deepcopy(simple_config), dataframe={'test_column': [1, 3]}
+        )
+    state = first.validate_incremental()
+
+    second = Validator.build_validator(
+        config=copy.deepcopy(simple_config),
+        dataframe={'test_column': [1, 3, 2, 3]},
+        )
+    new_state = second.validate_incremental(state)
+
+    assert new_state.delta_size == 2
+    assert new_state.masks.get_counts()['failure_count'].to_list() == [
+        0, 2, 2
+    ]
+
+
+def test_mask_apis_report_missing_columns(error_collector, simple_config):
+    config = copy.deepcopy(simple_config)
+    config['columns'].append({
+        'id': 'other_column',
+        'data_type': 'integer',
+        'nullable': False,
+        'unique': False,
+        'required': True,
+    })
+    validator = Validator.build_validator(
+        config=config, dataframe={'test_column': [1, 2]}
+    )
+
+    errors = validator.validate()
+    masks = validator.get_failure_masks()
+    results = list(validator.iter_validate())
+    summary = validator.get_failure_summary()
+
+    report = masks.render(validator.dataframe)
+    expected = (
+        'other_column', 'DataFrameSchema', 'column_in_dataframe', None
+    )
+    assert errors[0].failure_cases['failure_case'].to_list() == [
+        'other_column'
+    ]
+    assert report.select(
+        'failure_case', 'schema_context', 'check', 'index'
+    ).rows() == [expected]
+    assert [result.passed for result in results].count(False) == 1
+    assert summary.select('failure_case', 'count').rows() == [
+        ('other_column', 1)
+    ]
+    assert validator.validate_sample(size=1).has_failures()
+
+
+def test_mask_apis_report_cast_errors(error_collector, simple_config):
+    dataframe = {'test_column': ['1', 'x']}
+    validator = Validator.build_validator(
+        config=copy.deepcopy(simple_config), dataframe=dataframe
+    )
+
+    masks = validator.get_failure_masks()
+    results = list(validator.iter_validate())
+    state = validator.validate_incremental()
+
+    report = masks.render(validator.dataframe)
+    assert report.select('check', 'error_level').rows() == [
+        ('InvalidOperationError', 'critical')
+    ]
+    assert [(result.passed, result.error_level.value) for result in results] == [
+        (False, 'critical')
+    ]
+    assert state.masks.masks[0].failed
+    assert {
+        error.error_context for error in error_collector.get_errors()
+    } == {
+        'Validator.get_failure_masks',
+        'Validator.iter_validate',
+        'Validator.validate_incremental',
+    }